@@ -0,0 +1,127 @@
+"""
+Text chunking benchmark: previous GptPackageFile.chunk_text vs hexense_core.chunking.
+
+- legacy:  loads the tiktoken encoding on every call and encodes paragraph by paragraph;
+           oversized paragraphs are kept whole
+- chunker: process-wide cached tokenizer, one encode_ordinary_batch over all paragraphs,
+           oversized paragraphs split at sentence/token boundaries
+
+Two workloads are timed:
+- one large document (default 5 MB; --file to use a real one)
+- many small documents (--small-docs x 5 KB), where the per-call tokenizer lookup dominates
+
+For each it reports time, chunk count, the largest chunk in tokens and how many chunks exceed
+max_tokens (those are silently truncated by the embedding model). Without --file a synthetic
+document is generated: headings, normal paragraphs and a share of very long paragraphs.
+
+Usage:
+    python benchmarks/bench_chunking.py --size-mb 5 --max-tokens 200
+    python benchmarks/bench_chunking.py --file manual.txt --overlap 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hexense_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from hexense_core.chunking import CHUNK_MAX_TOKENS, chunk_text, detect_heading, get_tokenizer  # noqa: E402
+
+WORDS = ("sipariş ürün teslimat fatura müşteri depo stok rapor kalite bakım arıza servis cihaz kullanıcı "
+         "ayar güvenlik bağlantı ölçüm performans the device must be configured before the first use").split()
+
+
+def legacy_chunk_text(text, max_tokens):
+    import tiktoken
+    paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
+    tokenizer = tiktoken.get_encoding('cl100k_base')
+    chunks, current_chunk, current_tokens = [], [], 0
+    for i, para in enumerate(paragraphs):
+        detect_heading(para)
+        tokens = len(tokenizer.encode(para))
+        if current_tokens + tokens > max_tokens and current_chunk:
+            chunks.append(current_chunk)
+            current_chunk, current_tokens = [], 0
+        current_chunk.append((i, para))
+        current_tokens += tokens
+    if current_chunk:
+        chunks.append(current_chunk)
+    return ['\n'.join(p for _, p in chunk) for chunk in chunks]
+
+
+def new_chunk_text(text, max_tokens, overlap):
+    return [chunk.text for chunk in chunk_text(text, max_tokens=max_tokens, overlap_tokens=overlap)]
+
+
+def synthetic_document(size_bytes, seed=0, long_share=0.05):
+    rng = random.Random(seed)
+    lines, size, section = [], 0, 0
+    while size < size_bytes:
+        if rng.random() < 0.05:
+            section += 1
+            line = f"{section}. Bölüm {rng.choice(WORDS).title()}"
+        else:
+            # Paragrafların bir kısmı tek başına max_tokens'ın birkaç katı uzunluktadır
+            sentences = rng.randint(40, 120) if rng.random() < long_share else rng.randint(1, 6)
+            line = " ".join(
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))).capitalize() + "."
+                for _ in range(sentences)
+            )
+        lines.append(line)
+        size += len(line.encode("utf-8")) + 1
+    return "\n".join(lines)
+
+
+def measure(fn, texts):
+    start = time.perf_counter()
+    chunks = [chunk for text in texts for chunk in fn(text)]
+    return time.perf_counter() - start, chunks
+
+
+def report(name, elapsed, chunks, max_tokens):
+    tokenizer = get_tokenizer()
+    sizes = [len(tokens) for tokens in tokenizer.encode_ordinary_batch(chunks)]
+    over = sum(1 for n in sizes if n > max_tokens)
+    print(f"{name:<10}{elapsed:>9.2f}s{len(chunks):>9}{max(sizes, default=0):>11}{over:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", help="Text file to chunk (default: synthetic document)")
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--small-docs", type=int, default=1000)
+    parser.add_argument("--max-tokens", type=int, default=CHUNK_MAX_TOKENS)
+    parser.add_argument("--overlap", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            document = f.read()
+    else:
+        document = synthetic_document(int(args.size_mb * 1024 * 1024))
+    small_docs = [synthetic_document(5 * 1024, seed=i) for i in range(args.small_docs)]
+    # Tokenizer'ın ilk yüklenmesi (BPE dosyası) ölçüme girmesin
+    get_tokenizer()
+
+    workloads = [
+        (f"1 x {len(document.encode('utf-8')) / 1e6:.1f} MB", [document]),
+        (f"{len(small_docs)} x 5 KB", small_docs),
+    ]
+    for label, texts in workloads:
+        print(f"\n{label} (max_tokens={args.max_tokens}, overlap={args.overlap})")
+        print(f"{'chunker':<10}{'time':>10}{'chunks':>9}{'max tokens':>11}{'over limit':>12}")
+        elapsed, chunks = measure(lambda text: legacy_chunk_text(text, args.max_tokens), texts)
+        report("legacy", elapsed, chunks, args.max_tokens)
+        elapsed, chunks = measure(lambda text: new_chunk_text(text, args.max_tokens, args.overlap), texts)
+        report("chunker", elapsed, chunks, args.max_tokens)
+
+
+if __name__ == "__main__":
+    main()
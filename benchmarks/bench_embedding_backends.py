@@ -0,0 +1,127 @@
+"""
+Embedding backend benchmark and equivalence check.
+
+Runs each backend in a fresh process, reports texts/sec and peak RSS, and compares the
+vectors of every backend against the PyTorch `sentence_transformers` reference with
+cosine similarity. Exits non-zero if any text falls below `--min-cosine`.
+
+Usage:
+    python benchmarks/bench_embedding_backends.py --texts 2000 --min-cosine 0.98
+    python benchmarks/bench_embedding_backends.py --backends sentence_transformers onnx_int8 --onnx-dir /tmp/onnx
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+REFERENCE_BACKEND = "sentence_transformers"
+
+SAMPLE_TEXTS = [
+    "Siparişim ne zaman kargoya verilecek?",
+    "Ürün kodu PRD-00421 için stok durumu nedir?",
+    "Geçen ayki satış raporunu bölge bazında özetle.",
+    "How do I reset my password on the customer portal?",
+    "Fatura adresimi güncellemek istiyorum.",
+    "İade sürecinde hangi belgeler gerekiyor?",
+    "Teşekkürler",
+    "ok",
+    "Bakım kılavuzunda hidrolik pompa değişim adımları nelerdir?",
+    "Please summarize the attached quarterly financial statements.",
+]
+
+
+def make_texts(n):
+    return [f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} (#{i})" for i in range(n)]
+
+
+def run_backend(backend_name, model_name, n_texts, batch_size, options, out_path):
+    """
+    Alt process tarafı: backend'i yükler, encode eder, vektörleri .npy olarak yazar.
+    """
+    import resource
+    import numpy as np
+    from hexense_core.embedding_backends import create_backend
+
+    texts = make_texts(n_texts)
+    load_start = time.perf_counter()
+    backend = create_backend(backend_name, model_name, **options)
+    load_seconds = time.perf_counter() - load_start
+    backend.encode(texts[:batch_size], batch_size=batch_size)  # warm-up
+
+    start = time.perf_counter()
+    vectors = backend.encode(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    np.save(out_path, vectors)
+    print(json.dumps({
+        "backend": backend_name,
+        "load_seconds": load_seconds,
+        "texts_per_sec": len(texts) / elapsed,
+        # Linux'ta ru_maxrss KB cinsindendir
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "dimension": int(vectors.shape[1]),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--backends", nargs="+", default=[REFERENCE_BACKEND, "onnx_int8"])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--onnx-dir", default=os.path.join(BASE_DIR, ".cache", "onnx", "all-MiniLM-L6-v2"))
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        options = {"onnx_dir": args.onnx_dir} if args.worker == "onnx_int8" else {}
+        run_backend(args.worker, args.model, args.texts, args.batch_size, options, args.out)
+        return
+
+    import numpy as np
+
+    backends = list(dict.fromkeys([REFERENCE_BACKEND] + args.backends))
+    results, vectors = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend_name in backends:
+            out_path = os.path.join(tmp, f"{backend_name}.npy")
+            proc = subprocess.run(
+                [sys.executable, __file__, "--worker", backend_name, "--out", out_path,
+                 "--model", args.model, "--texts", str(args.texts), "--batch-size", str(args.batch_size),
+                 "--onnx-dir", args.onnx_dir],
+                capture_output=True, text=True, cwd=BASE_DIR
+            )
+            if proc.returncode != 0:
+                print(proc.stderr)
+                sys.exit(f"Backend {backend_name} failed")
+            results[backend_name] = json.loads(proc.stdout.strip().splitlines()[-1])
+            vectors[backend_name] = np.load(out_path)
+
+    print(f"{'backend':<24}{'load s':>10}{'texts/sec':>12}{'peak RSS MB':>14}{'min cos':>10}{'mean cos':>10}")
+    reference = vectors[REFERENCE_BACKEND]
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    failed = False
+    for backend_name in backends:
+        r = results[backend_name]
+        v = vectors[backend_name]
+        cosine = np.sum(reference * (v / np.linalg.norm(v, axis=1, keepdims=True)), axis=1)
+        print(f"{backend_name:<24}{r['load_seconds']:>10.2f}{r['texts_per_sec']:>12.1f}{r['peak_rss_mb']:>14.0f}"
+              f"{cosine.min():>10.4f}{cosine.mean():>10.4f}")
+        if cosine.min() < args.min_cosine:
+            failed = True
+            print(f"FAIL: {backend_name} min cosine {cosine.min():.4f} < {args.min_cosine}")
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
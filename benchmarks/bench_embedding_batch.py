@@ -0,0 +1,73 @@
+"""
+Embedding throughput benchmark.
+
+Measures texts/sec for `semantic.get_embeddings` at different batch sizes and for the
+async micro-batcher (`semantic.aget_embedding`) under N concurrent single-text callers.
+
+Usage:
+    python benchmarks/bench_embedding_batch.py --texts 512 --batch-sizes 1 8 32 64 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hexense_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from hexense_core import semantic  # noqa: E402
+from hexense_core.embedding_batcher import EmbeddingBatcher  # noqa: E402
+
+
+def make_texts(n):
+    return [f"Örnek kullanıcı mesajı {i}: sipariş durumu ve ürün kodu PRD-{i:05d} hakkında bilgi" for i in range(n)]
+
+
+def bench_sync(texts, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        semantic.get_embeddings(texts[i:i + batch_size])
+    return len(texts) / (time.perf_counter() - start)
+
+
+async def bench_batcher(texts, concurrency, max_batch_size, max_wait_ms):
+    batcher = EmbeddingBatcher(semantic.get_embeddings, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(text):
+        async with semaphore:
+            return await batcher.embed(text)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in texts))
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=semantic.EMBEDDING_BATCH_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    semantic.get_embeddings(texts[:8])  # model warm-up
+
+    print(f"{'mode':<28}{'batch':>8}{'texts/sec':>14}")
+    for batch_size in args.batch_sizes:
+        rate = bench_sync(texts, batch_size)
+        print(f"{'get_embeddings':<28}{batch_size:>8}{rate:>14.1f}")
+    for batch_size in args.batch_sizes:
+        rate = asyncio.run(bench_batcher(texts, args.concurrency, batch_size, args.max_wait_ms))
+        print(f"{'batcher c=' + str(args.concurrency):<28}{batch_size:>8}{rate:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Page-parallel ingestion benchmark: pages/sec from 1 to N worker processes.
+
+Runs the GptPackageFile ingestion path on one PDF without touching the database or Qdrant.
+The path is: extract text and images, chunk the text, embed the text chunks, and CLIP-encode
+the images.
+
+- sequential: extract_pdf + in-process embedding backend and CLIP (DOCUMENT_INGEST_WORKERS=0)
+- N workers:  DocumentIngestPool with N processes (page ranges fanned out, embeddings split)
+
+Pools are warmed up (models loaded) before timing. Every run must produce the same chunk texts
+as the sequential run; the benchmark fails otherwise, since chunk order determines the point IDs.
+Without --pdf a synthetic image-heavy PDF is generated (see bench_pdf_extraction.py).
+
+Usage:
+    python benchmarks/bench_ingest_scaling.py --pages 300 --workers 1 2 4 8
+    python benchmarks/bench_ingest_scaling.py --pdf manual.pdf --skip-images
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hexense_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from bench_pdf_extraction import write_image_pdf  # noqa: E402
+from hexense_core import semantic  # noqa: E402
+from hexense_core.ingest_workers import DocumentIngestPool, pdf_page_count  # noqa: E402
+from hexense_core.models import GptPackageFile  # noqa: E402
+from hexense_core.pdf_extract import extract_pdf  # noqa: E402
+
+
+def warmup_png():
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), "white").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def chunk_texts(text):
+    return ['\n'.join(p[1] for p in chunk) for chunk, _ in GptPackageFile().chunk_text(text)]
+
+
+def ingest(path, page_count, pool, skip_images):
+    timings = {}
+    start = time.perf_counter()
+    text, images = pool.extract_pdf(path, page_count) if pool else extract_pdf(path)
+    timings["extract"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks = chunk_texts(text)
+    if pool:
+        pool.encode_texts(chunks)
+    else:
+        semantic.get_embedding_backend().encode(chunks, batch_size=semantic.EMBEDDING_BATCH_MAX_SIZE)
+    if images and not skip_images:
+        (pool.encode_images if pool else semantic.encode_images)(images)
+    timings["embed"] = time.perf_counter() - start
+    return chunks, len(images), timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", help="Existing PDF to ingest (default: generate a synthetic one)")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--images-per-page", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--pages-per-task", type=int, default=semantic.DOCUMENT_INGEST_PAGES_PER_TASK)
+    parser.add_argument("--skip-images", action="store_true", help="Extract images but do not CLIP-encode them")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    path = args.pdf
+    if not path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp_dir.name, "bench.pdf")
+        write_image_pdf(path, args.pages, args.images_per_page)
+    page_count = pdf_page_count(path)
+
+    try:
+        # Sıralı yolda modellerin yüklenme süresi ölçüme girmesin
+        semantic.get_embedding_backend().encode(["warmup"], batch_size=1)
+        if not args.skip_images:
+            semantic.get_clip_model()
+        baseline_chunks, image_count, timings = ingest(path, page_count, None, args.skip_images)
+        total = timings["extract"] + timings["embed"]
+        print(f"{page_count} pages, {len(baseline_chunks)} text chunks, {image_count} images")
+        print(f"{'workers':<12}{'extract':>10}{'embed':>10}{'total':>10}{'pages/s':>10}{'speedup':>10}")
+        print(f"{'sequential':<12}{timings['extract']:>9.2f}s{timings['embed']:>9.2f}s{total:>9.2f}s"
+              f"{page_count / total:>10.1f}{1.0:>9.2f}x")
+        sequential_total = total
+
+        for workers in args.workers:
+            pool = DocumentIngestPool(
+                semantic.EMBEDDING_MODEL_NAME,
+                pages_per_task=args.pages_per_task,
+                backend_name=semantic.EMBEDDING_BACKEND,
+                backend_options=semantic.EMBEDDING_BACKEND_OPTIONS,
+                workers=workers,
+                batch_size=semantic.EMBEDDING_BATCH_MAX_SIZE
+            )
+            try:
+                # Her worker'ı başlat (metin modeli initializer'da yüklenir)
+                pool.encode_texts(["warmup"] * workers * pool.min_texts_per_worker)
+                if not args.skip_images:
+                    # CLIP worker'larda ilk görsel isteğinde yüklenir
+                    pool.encode_images([warmup_png()] * workers * pool.min_images_per_worker)
+                chunks, _, timings = ingest(path, page_count, pool, args.skip_images)
+            finally:
+                pool.shutdown()
+            if chunks != baseline_chunks:
+                raise SystemExit(f"{workers} workers produced different chunks than the sequential run")
+            total = timings["extract"] + timings["embed"]
+            print(f"{workers:<12}{timings['extract']:>9.2f}s{timings['embed']:>9.2f}s{total:>9.2f}s"
+                  f"{page_count / total:>10.1f}{sequential_total / total:>9.2f}x")
+    finally:
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+PDF extraction benchmark: old two-pass extraction vs single-pass page iterator.
+
+- legacy: the previous GptPackageFile path. The PDF is opened twice (once for text, once for
+  images), and the whole page is rasterized again for every embedded image.
+- single: hexense_core.pdf_extract.extract_pdf. One open, text and images per page, and at most
+  one raster per page.
+
+Each variant runs in a fresh subprocess, so peak RSS (ru_maxrss) is measured in isolation.
+Without --pdf a synthetic image-heavy PDF is generated: every page draws --images-per-page JPEGs
+and one line of text. The JPEGs come from a small shared pool, so the file stays small while every
+page still has to be rendered and decoded.
+
+Reports wall time, peak RSS above the post-import baseline, and page/image counts.
+
+Usage:
+    python benchmarks/bench_pdf_extraction.py --pages 200 --images-per-page 4
+    python benchmarks/bench_pdf_extraction.py --pdf /path/to/file.pdf
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+
+
+def legacy_extract(path):
+    import pdfplumber
+
+    text = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            text.append(page.extract_text() or "")
+    images = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            for img in page.images:
+                try:
+                    im = page.to_image(resolution=150)
+                    cropped = im.original.crop((img['x0'], img['top'], img['x1'], img['bottom']))
+                    buf = io.BytesIO()
+                    cropped.save(buf, format='PNG')
+                    images.append(buf.getvalue())
+                except Exception:
+                    continue
+    return '\n'.join(text), images
+
+
+def single_extract(path):
+    from hexense_core.pdf_extract import extract_pdf
+
+    return extract_pdf(path)
+
+
+VARIANTS = {"legacy": legacy_extract, "single": single_extract}
+
+
+def write_image_pdf(path, pages, images_per_page, pool_size=8, image_size=(1024, 768)):
+    """
+    Writes a minimal PDF with a grid of DCT (JPEG) images and one line of text on every page.
+    """
+    from PIL import Image
+
+    jpegs = []
+    for i in range(pool_size):
+        image = Image.merge("RGB", [Image.effect_noise(image_size, 40 + 10 * c + i) for c in range(3)])
+        buf = io.BytesIO()
+        image.save(buf, format="JPEG", quality=85)
+        jpegs.append(buf.getvalue())
+
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    def stream(header: str, data: bytes) -> bytes:
+        return f"<< {header} /Length {len(data)} >>\nstream\n".encode() + data + b"\nendstream"
+
+    catalog = add(b"")
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    image_objs = [
+        add(stream(
+            f"/Type /XObject /Subtype /Image /Width {image_size[0]} /Height {image_size[1]} "
+            "/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /DCTDecode",
+            data
+        ))
+        for data in jpegs
+    ]
+
+    columns = 2
+    rows = -(-images_per_page // columns)
+    cell_w, cell_h = (PAGE_WIDTH - 60) / columns, (PAGE_HEIGHT - 100) / rows
+    page_objs = []
+    for n in range(pages):
+        ops = [f"BT /F1 12 Tf 30 {PAGE_HEIGHT - 40} Td (Page {n + 1} synthetic image report) Tj ET"]
+        xobjects = []
+        for k in range(images_per_page):
+            name = f"Im{k}"
+            xobjects.append(f"/{name} {image_objs[(n + k) % pool_size]} 0 R")
+            x = 30 + (k % columns) * cell_w
+            y = PAGE_HEIGHT - 70 - (k // columns + 1) * cell_h
+            ops.append(f"q {cell_w - 10:.1f} 0 0 {cell_h - 10:.1f} {x:.1f} {y:.1f} cm /{name} Do Q")
+        content = add(stream("", "\n".join(ops).encode()))
+        page_objs.append(add(
+            f"<< /Type /Page /Parent {pages_obj} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {font} 0 R >> /XObject << {' '.join(xobjects)} >> >> "
+            f"/Contents {content} 0 R >>".encode()
+        ))
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode()
+    kids = " ".join(f"{obj} 0 R" for obj in page_objs)
+    objects[pages_obj - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_objs)} >>".encode()
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+        xref = f.tell()
+        f.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {len(objects) + 1} /Root {catalog} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+
+def run_variant(variant, path):
+    # Modüller import edildikten sonraki RSS taban alınır
+    import pdfplumber  # noqa: F401
+    import hexense_core.pdf_extract  # noqa: F401
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    text, images = VARIANTS[variant](path)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "seconds": elapsed,
+        # Linux'ta ru_maxrss KB cinsindendir
+        "peak_mb": (peak - baseline) / 1024,
+        "text_chars": len(text),
+        "images": len(images),
+        "image_mb": sum(len(i) for i in images) / 1e6,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", help="Existing PDF to extract (default: generate a synthetic one)")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--images-per-page", type=int, default=4)
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    parser.add_argument("--run", choices=list(VARIANTS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_variant(args.run, args.pdf)
+        return
+
+    tmp_dir = None
+    path = args.pdf
+    if not path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp_dir.name, "bench.pdf")
+        start = time.perf_counter()
+        write_image_pdf(path, args.pages, args.images_per_page)
+        print(f"generated {args.pages} pages x {args.images_per_page} images "
+              f"({os.path.getsize(path) / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s")
+
+    try:
+        print(f"{'variant':<8}{'time':>10}{'peak RSS':>12}{'images':>8}{'image MB':>10}{'text chars':>12}")
+        for variant in args.variants:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run", variant, "--pdf", path],
+                check=True, capture_output=True, text=True
+            ).stdout
+            r = json.loads(output.strip().splitlines()[-1])
+            print(f"{variant:<8}{r['seconds']:>9.2f}s{r['peak_mb']:>9.0f} MB{r['images']:>8}"
+                  f"{r['image_mb']:>10.1f}{r['text_chars']:>12}")
+    finally:
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
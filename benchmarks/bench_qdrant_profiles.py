@@ -0,0 +1,191 @@
+"""
+Qdrant storage profile benchmark: recall@k and search latency per profile.
+
+For every profile in settings.QDRANT_STORAGE_PROFILES a scratch collection is created with the
+same parameters the semantic layer uses (`collection_params_for_profile`), filled with a synthetic
+clustered corpus of unit vectors, and queried with the profile's search params
+(`search_params_for_profile`). Ground truth is an exact brute-force top-k computed with numpy.
+
+Reports recall@k, p50/p99 latency, QPS and upload + indexing time. Needs a local Qdrant
+(QDRANT_URL); scratch collections are named `bench_profile_<name>` and are dropped afterwards
+unless --keep is given.
+
+Usage:
+    python benchmarks/bench_qdrant_profiles.py --points 1000000 --queries 500 --k 10
+    python benchmarks/bench_qdrant_profiles.py --points 100000 --profiles default large
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hexense_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import numpy as np  # noqa: E402
+from qdrant_client import QdrantClient  # noqa: E402
+from qdrant_client.http import models as qdrant_models  # noqa: E402
+
+from hexense_core.semantic import (  # noqa: E402
+    QDRANT_STORAGE_PROFILES,
+    QDRANT_URL,
+    collection_params_for_profile,
+    search_params_for_profile,
+)
+
+SEED = 1234
+
+
+def normalize(x):
+    return (x / np.linalg.norm(x, axis=1, keepdims=True)).astype(np.float32)
+
+
+class SyntheticCorpus:
+    """
+    Clustered unit vectors generated chunk by chunk from a fixed seed, so the corpus never has
+    to fit in memory and every pass (upload, ground truth) sees identical vectors.
+    """
+
+    def __init__(self, points, dim, clusters, chunk_size, noise=1.4):
+        self.points = points
+        self.dim = dim
+        self.chunk_size = chunk_size
+        self.noise = noise
+        self.centers = normalize(np.random.default_rng(SEED).standard_normal((clusters, dim)))
+
+    def chunks(self):
+        for chunk_idx, start in enumerate(range(0, self.points, self.chunk_size)):
+            n = min(self.chunk_size, self.points - start)
+            yield start, self._sample(np.random.default_rng([SEED, chunk_idx]), n)
+
+    def queries(self, n):
+        return self._sample(np.random.default_rng([SEED, 2 ** 32 - 1]), n)
+
+    def _sample(self, rng, n):
+        # Noise norm ~ self.noise around a unit-length cluster center
+        labels = rng.integers(0, len(self.centers), n)
+        noise = rng.standard_normal((n, self.dim)) * (self.noise / np.sqrt(self.dim))
+        return normalize(self.centers[labels] + noise)
+
+
+def exact_top_k(corpus, queries, k):
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), k), dtype=np.int64)
+    for start, chunk in corpus.chunks():
+        scores = queries @ chunk.T
+        ids = np.broadcast_to(np.arange(start, start + len(chunk)), scores.shape)
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_ids = np.take_along_axis(merged_ids, top, axis=1)
+    return [set(row.tolist()) for row in best_ids]
+
+
+def wait_until_indexed(client, collection_name, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        info = client.get_collection(collection_name)
+        if info.status == qdrant_models.CollectionStatus.GREEN:
+            return True
+        time.sleep(1.0)
+    return False
+
+
+def bench_profile(client, name, profile, corpus, queries, truth, args):
+    collection_name = f"bench_profile_{name}"
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    client.create_collection(collection_name=collection_name, **collection_params_for_profile(profile, corpus.dim))
+
+    start = time.perf_counter()
+    for chunk_start, chunk in corpus.chunks():
+        client.upload_collection(
+            collection_name=collection_name,
+            vectors=chunk,
+            ids=range(chunk_start, chunk_start + len(chunk)),
+            batch_size=args.upload_batch_size,
+            parallel=args.upload_parallel,
+            wait=False
+        )
+    indexed = wait_until_indexed(client, collection_name, args.index_timeout)
+    build_seconds = time.perf_counter() - start
+
+    search_params = search_params_for_profile(profile)
+
+    def search(vector):
+        return client.search(
+            collection_name=collection_name,
+            query_vector=vector.tolist(),
+            limit=args.k,
+            search_params=search_params,
+            with_payload=False
+        )
+
+    for vector in queries[:args.warmup]:
+        search(vector)
+
+    latencies, hits = [], 0
+    for vector, expected in zip(queries, truth):
+        t0 = time.perf_counter()
+        result = search(vector)
+        latencies.append(time.perf_counter() - t0)
+        hits += len(expected & {point.id for point in result})
+
+    if not args.keep:
+        client.delete_collection(collection_name)
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "recall": hits / (len(queries) * args.k),
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+        "qps": len(latencies) / (latencies.sum() / 1000),
+        "build": build_seconds,
+        "indexed": indexed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--profiles", nargs="+", default=list(QDRANT_STORAGE_PROFILES))
+    parser.add_argument("--url", default=QDRANT_URL)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--upload-batch-size", type=int, default=512)
+    parser.add_argument("--upload-parallel", type=int, default=4)
+    parser.add_argument("--index-timeout", type=float, default=3600)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch collections")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.profiles if name not in QDRANT_STORAGE_PROFILES]
+    if unknown:
+        parser.error(f"unknown profiles: {', '.join(unknown)}")
+
+    client = QdrantClient(args.url, timeout=300)
+    corpus = SyntheticCorpus(args.points, args.dim, args.clusters, args.chunk_size)
+    queries = corpus.queries(args.queries)
+
+    t0 = time.perf_counter()
+    truth = exact_top_k(corpus, queries, args.k)
+    print(f"corpus: {args.points} x {args.dim}, {args.queries} queries, exact top-{args.k} in {time.perf_counter() - t0:.1f}s")
+
+    print(f"{'profile':<12}{f'recall@{args.k}':>11}{'p50 ms':>9}{'p99 ms':>9}{'qps':>9}{'build s':>10}")
+    for name in args.profiles:
+        r = bench_profile(client, name, QDRANT_STORAGE_PROFILES[name], corpus, queries, truth, args)
+        note = "" if r["indexed"] else "  (indexing not finished)"
+        print(f"{name:<12}{r['recall']:>11.4f}{r['p50']:>9.2f}{r['p99']:>9.2f}{r['qps']:>9.0f}{r['build']:>10.1f}{note}")
+
+
+if __name__ == "__main__":
+    main()
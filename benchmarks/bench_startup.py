@@ -0,0 +1,105 @@
+"""
+Startup benchmark and regression guard.
+
+Runs `manage.py check` several times in fresh processes and reports wall time and peak RSS.
+It also imports `hexense_core.models` and `hexense_core.semantic` in a fresh process and
+fails if any heavy dependency (torch, sentence_transformers, open_clip, pdfplumber, docx,
+pandas, PIL, qdrant_client, grpc) was loaded at import time.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5 --max-seconds 4 --max-rss-mb 250
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "open_clip",
+    "pdfplumber",
+    "docx",
+    "pandas",
+    "PIL",
+    "qdrant_client",
+    "grpc",
+]
+
+IMPORT_PROBE = """
+import json, os, sys
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hexense_platform.settings")
+import django
+django.setup()
+import hexense_core.models
+import hexense_core.semantic
+print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))
+"""
+
+
+def run_measured(cmd):
+    """
+    Komutu çalıştırır; (duvar saati sn, tepe RSS MB, çıkış kodu, stdout) döndürür.
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    stdout = proc.stdout.read()
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - start
+    # Linux'ta ru_maxrss KB cinsindendir
+    return elapsed, rusage.ru_maxrss / 1024, proc.returncode, stdout.decode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None, help="Fail if median wall time exceeds this")
+    parser.add_argument("--max-rss-mb", type=float, default=None, help="Fail if median peak RSS exceeds this")
+    args = parser.parse_args()
+
+    failures = []
+
+    times, rss = [], []
+    for _ in range(args.runs):
+        elapsed, rss_mb, code, _ = run_measured([sys.executable, "manage.py", "check"])
+        if code != 0:
+            failures.append(f"manage.py check exited with {code}")
+            break
+        times.append(elapsed)
+        rss.append(rss_mb)
+
+    if times:
+        median_time = statistics.median(times)
+        median_rss = statistics.median(rss)
+        print(f"manage.py check: median {median_time:.2f}s (min {min(times):.2f}s, max {max(times):.2f}s), "
+              f"peak RSS median {median_rss:.0f} MB over {len(times)} runs")
+        if args.max_seconds is not None and median_time > args.max_seconds:
+            failures.append(f"wall time {median_time:.2f}s > {args.max_seconds}s")
+        if args.max_rss_mb is not None and median_rss > args.max_rss_mb:
+            failures.append(f"peak RSS {median_rss:.0f} MB > {args.max_rss_mb} MB")
+
+    elapsed, rss_mb, code, out = run_measured([sys.executable, "-c", IMPORT_PROBE.format(heavy=HEAVY_MODULES)])
+    if code != 0:
+        failures.append(f"import probe exited with {code}")
+    else:
+        loaded = json.loads(out.strip().splitlines()[-1])
+        print(f"import models+semantic: {elapsed:.2f}s, peak RSS {rss_mb:.0f} MB, heavy modules loaded: {loaded or 'none'}")
+        if loaded:
+            failures.append(f"heavy modules imported at startup: {', '.join(loaded)}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
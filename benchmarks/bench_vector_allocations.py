@@ -0,0 +1,90 @@
+"""
+Vector allocation benchmark: Python float lists vs float32 numpy arrays.
+
+Simulates the semantic layer path for N vectors (encode output -> embedding cache ->
+Qdrant PointStruct) twice:
+
+- list:  vectors converted with `.tolist()` right after encoding and kept as lists (old path)
+- numpy: vectors kept as float32 arrays; converted only at the Qdrant client boundary
+
+Reports bytes retained per cached vector and bytes allocated per upsert (tracemalloc).
+No model or Qdrant server is needed; encoder output is synthetic.
+
+Usage:
+    python benchmarks/bench_vector_allocations.py --vectors 5000 --dim 384
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "hexense_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+import numpy as np  # noqa: E402
+from qdrant_client.http import models as qdrant_models  # noqa: E402
+
+from hexense_core.embedding_cache import EmbeddingCache, make_key  # noqa: E402
+from hexense_core.semantic import to_qdrant_vector  # noqa: E402
+
+
+def measure(fn):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - before, peak - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    encoded = rng.standard_normal((args.vectors, args.dim)).astype(np.float32)
+    keys = [make_key("bench", f"text {i}") for i in range(args.vectors)]
+    payload = {"conversation_id": "c", "message_id": "m", "is_active": True}
+
+    def fill_cache(as_list):
+        cache = EmbeddingCache(max_entries=args.vectors)
+        vectors = encoded.tolist() if as_list else encoded
+        if as_list:
+            # Eski yol: cache Python listelerini olduğu gibi tutuyordu
+            with cache._lock:
+                for key, vector in zip(keys, vectors):
+                    cache._remember(key, vector)
+        else:
+            cache.put_many(list(zip(keys, vectors)))
+        return cache
+
+    def upsert_points(cache, as_list):
+        points = []
+        for i, key in enumerate(keys):
+            vector = cache.get(key)
+            points.append(qdrant_models.PointStruct(
+                id=i,
+                vector=vector if as_list else to_qdrant_vector(vector),
+                payload=payload
+            ))
+        return points
+
+    print(f"{'path':<8}{'retained/vector':>18}{'alloc/upsert':>16}{'peak/upsert':>14}")
+    for as_list in (True, False):
+        cache, retained, _ = measure(lambda: fill_cache(as_list))
+        _, upsert_current, upsert_peak = measure(lambda: upsert_points(cache, as_list))
+        name = "list" if as_list else "numpy"
+        print(f"{name:<8}{retained / args.vectors:>16.0f} B{upsert_current / args.vectors:>14.0f} B"
+              f"{upsert_peak / args.vectors:>12.0f} B")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Company, Department, Role, UserProfile, Conversation, Message, GptPackageGroup, GptPackage, GptService, GptModel, GptPackageFile
+from .models import Company, Department, Role, UserProfile, Conversation, Message, GptPackageGroup, GptPackage, GptService, GptModel, GptPackageFile, VectorOutbox, IngestionJob
 from django.contrib.postgres.fields import JSONField
 from django.db import models
 from django.forms import widgets
@@ -72,11 +72,28 @@ class GptPackageGroupAdmin(admin.ModelAdmin):
     search_fields = ('name', 'key', 'description')
     fields = ('key', 'name', 'description')
 
+def format_ingestion_progress(job):
+    if job is None:
+        return "-"
+    if job.status == IngestionJob.STATUS_FAILED:
+        return f"Başarısız ({job.get_stage_display()}): {job.error}"
+    if job.status == IngestionJob.STATUS_DONE:
+        return f"Tamamlandı ({job.chunks_total} chunk)"
+    if job.chunks_total:
+        return f"{job.get_stage_display()} {job.chunks_done}/{job.chunks_total} (%{job.progress_percent})"
+    return job.get_stage_display()
+
 class GptPackageFileInline(admin.TabularInline):
     model = GptPackageFile
     extra = 0
-    fields = ('file', 'description', 'uploaded_at', 'uploaded_by')
-    readonly_fields = ('uploaded_at',)
+    fields = ('file', 'description', 'uploaded_at', 'uploaded_by', 'ingestion_progress')
+    readonly_fields = ('uploaded_at', 'ingestion_progress')
+
+    @admin.display(description="İndeksleme")
+    def ingestion_progress(self, obj):
+        if not obj.pk:
+            return "-"
+        return format_ingestion_progress(obj.ingestion_jobs.order_by('-id').first())
 
 @admin.register(GptPackage)
 class GptPackageAdmin(admin.ModelAdmin):
@@ -105,3 +122,35 @@ class GptModelAdmin(admin.ModelAdmin):
     list_display = ('name', 'provider', 'is_active')
     search_fields = ('name', 'key')
     list_filter = ('provider', 'is_active')
+
+
+@admin.register(VectorOutbox)
+class VectorOutboxAdmin(admin.ModelAdmin):
+    list_display = ('collection', 'point_id', 'operation', 'status', 'attempts', 'created_at', 'available_at')
+    list_filter = ('collection', 'operation', 'status')
+    search_fields = ('point_id', 'last_error')
+    readonly_fields = ('created_at',)
+    fields = ('collection', 'point_id', 'operation', 'text', 'payload', 'status', 'attempts',
+              'last_error', 'created_at', 'available_at')
+
+
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = ('package_file', 'status', 'stage', 'progress', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'stage')
+    search_fields = ('package_file__file', 'error')
+    list_select_related = ('package_file__gpt_package',)
+    readonly_fields = ('package_file', 'status', 'stage', 'chunks_done', 'chunks_total', 'stage_timings', 'error',
+                       'attempts', 'created_at', 'started_at', 'finished_at', 'updated_at')
+    actions = ['requeue']
+
+    @admin.display(description="Progress")
+    def progress(self, obj):
+        return format_ingestion_progress(obj)
+
+    @admin.action(description="Seçili job'ları yeniden kuyruğa al")
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(status=IngestionJob.STATUS_RUNNING).update(
+            status=IngestionJob.STATUS_PENDING, stage=IngestionJob.STAGE_QUEUED, chunks_done=0, error=''
+        )
+        self.message_user(request, f"{updated} job yeniden kuyruğa alındı.")
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class HexenseCoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hexense_core'
+
+    def ready(self):
+        from hexense_core.signals import connect_signals
+        connect_signals()
@@ -0,0 +1,182 @@
+# hexense_core/chunking.py
+
+"""
+Token sınırlı metin chunk'lama.
+
+Metin paragraflara bölünür ve tüm paragraflar tek bir encode_batch çağrısıyla tokenize edilir.
+Tokenizer process başına bir kez yüklenir. Paragraflar max_tokens'ı aşmayacak şekilde chunk'larda
+toplanır. Tek başına max_tokens'ı aşan paragraflar önce cümle sınırlarından, gerekirse token
+sınırından parçalanır. Böylece hiçbir chunk embedding modelinin penceresinde sessizce kesilmez.
+Her chunk, ilk paragrafından önceki son başlığı taşır. overlap_tokens > 0 ise her chunk önceki
+chunk'ın sonundan en fazla bu kadar token ile başlar.
+
+CHUNK_MAX_TOKENS varsayılanı all-MiniLM-L6-v2'nin 256 word-piece penceresine sığacak şekilde
+seçilmiştir (cl100k token'ları genellikle daha az sayıda word-piece'e karşılık gelir).
+"""
+
+import re
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+
+CHUNK_TOKENIZER = getattr(settings, "CHUNK_TOKENIZER", "cl100k_base")
+CHUNK_MAX_TOKENS = getattr(settings, "CHUNK_MAX_TOKENS", 200)
+CHUNK_OVERLAP_TOKENS = getattr(settings, "CHUNK_OVERLAP_TOKENS", 0)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+
+class Chunk(NamedTuple):
+    # (paragraf indeksi, metin); bölünmüş bir paragrafın parçaları aynı indeksi taşır
+    paragraphs: List[Tuple[int, str]]
+    heading: Optional[str]
+    tokens: int
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(para for _, para in self.paragraphs)
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(name: str = CHUNK_TOKENIZER):
+    """
+    tiktoken encoding'ini process başına bir kez yükler.
+    """
+    import tiktoken
+    return tiktoken.get_encoding(name)
+
+
+def detect_heading(para: str) -> Optional[str]:
+    # DOCX için heading stilleriyle tespit zaten yapılır, burada düz metin/PDF için heuristik
+    # Markdown başlıkları
+    if para.startswith('#'):
+        return para.lstrip('#').strip()
+    # Büyük harfli, kısa satır (ör: BÖLÜM 1, GİRİŞ)
+    if para.isupper() and 3 < len(para) < 60:
+        return para
+    # Numara ile başlayan başlıklar (ör: 1. Giriş, 2.1 Alt Başlık)
+    if (para[:3].replace('.', '').isdigit() and len(para) < 80):
+        return para
+    # Son olarak: 50 karakterden kısa, ilk harfi büyük, sonunda nokta yoksa
+    if len(para) < 50 and para[:1].isupper() and not para.endswith('.'):
+        return para
+    return None
+
+
+def _split_tokens(tokenizer, tokens: list, max_tokens: int) -> List[Tuple[str, list]]:
+    # Son çare: token sınırından böl (çok uzun tek cümle, tablo dökümü vb.)
+    return [(tokenizer.decode(tokens[i:i + max_tokens]), tokens[i:i + max_tokens])
+            for i in range(0, len(tokens), max_tokens)]
+
+
+def _split_paragraph(tokenizer, para: str, tokens: list, max_tokens: int) -> List[Tuple[str, list]]:
+    """
+    max_tokens'ı aşan bir paragrafı cümle sınırlarından en fazla max_tokens'lık parçalara böler.
+    """
+    sentences = [s for s in _SENTENCE_END.split(para) if s]
+    if len(sentences) < 2:
+        return _split_tokens(tokenizer, tokens, max_tokens)
+    pieces = []
+    current, current_tokens = [], []
+    for sentence, sentence_tokens in zip(sentences, tokenizer.encode_ordinary_batch(sentences)):
+        if len(sentence_tokens) > max_tokens:
+            if current:
+                pieces.append((' '.join(current), current_tokens))
+                current, current_tokens = [], []
+            pieces.extend(_split_tokens(tokenizer, sentence_tokens, max_tokens))
+            continue
+        if current and len(current_tokens) + len(sentence_tokens) > max_tokens:
+            pieces.append((' '.join(current), current_tokens))
+            current, current_tokens = [], []
+        current.append(sentence)
+        current_tokens = current_tokens + sentence_tokens
+    if current:
+        pieces.append((' '.join(current), current_tokens))
+    return pieces
+
+
+def _overlap_units(tokenizer, units: list, overlap_tokens: int) -> list:
+    """
+    Önceki chunk'ın sonundan en fazla overlap_tokens token'lık birimleri döndürür.
+    """
+    carried, budget = [], overlap_tokens
+    for index, text, tokens in reversed(units):
+        if len(tokens) <= budget:
+            carried.insert(0, (index, text, tokens))
+            budget -= len(tokens)
+            continue
+        if budget > 0 and not carried:
+            # Son birim tek başına fazla uzunsa yalnızca son token'ları taşınır
+            tail = tokens[-budget:]
+            carried.insert(0, (index, tokenizer.decode(tail), tail))
+        break
+    return carried
+
+
+def chunk_text(text: str, max_tokens: int = None, overlap_tokens: int = None, tokenizer_name: str = None) -> List[Chunk]:
+    """
+    Metni token sınırlı chunk'lara böler.
+
+    Args:
+        text (str): Satır sonlarıyla ayrılmış paragraflar
+        max_tokens (int, optional): Chunk başına en fazla token (varsayılan CHUNK_MAX_TOKENS)
+        overlap_tokens (int, optional): Ardışık chunk'lar arasında tekrar eden en fazla token (varsayılan CHUNK_OVERLAP_TOKENS)
+        tokenizer_name (str, optional): tiktoken encoding adı (varsayılan CHUNK_TOKENIZER)
+
+    Returns:
+        list: Chunk listesi (paragraflar, başlık, token sayısı)
+    """
+    max_tokens = max_tokens or CHUNK_MAX_TOKENS
+    overlap_tokens = CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be >= 0 and smaller than max_tokens")
+    tokenizer = get_tokenizer(tokenizer_name or CHUNK_TOKENIZER)
+
+    paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
+    if not paragraphs:
+        return []
+    # Özel token metinleri (ör. "<|endoftext|>") düz metin olarak sayılır
+    paragraph_tokens = tokenizer.encode_ordinary_batch(paragraphs)
+
+    # Başlık tespiti: her paragraf, kendisinden önceki (ya da kendisi olan) son başlığa bağlanır
+    headings = []
+    current_heading = None
+    for para in paragraphs:
+        heading = detect_heading(para)
+        if heading:
+            current_heading = heading
+        headings.append(current_heading)
+
+    # (paragraf indeksi, metin, token'lar) birimleri; uzun paragraflar parçalanır
+    units = []
+    for index, (para, tokens) in enumerate(zip(paragraphs, paragraph_tokens)):
+        if len(tokens) > max_tokens:
+            units.extend((index, piece, piece_tokens)
+                         for piece, piece_tokens in _split_paragraph(tokenizer, para, tokens, max_tokens))
+        else:
+            units.append((index, para, tokens))
+
+    chunks = []
+    current, current_count = [], 0
+    for unit in units:
+        if current and current_count + len(unit[2]) > max_tokens:
+            chunks.append(current)
+            current = _overlap_units(tokenizer, current, overlap_tokens)
+            # Taşınan kısım yeni birimle birlikte sığmıyorsa kırpılır
+            while current and sum(len(t) for _, _, t in current) + len(unit[2]) > max_tokens:
+                current.pop(0)
+            current_count = sum(len(t) for _, _, t in current)
+        current.append(unit)
+        current_count += len(unit[2])
+    if current:
+        chunks.append(current)
+
+    return [
+        Chunk(
+            paragraphs=[(index, piece) for index, piece, _ in chunk_units],
+            heading=headings[chunk_units[0][0]],
+            tokens=sum(len(t) for _, _, t in chunk_units),
+        )
+        for chunk_units in chunks
+    ]
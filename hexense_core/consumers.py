@@ -137,7 +137,10 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 if not self.conversation:
                     self.conversation = await self.get_or_create_conversation_for_gpt_package()
 
-                can_continue = await self.evaluate_gpt_package(message_content)
+                # Mesaj bu tur için bir kez encode edilir; paket yönlendirmesi ve hafıza araması aynı vektörü kullanır
+                query_embedding = await semantic.aget_embedding(message_content)
+
+                can_continue = await self.evaluate_gpt_package(message_content, query_vector=query_embedding)
                 if not can_continue:
                     return
 
@@ -152,7 +155,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 await self.maybe_update_conversation_summary()
 
                 # --- HAFIZA ARAMASI: QDRANT'TAN GEÇMİŞ KONUMLARI ÇEK ---
-                memory_contexts = await self.search_memory_contexts(message_content)
+                memory_contexts = await self.search_memory_contexts(message_content, query_vector=query_embedding)
 
                 # --- LLM'E GÖNDERİLECEK MESAJ GEÇMİŞİNİ HAZIRLA ---
                 history_messages = await self.prepare_message_history()
@@ -440,7 +443,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             logger.error(f"Error in generate_response_from_dispatcher: {e}", exc_info=True)
             await self.send_error(f"Yanıt üretirken bir hata oluştu: {str(e)}")
 
-    async def evaluate_gpt_package(self, user_input: str, conversation_summary: Optional[str] = None) -> bool:
+    async def evaluate_gpt_package(self, user_input: str, conversation_summary: Optional[str] = None, query_vector=None) -> bool:
         """
         1. Context ve tool uygunluğunu kontrol eder.
         2. Gerekirse semantic arama ile yeni bir GPT paketi önerir.
@@ -449,13 +452,13 @@ class ChatConsumer(AsyncWebsocketConsumer):
         # 1. Context uygunluğu kontrolü
         if not self.is_context_compatible(self.gpt_package, conversation_summary):
             # Uygun değilse semantic arama ile yeni paket bul
-            return await self.switch_gpt_package_by_semantic(user_input)
+            return await self.switch_gpt_package_by_semantic(user_input, query_vector=query_vector)
 
         # 2. Tool uygunluğu kontrolü
         required_tool = self.extract_required_tool(user_input)
         if required_tool and not self.gpt_package_has_tool(self.gpt_package, required_tool):
             # Gerekli tool yoksa semantic arama ile yeni paket bul
-            return await self.switch_gpt_package_by_semantic(user_input, required_tool)
+            return await self.switch_gpt_package_by_semantic(user_input, required_tool, query_vector=query_vector)
 
         # Her şey uygunsa devam et
         return True
@@ -486,12 +489,12 @@ class ChatConsumer(AsyncWebsocketConsumer):
             return False
         return any(service.key == tool_key for service in gpt_package.services.all())
 
-    async def switch_gpt_package_by_semantic(self, user_input, required_tool=None):
+    async def switch_gpt_package_by_semantic(self, user_input, required_tool=None, query_vector=None):
         """
         find_best_gpt_package fonksiyonunu çağırır, gerekirse required_tool'u da dikkate alır.
         """
         # TODO: required_tool parametresi semantic aramaya entegre edilebilir.
-        best_package_info = await sync_to_async(find_best_gpt_package)(user_input, self.user_profile)
+        best_package_info = await sync_to_async(find_best_gpt_package)(user_input, self.user_profile, query_vector=query_vector)
         if best_package_info:
             best_package, score = best_package_info
             if best_package and score > self.similarity_threshold:
@@ -550,7 +553,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         context_text = " ".join([m["content"] for m in messages if m["content"]])
         # LLM ile özetleme (örnek, burada basitçe ilk 300 karakteri alıyoruz, gerçek özetleme için LLM çağrısı eklenebilir)
         summary = context_text[:300] + ("..." if len(context_text) > 300 else "")
-        embedding = await sync_to_async(semantic.get_embedding)(summary)
+        embedding = await semantic.aget_embedding(summary)
         timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
         payload = {
             "id": f"{self.conversation.id}_{timestamp}",
@@ -559,23 +562,26 @@ class ChatConsumer(AsyncWebsocketConsumer):
             "summary": summary,
             "timestamp": timestamp
         }
-        await sync_to_async(semantic.add_to_qdrant)(
+        await semantic.aadd_to_qdrant(
             collection_name="conversation_contexts",
             text=summary,
-            payload=payload
+            payload=payload,
+            vector=embedding
         )
         self.conversations_pool[self.conversation.id] = {"summary": summary, "embedding": embedding, "timestamp": timestamp}
 
     # --- QDRANT'TAN HAFIZA ARAMASI ---
-    async def search_memory_contexts(self, query: str):
-        query_embedding = await sync_to_async(semantic.get_embedding)(query)
-        filter_dict = {"user_profile_id": str(self.user_profile.id)}
-        results = await sync_to_async(semantic.search_qdrant)(
-            collection_name="conversation_contexts",
-            text=query,
-            filter=filter_dict,
-            limit=self.memory_context_limit
-        )
+    async def search_memory_contexts(self, query: str, query_vector=None):
+        # Turdaki Qdrant aramaları asearch_many ile tek embedding ve koleksiyon başına tek istekte yapılır;
+        # paket dosyası araması eklendiğinde bu listeye eklenir
+        searches = [{
+            "collection": "conversation_contexts",
+            "text": query,
+            "filter": {"user_profile_id": str(self.user_profile.id)},
+            "limit": self.memory_context_limit,
+            "query_vector": query_vector
+        }]
+        results, = await semantic.asearch_many(searches)
         memory_contexts = []
         for r in results:
             payload = r.payload
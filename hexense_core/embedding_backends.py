@@ -0,0 +1,240 @@
+# hexense_core/embedding_backends.py
+
+"""
+Metin embedding backend'leri.
+
+Her backend aynı arayüzü sunar: `encode(texts, batch_size)` float32 numpy dizisi
+(len(texts), dimension) döndürür. Backend `EMBEDDING_BACKEND` ayarıyla seçilir.
+
+- sentence_transformers: PyTorch üzerinde SentenceTransformer (varsayılan)
+- onnx_int8: Aynı modelin ONNX Runtime ile çalışan, int8 dinamik quantize edilmiş hali (yalnızca CPU)
+
+Bu modül Django'ya bağımlı değildir; embedding worker process'lerinde de kullanılır.
+"""
+
+import contextlib
+import inspect
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Type
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBackend:
+    """
+    Embedding backend arayüzü.
+    """
+    name = None
+
+    def __init__(self, model_name: str, **options):
+        self.model_name = model_name
+
+    @property
+    def dimension(self) -> int:
+        raise NotImplementedError
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    name = "sentence_transformers"
+
+    def __init__(self, model_name: str, **options):
+        super().__init__(model_name)
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        return self.model.encode(
+            list(texts),
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype(np.float32, copy=False)
+
+
+def _hf_model_id(model_name: str) -> str:
+    # 'all-MiniLM-L6-v2' gibi kısa isimler sentence-transformers organizasyonu altındadır
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+
+def export_onnx_int8(model_name: str, output_dir: str, opset: int = 14) -> str:
+    """
+    Transformer gövdesini ONNX'e export eder, ağırlıkları int8'e dinamik quantize eder ve
+    tokenizer'ı aynı klasöre kaydeder. Quantize edilmiş model dosyasının yolunu döndürür.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(output_dir, exist_ok=True)
+    hf_id = _hf_model_id(model_name)
+    tokenizer = AutoTokenizer.from_pretrained(hf_id)
+    model = AutoModel.from_pretrained(hf_id).eval()
+
+    dummy = tokenizer(["örnek metin"], return_tensors="pt")
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in dummy]
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    int8_path = os.path.join(output_dir, "model_int8.onnx")
+    dynamic_axes = {n: {0: "batch", 1: "sequence"} for n in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    export_options = {}
+    # torch 2.9+ varsayılan olarak onnxscript gerektiren dynamo exporter'ı kullanır; dynamic_axes ile
+    # çalışan TorchScript exporter'ı açıkça seçilir (eski sürümlerde dynamo parametresi yoktur)
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_options["dynamo"] = False
+    class _Encoder(torch.nn.Module):
+        # Girdiler isimle verilir; forward'ın pozisyonel parametre sırası transformers sürümleri arasında değişiyor
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    with torch.no_grad():
+        torch.onnx.export(
+            _Encoder(),
+            tuple(dummy[n] for n in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            **export_options
+        )
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(output_dir)
+    logger.info(f"Exported int8 ONNX model for {model_name} to {int8_path}")
+    return int8_path
+
+
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """
+    Process'ler arası özel kilit (fcntl.flock). fcntl olmayan platformlarda kilitlenmez; export yine de
+    atomik yer değiştirmeyle yapıldığı için yarım dosya okunmaz, yalnızca export birden fazla kez yapılabilir.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def ensure_onnx_int8(model_name: str, onnx_dir: str) -> str:
+    """
+    onnx_dir'de quantize edilmiş model yoksa export eder ve model yolunu döndürür.
+
+    Process havuzundaki worker'lar aynı anda başlayabildiği için export bir dosya kilidi altında, geçici
+    bir klasöre yapılır; dosyalar onnx_dir'e os.replace ile taşınır ve model dosyası en son taşınır.
+    Böylece model_int8.onnx görünür olduğunda tokenizer dosyaları da yerindedir ve hiçbir process
+    yarım yazılmış bir dosya yüklemez.
+    """
+    model_path = os.path.join(onnx_dir, "model_int8.onnx")
+    if os.path.exists(model_path):
+        return model_path
+    os.makedirs(onnx_dir, exist_ok=True)
+    with _file_lock(os.path.join(onnx_dir, ".export.lock")):
+        # Kilidi bekleyen process'ler export'u başka bir process'in tamamlamış olduğunu görür
+        if os.path.exists(model_path):
+            return model_path
+        tmp_dir = tempfile.mkdtemp(prefix=".export-", dir=onnx_dir)
+        try:
+            export_onnx_int8(model_name, tmp_dir)
+            for file_name in sorted(os.listdir(tmp_dir), key=lambda n: n == "model_int8.onnx"):
+                if file_name != "model.onnx":
+                    os.replace(os.path.join(tmp_dir, file_name), os.path.join(onnx_dir, file_name))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return model_path
+
+
+class OnnxInt8Backend(EmbeddingBackend):
+    """
+    SentenceTransformer pipeline'ının (transformer + mean pooling + L2 normalize) ONNX Runtime karşılığı.
+
+    Args:
+        model_name (str): SentenceTransformer model adı
+        onnx_dir (str): Quantize edilmiş model ve tokenizer klasörü; yoksa ilk yüklemede export edilir
+        max_seq_length (int): Tokenizer kesme uzunluğu (MiniLM için 256)
+        intra_op_threads (int): ONNX Runtime intra-op thread sayısı (0: runtime karar verir)
+    """
+    name = "onnx_int8"
+
+    def __init__(self, model_name: str, onnx_dir: str = None, max_seq_length: int = 256, intra_op_threads: int = 0, **options):
+        super().__init__(model_name)
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        self.onnx_dir = onnx_dir or os.path.join(os.path.expanduser("~"), ".cache", "hexense", "onnx", model_name)
+        model_path = ensure_onnx_int8(model_name, self.onnx_dir)
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            session_options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(model_path, session_options, providers=["CPUExecutionProvider"])
+        self._input_names = [i.name for i in self.session.get_inputs()]
+        self.tokenizer = AutoTokenizer.from_pretrained(self.onnx_dir)
+        self.max_seq_length = max_seq_length
+        self._dimension = self.session.get_outputs()[0].shape[-1]
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        texts = list(texts)
+        outputs = []
+        for i in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[i:i + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self._input_names}
+            hidden = self.session.run(None, feeds)[0]
+            # Mean pooling (padding token'ları hariç) + L2 normalize
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            outputs.append((pooled / np.clip(norms, 1e-12, None)).astype(np.float32))
+        if not outputs:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.concatenate(outputs)
+
+
+BACKENDS: Dict[str, Type[EmbeddingBackend]] = {
+    SentenceTransformerBackend.name: SentenceTransformerBackend,
+    OnnxInt8Backend.name: OnnxInt8Backend,
+}
+
+
+def create_backend(backend_name: str, model_name: str, **options) -> EmbeddingBackend:
+    """
+    İsmi verilen backend'i oluşturur.
+    """
+    try:
+        backend_cls = BACKENDS[backend_name]
+    except KeyError:
+        raise ValueError(f"Unknown embedding backend '{backend_name}'. Available: {', '.join(BACKENDS)}")
+    return backend_cls(model_name, **options)
@@ -0,0 +1,85 @@
+# hexense_core/embedding_batcher.py
+
+import asyncio
+import logging
+from typing import Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Farklı websocket oturumlarından aynı anda gelen tekil embedding isteklerini
+    tek bir `encode()` çağrısında birleştiren asenkron mikro-batcher.
+
+    İlk istek geldiğinde `max_wait_ms` kadar beklenir; bu süre dolduğunda veya
+    kuyruk `max_batch_size`'a ulaştığında biriken metinler tek seferde encode edilir
+    ve her sonuç kendi çağıranına geri döner.
+
+    Args:
+        encode_fn (Callable): Metin listesi alıp aynı sırada vektör listesi döndüren fonksiyon
+        max_batch_size (int): Tek bir encode çağrısındaki en fazla metin sayısı
+        max_wait_ms (float): İlk istekten sonra batch'in dolması için beklenecek süre (ms)
+    """
+
+    def __init__(self, encode_fn: Callable[[List[str]], Sequence], max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._pending = []  # [(text, future)]
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def embed(self, text: str):
+        """
+        Tek bir metnin embedding'ini döndürür; istek diğer eşzamanlı isteklerle birlikte encode edilir.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Batcher farklı bir event loop'ta kullanılıyorsa (ör. testler, asyncio.run) durumu sıfırla
+            self._reset(loop)
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> list:
+        """
+        Birden fazla metni batcher üzerinden encode eder; sonuçlar giriş sırasıyla döner.
+        """
+        return list(await asyncio.gather(*(self.embed(t) for t in texts)))
+
+    def _reset(self, loop):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = None
+        self._pending = []
+        self._loop = loop
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            self._loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch):
+        # Aynı batch içinde tekrar eden metinleri bir kez encode et
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = await self._loop.run_in_executor(None, self._encode_fn, unique_texts)
+        except Exception as e:
+            logger.error(f"Embedding batch failed ({len(unique_texts)} texts): {e}", exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
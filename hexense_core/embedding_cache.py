@@ -0,0 +1,191 @@
+# hexense_core/embedding_cache.py
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Cache anahtarı için metni normalize eder: Unicode NFC, baş/son boşlukları kırpar
+    ve ardışık boşlukları tek boşluğa indirir. Büyük/küçük harf korunur.
+    """
+    text = unicodedata.normalize("NFC", text or "")
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def make_key(model_name: str, text: str) -> Tuple[str, str]:
+    """
+    (model adı, normalize edilmiş metnin sha256 özeti) anahtarını döndürür.
+    """
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return model_name, digest
+
+
+def _frozen_float32(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    if vector.flags.writeable:
+        # Batch satırları gibi view'lar tüm batch'i bellekte tutmasın diye kopyalanır
+        vector = vector.copy() if vector.base is not None else vector
+        vector.setflags(write=False)
+    return vector
+
+
+class EmbeddingCache:
+    """
+    İçerik adresli embedding cache'i.
+
+    İki katmanlıdır: sınırlı boyutlu bir bellek içi LRU katmanı ve isteğe bağlı,
+    yeniden başlatmalarda korunan SQLite tabanlı bir disk katmanı. Diskten okunan
+    kayıtlar bellek katmanına da yüklenir.
+
+    Vektörler float32 numpy dizileri olarak saklanır ve salt okunur işaretlenir;
+    aynı dizi birden fazla çağırana paylaşıldığı için yerinde değiştirilmemelidir.
+
+    Args:
+        max_entries (int): Bellek katmanındaki en fazla kayıt sayısı (0 ise bellek katmanı kapalı)
+        disk_path (str, optional): Disk katmanı için SQLite dosya yolu (None ise disk katmanı kapalı)
+    """
+
+    def __init__(self, max_entries: int = 10000, disk_path: Optional[str] = None):
+        self.max_entries = max(0, int(max_entries))
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_path:
+            self._open_disk(disk_path)
+
+    def _open_disk(self, disk_path: str):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, digest TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, digest))"
+            )
+            self._disk.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Embedding disk cache could not be opened at {disk_path}: {e}")
+            self._disk = None
+
+    def get(self, key: Tuple[str, str], memory_only: bool = False) -> Optional[np.ndarray]:
+        """
+        Anahtara ait vektörü döndürür, yoksa None. memory_only=True ise disk katmanına bakılmaz
+        ve ıskalama sayacı artırılmaz (async hızlı yol için).
+        """
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+            if memory_only:
+                return None
+            vector = self._read_disk(key)
+            if vector is not None:
+                self.disk_hits += 1
+                self._remember(key, vector)
+                return vector
+            self.misses += 1
+            return None
+
+    def get_many(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        Bulunan anahtarları {anahtar: vektör} olarak döndürür.
+        """
+        found = {}
+        for key in keys:
+            vector = self.get(key)
+            if vector is not None:
+                found[key] = vector
+        return found
+
+    def put_many(self, items: List[Tuple[Tuple[str, str], np.ndarray]]):
+        """
+        (anahtar, vektör) çiftlerini her iki katmana yazar.
+        """
+        if not items:
+            return
+        items = [(key, _frozen_float32(vector)) for key, vector in items]
+        with self._lock:
+            for key, vector in items:
+                self._remember(key, vector)
+            if self._disk is not None:
+                try:
+                    self._disk.executemany(
+                        "INSERT OR REPLACE INTO embeddings (model, digest, vector) VALUES (?, ?, ?)",
+                        [(model, digest, vector.tobytes()) for (model, digest), vector in items]
+                    )
+                    self._disk.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Embedding disk cache write failed: {e}")
+
+    def put(self, key: Tuple[str, str], vector: np.ndarray):
+        self.put_many([(key, vector)])
+
+    def _remember(self, key, vector):
+        if self.max_entries == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        if self._disk is None:
+            return None
+        try:
+            row = self._disk.execute(
+                "SELECT vector FROM embeddings WHERE model = ? AND digest = ?", key
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Embedding disk cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        # bytes üzerinden oluşturulan dizi zaten salt okunurdur
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def clear(self, disk: bool = False):
+        with self._lock:
+            self._memory.clear()
+            if disk and self._disk is not None:
+                self._disk.execute("DELETE FROM embeddings")
+                self._disk.commit()
+
+    def stats(self) -> dict:
+        """
+        Cache sayaçlarını döndürür (hits: bellek isabeti, disk_hits: disk isabeti, misses: ıskalama).
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk_enabled": self._disk is not None,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.disk_hits = self.misses = 0
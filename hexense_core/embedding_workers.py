@@ -0,0 +1,260 @@
+# hexense_core/embedding_workers.py
+
+"""
+Embedding modellerini (metin backend'i ve CLIP) ASGI event loop'undan ayrı,
+özel bir process pool içinde çalıştırır.
+
+Worker'lar sonuç vektörlerini pickle edilmiş Python listeleri yerine float32
+numpy dizileri olarak shared memory'ye yazar; ana process yalnızca segment adını
+ve boyutunu alır, veriyi tek bir kopyayla okur ve segmenti siler.
+
+Bu modül Django'ya bağımlı değildir; spawn edilen worker'lar Django ayarlarını yüklemez.
+"""
+
+import atexit
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CLIP_MODEL_NAME = 'ViT-B-32'
+CLIP_PRETRAINED = 'openai'
+
+
+def load_clip_model():
+    """
+    CLIP modelini, ön işleme fonksiyonunu ve tokenizer'ı yükler.
+    """
+    import open_clip
+    clip_model, _, clip_preprocess = open_clip.create_model_and_transforms(CLIP_MODEL_NAME, pretrained=CLIP_PRETRAINED)
+    clip_tokenizer = open_clip.get_tokenizer(CLIP_MODEL_NAME)
+    clip_model.eval()
+    return clip_model, clip_preprocess, clip_tokenizer
+
+
+def encode_images_with_clip(clip_model, clip_preprocess, images: List[bytes]) -> Tuple[np.ndarray, List[int]]:
+    """
+    Görsel baytlarını tek bir CLIP forward çağrısında encode eder.
+    Açılamayan görseller atlanır; başarılı görsellerin giriş indeksleri ayrıca döner.
+    """
+    import torch
+    from PIL import Image
+    tensors, indices = [], []
+    for idx, img_bytes in enumerate(images):
+        try:
+            image = Image.open(io.BytesIO(img_bytes)).convert('RGB')
+            tensors.append(clip_preprocess(image))
+            indices.append(idx)
+        except Exception:
+            continue
+    if not tensors:
+        return np.zeros((0, 0), dtype=np.float32), []
+    with torch.no_grad():
+        features = clip_model.encode_image(torch.stack(tensors))
+    return features.cpu().numpy().astype(np.float32, copy=False), indices
+
+
+# --- Worker tarafı ---
+
+_worker_backend_args = None
+_worker_backend = None
+_worker_clip = None
+
+
+def _init_worker(backend_name: str, text_model_name: str, backend_options: dict, torch_threads: int):
+    global _worker_backend_args
+    _worker_backend_args = (backend_name, text_model_name, backend_options)
+    try:
+        import torch
+        torch.set_num_threads(max(1, torch_threads))
+    except ImportError:
+        pass
+    # Metin modelini worker açılırken yükle ki ilk istek model yükleme süresini beklemesin
+    _get_worker_backend()
+
+
+def _get_worker_backend():
+    global _worker_backend
+    if _worker_backend is None:
+        from hexense_core.embedding_backends import create_backend
+        backend_name, text_model_name, backend_options = _worker_backend_args
+        _worker_backend = create_backend(backend_name, text_model_name, **backend_options)
+    return _worker_backend
+
+
+def _to_shared_memory(array: np.ndarray) -> Tuple[str, tuple]:
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=np.float32, buffer=shm.buf)
+    view[...] = array
+    del view
+    name = shm.name
+    # Segment ana process tarafından okunup silinene kadar yaşar
+    shm.close()
+    return name, array.shape
+
+
+def _unlink_shared_memory(name: str):
+    # Okunmayacak bir segmenti siler (ör. aynı isteğin başka bir parçası başarısız olduysa)
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _from_shared_memory(name: str, shape: tuple) -> np.ndarray:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        result = view.copy()
+        del view
+    finally:
+        shm.close()
+        shm.unlink()
+    return result
+
+
+def _encode_texts_job(texts: List[str], batch_size: int) -> Tuple[str, tuple]:
+    vectors = _get_worker_backend().encode(texts, batch_size=batch_size)
+    return _to_shared_memory(vectors)
+
+
+def _encode_images_job(images: List[bytes]) -> Tuple[str, tuple, List[int]]:
+    global _worker_clip
+    if _worker_clip is None:
+        _worker_clip = load_clip_model()
+    clip_model, clip_preprocess, _ = _worker_clip
+    vectors, indices = encode_images_with_clip(clip_model, clip_preprocess, images)
+    name, shape = _to_shared_memory(vectors)
+    return name, shape, indices
+
+
+# --- Ana process tarafı ---
+
+class EmbeddingProcessPool:
+    """
+    SentenceTransformer ve CLIP encode işlemlerini ayrı process'lerde çalıştıran havuz.
+
+    Args:
+        text_model_name (str): Worker'larda yüklenecek metin embedding modeli adı
+        backend_name (str): Worker'larda kullanılacak embedding backend'i (bkz. embedding_backends)
+        backend_options (dict): Backend'e iletilecek ek parametreler
+        workers (int): Worker process sayısı
+        batch_size (int): Worker içindeki encode batch boyutu
+        min_texts_per_worker (int): Girdi bu sayının katlarını aşınca worker'lara bölünerek paralel encode edilir
+    """
+
+    def __init__(self, text_model_name: str, backend_name: str = "sentence_transformers", backend_options: dict = None,
+                 workers: int = 2, batch_size: int = 32, min_texts_per_worker: int = 16):
+        self.workers = max(1, int(workers))
+        self.batch_size = batch_size
+        self.min_texts_per_worker = max(1, int(min_texts_per_worker))
+        torch_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self._initargs = (backend_name, text_model_name, backend_options or {}, torch_threads)
+        self._executor_lock = threading.Lock()
+        self._executor = self._create_executor()
+        atexit.register(self.shutdown)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            # fork, ana process'teki torch/thread durumunu kopyalayacağı için spawn kullanılır
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=self._initargs
+        )
+
+    def _reset_executor(self, broken: ProcessPoolExecutor):
+        """
+        Bir worker öldüğünde (OOM, segfault) ProcessPoolExecutor kalıcı olarak BrokenProcessPool durumuna geçer;
+        sonraki istekler için yeni bir executor açılır. Aynı anda gelen çağrılar executor'ı yalnızca bir kez yeniler.
+        """
+        with self._executor_lock:
+            if self._executor is not broken:
+                return
+            logger.warning("Embedding process pool is broken, starting new worker processes")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+
+    def _submit(self, fn, *args):
+        executor = self._executor
+        try:
+            return executor, executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            executor = self._executor
+            return executor, executor.submit(fn, *args)
+
+    def _run(self, fn, arg_list: list, shared: bool = True) -> list:
+        """
+        fn'i her argüman demeti için worker'larda çalıştırır ve sonuçları sırayla döndürür.
+        Tüm görevler beklenir; biri başarısız olursa diğerlerinin shared memory segmentleri
+        (shared=True iken sonucun ilk elemanı) silinir ve hata yükseltilir.
+        """
+        submitted, results, error = [], [], None
+        try:
+            for args in arg_list:
+                submitted.append(self._submit(fn, *args))
+        except Exception as e:
+            # Gönderilebilmiş görevler yine beklenir ki segmentleri silinebilsin
+            error = e
+        for executor, future in submitted:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    self._reset_executor(executor)
+                error = error or e
+        if error is not None:
+            if shared:
+                for result in results:
+                    _unlink_shared_memory(result[0])
+            raise error
+        return results
+
+    @staticmethod
+    def _read_shared(results: list) -> List[np.ndarray]:
+        # Her segment okunduktan sonra silinir; okuma yarıda kalırsa kalan segmentler de silinir
+        arrays = []
+        try:
+            for result in results:
+                arrays.append(_from_shared_memory(result[0], result[1]))
+        finally:
+            for result in results[len(arrays):]:
+                _unlink_shared_memory(result[0])
+        return arrays
+
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Metinleri (gerekirse worker'lara bölerek) encode eder; (len(texts), dim) float32 dizi döndürür.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        parts = min(self.workers, max(1, len(texts) // self.min_texts_per_worker))
+        step = -(-len(texts) // parts)
+        results = self._run(_encode_texts_job, [(texts[i:i + step], self.batch_size) for i in range(0, len(texts), step)])
+        arrays = self._read_shared(results)
+        return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+    def encode_images(self, images: List[bytes]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Görselleri CLIP ile encode eder; (vektörler, başarılı görsellerin indeksleri) döndürür.
+        """
+        result, = self._run(_encode_images_job, [(list(images),)])
+        vectors, = self._read_shared([result])
+        return vectors, result[2]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
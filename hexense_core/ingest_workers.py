@@ -0,0 +1,84 @@
+# hexense_core/ingest_workers.py
+
+"""
+Büyük dokümanların (yüzlerce sayfalık PDF kılavuzları) sayfa aralıkları halinde paralel işlenmesi.
+
+DocumentIngestPool, EmbeddingProcessPool worker'larını kullanır: aynı process'ler hem sayfa
+aralıklarından metin/görsel çıkarır hem de chunk ve görsel embedding'lerini üretir. Sayfa
+sonuçları sayfa numarasına göre birleştirilir; çıktı sıralı extract_pdf ile birebir aynıdır, bu
+yüzden chunk sırası ve nokta ID'leri worker sayısından bağımsızdır.
+
+Bu modül Django'ya bağımlı değildir; worker'lara dosya yolu gönderilir, dosya içeriği gönderilmez.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from hexense_core.embedding_workers import EmbeddingProcessPool, _encode_images_job
+from hexense_core.pdf_extract import PDF_RENDER_RESOLUTION, PdfPage, iter_pdf_pages
+
+
+def pdf_page_count(path: str) -> int:
+    import pdfplumber
+    with pdfplumber.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pages_job(path: str, page_numbers: List[int], resolution: int) -> List[PdfPage]:
+    return list(iter_pdf_pages(path, resolution=resolution, page_numbers=page_numbers))
+
+
+class DocumentIngestPool(EmbeddingProcessPool):
+    """
+    Sayfa aralığı bazında PDF çıkarma ve worker'lara bölünmüş embedding yapan havuz.
+
+    Args:
+        pages_per_task (int): Bir worker görevine verilecek ardışık sayfa sayısı
+        min_images_per_worker (int): Görseller bu sayının katlarını aşınca worker'lara bölünerek encode edilir
+        Diğer parametreler için bkz. EmbeddingProcessPool
+    """
+
+    def __init__(self, text_model_name: str, pages_per_task: int = 16, min_images_per_worker: int = 8, **kwargs):
+        super().__init__(text_model_name, **kwargs)
+        self.pages_per_task = max(1, int(pages_per_task))
+        self.min_images_per_worker = max(1, int(min_images_per_worker))
+
+    def extract_pdf(self, path: str, page_count: int = None, resolution: int = PDF_RENDER_RESOLUTION) -> Tuple[str, List[bytes]]:
+        """
+        PDF'i sayfa aralıkları halinde worker'larda işler; extract_pdf ile aynı (metin, görseller) çıktısını döndürür.
+        """
+        if page_count is None:
+            page_count = pdf_page_count(path)
+        ranges = [
+            list(range(start, min(start + self.pages_per_task, page_count + 1)))
+            for start in range(1, page_count + 1, self.pages_per_task)
+        ]
+        results = self._run(_extract_pages_job, [(path, pages, resolution) for pages in ranges], shared=False)
+        # Görevler farklı sırada bitse de sayfalar numara sırasıyla birleştirilir
+        pages = sorted((page for result in results for page in result), key=lambda page: page.number)
+        texts, images = [], []
+        for page in pages:
+            texts.append(page.text)
+            images.extend(page.images)
+        return '\n'.join(texts), images
+
+    def encode_images(self, images: List[bytes]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Görselleri worker'lara bölerek CLIP ile encode eder; (vektörler, başarılı görsellerin indeksleri) döndürür.
+        """
+        images = list(images)
+        parts = min(self.workers, max(1, len(images) // self.min_images_per_worker))
+        if parts == 1:
+            return super().encode_images(images)
+        step = -(-len(images) // parts)
+        offsets = range(0, len(images), step)
+        results = self._run(_encode_images_job, [(images[offset:offset + step],) for offset in offsets])
+        arrays, indices = [], []
+        for offset, (_, _, part_indices), vectors in zip(offsets, results, self._read_shared(results)):
+            if part_indices:
+                arrays.append(vectors)
+                indices.extend(offset + i for i in part_indices)
+        if not arrays:
+            return np.zeros((0, 0), dtype=np.float32), []
+        return np.concatenate(arrays), indices
@@ -0,0 +1,244 @@
+# hexense_core/ingestion.py
+
+"""
+GptPackageFile ingestion job'larını işleyen arka plan worker'ı.
+
+Job'lar id sırasıyla select_for_update(skip_locked) ile alınır; birden fazla worker aynı job'ı
+almadan paralel çalışabilir. Aynı dosyanın job'ları hiçbir zaman aynı anda çalışmaz: dosyası için
+canlı bir 'running' job'ı olan bekleyen job'lar alınmaz ve alım dosya satırı kilitlenerek yapılır.
+Çalışan job'ın kaydı ilerlemeden bağımsız bir heartbeat thread'i tarafından INGESTION_HEARTBEAT_SECONDS
+aralıkla güncellenir; ilerleme (aşama, chunk sayacı, aşama süreleri) ayrıca en fazla
+INGESTION_PROGRESS_INTERVAL saniyede bir yazılır. INGESTION_JOB_STALE_SECONDS boyunca heartbeat'i
+gelmeyen 'running' job'lar (ör. worker öldü) yeniden alınır.
+
+Her alımda job'ın attempts sayacı artar ve çalışma bu değeri sahiplik işareti olarak tutar: ilerleme,
+heartbeat ve sonuç yazımları yalnızca job hâlâ bu çalışmaya aitse yapılır. Job başka bir worker'a
+geçmişse çalışma ilk ilerleme bildiriminde durur ve dosyanın eski chunk'larını silmez (bkz. index_vectors).
+index_vectors idempotent olduğundan yarıda kalan bir job'ın tekrar çalışması güvenlidir.
+"""
+
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from hexense_core.models import GptPackageFile, IngestionJob
+
+logger = logging.getLogger(__name__)
+
+INGESTION_JOB_STALE_SECONDS = getattr(settings, "INGESTION_JOB_STALE_SECONDS", 900)
+INGESTION_PROGRESS_INTERVAL = getattr(settings, "INGESTION_PROGRESS_INTERVAL", 1.0)
+INGESTION_HEARTBEAT_SECONDS = getattr(settings, "INGESTION_HEARTBEAT_SECONDS", 30)
+# Bir alım turunda kilitlenip bakılan en fazla aday job sayısı
+CLAIM_CANDIDATES = 10
+
+_PROGRESS_FIELDS = ["stage", "chunks_done", "chunks_total", "stage_timings"]
+_RESULT_FIELDS = _PROGRESS_FIELDS + ["status", "error", "finished_at"]
+
+
+class JobSuperseded(Exception):
+    """
+    Job çalışırken başka bir worker tarafından yeniden alındı ya da yerine başka bir job geçti.
+    """
+
+
+class JobProgress:
+    """
+    index_vectors'a verilen ilerleme callback'i: aşama değişimlerinde süreleri kaydeder,
+    chunk sayaçlarını günceller ve kaydı throttled olarak yazar. start() ile ilerlemeden bağımsız
+    çalışan heartbeat thread'i başlatılır. Job bu çalışmaya ait değilse JobSuperseded fırlatır.
+    """
+
+    def __init__(self, job: IngestionJob, interval: float = INGESTION_PROGRESS_INTERVAL,
+                 heartbeat_interval: float = INGESTION_HEARTBEAT_SECONDS):
+        self.job = job
+        self.interval = interval
+        self.heartbeat_interval = heartbeat_interval
+        self.lost = False
+        self._stage_started = time.perf_counter()
+        self._last_save = 0.0
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def _owned(self):
+        return IngestionJob.objects.filter(id=self.job.id, status=IngestionJob.STATUS_RUNNING, attempts=self.job.attempts)
+
+    def write(self, fields) -> bool:
+        """
+        Alanları yalnızca job hâlâ bu çalışmaya aitse yazar; yazıldıysa True döndürür.
+        """
+        self.job.updated_at = timezone.now()
+        values = {field: getattr(self.job, field) for field in fields}
+        if not self._owned().update(updated_at=self.job.updated_at, **values):
+            self.lost = True
+        return not self.lost
+
+    def owns_job(self) -> bool:
+        if not self.lost and not self._owned().exists():
+            self.lost = True
+        return not self.lost
+
+    def start(self):
+        self._heartbeat = threading.Thread(target=self._beat, name=f"ingestion-heartbeat-{self.job.id}", daemon=True)
+        self._heartbeat.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+
+    def _beat(self):
+        # Uzun süren tek bir adım (büyük bir PDF'in çıkarılması, yavaş bir embedding batch'i) sırasında da
+        # job canlı görünür; yalnızca worker gerçekten durduğunda zaman aşımına uğrar
+        try:
+            while not self._stop.wait(self.heartbeat_interval):
+                if not self._owned().update(updated_at=timezone.now()):
+                    self.lost = True
+                    logger.warning(f"Ingestion job {self.job.id} was taken over by another worker")
+                    return
+        except DatabaseError as e:
+            logger.warning(f"Ingestion job {self.job.id} heartbeat failed: {e}")
+        finally:
+            # Thread'in açtığı veritabanı bağlantısı kapatılır
+            connection.close()
+
+    def _close_stage(self):
+        now = time.perf_counter()
+        timings = dict(self.job.stage_timings or {})
+        timings[self.job.stage] = round(timings.get(self.job.stage, 0.0) + now - self._stage_started, 3)
+        self.job.stage_timings = timings
+        self._stage_started = now
+
+    def __call__(self, stage, done=None, total=None):
+        if self.lost:
+            raise JobSuperseded(f"Ingestion job {self.job.id} is no longer owned by this worker")
+        stage_changed = stage != self.job.stage
+        if stage_changed:
+            self._close_stage()
+            self.job.stage = stage
+        if total is not None:
+            self.job.chunks_total = total
+        if done is not None:
+            self.job.chunks_done = done
+        if stage_changed or time.monotonic() - self._last_save >= self.interval:
+            if not self.write(_PROGRESS_FIELDS):
+                raise JobSuperseded(f"Ingestion job {self.job.id} is no longer owned by this worker")
+            self._last_save = time.monotonic()
+
+    def finish(self, stage=None):
+        self._close_stage()
+        if stage:
+            self.job.stage = stage
+
+
+def claim_job():
+    """
+    Sıradaki bekleyen (ya da heartbeat'i zaman aşımına uğramış) job'ı 'running' olarak işaretleyip döndürür.
+    Dosyası için başka bir canlı job çalışıyorsa job alınmaz.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=INGESTION_JOB_STALE_SECONDS)
+    live_running = IngestionJob.objects.filter(status=IngestionJob.STATUS_RUNNING, updated_at__gte=stale_before)
+    with transaction.atomic():
+        candidates = list(
+            IngestionJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=IngestionJob.STATUS_PENDING)
+                | Q(status=IngestionJob.STATUS_RUNNING, updated_at__lt=stale_before)
+            )
+            .exclude(Exists(live_running.filter(package_file=OuterRef('package_file')).exclude(id=OuterRef('id'))))
+            .order_by('id')[:CLAIM_CANDIDATES]
+        )
+        job = None
+        for candidate in candidates:
+            # Dosya satırı kilitlenir: aynı dosyanın iki job'ını aynı anda alan worker'lar burada sıralanır ve
+            # ikincisi aşağıdaki kontrolde birincinin job'ını görür
+            if not list(GptPackageFile.objects.select_for_update().filter(pk=candidate.package_file_id).values_list('pk', flat=True)):
+                continue
+            if live_running.filter(package_file_id=candidate.package_file_id).exclude(id=candidate.id).exists():
+                continue
+            job = candidate
+            break
+        if job is None:
+            return None
+        if job.status == IngestionJob.STATUS_RUNNING:
+            logger.warning(f"Ingestion job {job.id} stalled in stage {job.stage}, retrying")
+        # Dosyanın zaman aşımına uğramış diğer job'ları bu job'a devredilir; onları çalıştıran (ör. takılmış)
+        # worker'lar sahipliği kaybeder ve sonuç yazmaz
+        IngestionJob.objects.filter(
+            package_file_id=job.package_file_id, status=IngestionJob.STATUS_RUNNING
+        ).exclude(id=job.id).update(
+            status=IngestionJob.STATUS_FAILED,
+            error=f"Stalled; superseded by job {job.id}",
+            finished_at=now,
+            updated_at=now
+        )
+        job.status = IngestionJob.STATUS_RUNNING
+        job.stage = IngestionJob.STAGE_QUEUED
+        job.chunks_done = 0
+        job.stage_timings = {}
+        job.error = ''
+        job.attempts += 1
+        job.started_at = now
+        job.finished_at = None
+        job.save()
+    return job
+
+
+def run_job(job: IngestionJob) -> bool:
+    """
+    Job'ın dosyasını indeksler ve sonucu job'a yazar. Başarılıysa True döndürür.
+    """
+    progress = JobProgress(job)
+    progress.start()
+    try:
+        job.package_file.index_vectors(progress=progress, owns_run=progress.owns_job)
+        if progress.lost:
+            raise JobSuperseded(f"Ingestion job {job.id} is no longer owned by this worker")
+        progress.finish(IngestionJob.STAGE_DONE)
+        job.status = IngestionJob.STATUS_DONE
+    except JobSuperseded as e:
+        # Sonuç, job'ın güncel sahibi tarafından yazılır
+        logger.warning(f"{e}; abandoning this run")
+        return False
+    except Exception as e:
+        logger.error(f"Ingestion job {job.id} failed in stage {job.stage}: {e}", exc_info=True)
+        progress.finish()
+        job.status = IngestionJob.STATUS_FAILED
+        job.error = f"{type(e).__name__}: {e}"
+    finally:
+        progress.stop()
+    job.finished_at = timezone.now()
+    try:
+        # Dosya (ve CASCADE ile job) işlem sırasında silinmiş ya da job başka bir worker'a geçmiş olabilir
+        if not progress.write(_RESULT_FIELDS):
+            logger.warning(f"Ingestion job {job.id} result was not saved: the job is gone or owned by another worker")
+    except DatabaseError as e:
+        logger.warning(f"Ingestion job {job.id} result could not be saved: {e}")
+    return job.status == IngestionJob.STATUS_DONE
+
+
+def process_next() -> IngestionJob:
+    """
+    Bir job alıp çalıştırır; iş yoksa None döndürür.
+    """
+    job = claim_job()
+    if job is not None:
+        run_job(job)
+    return job
+
+
+def ingestion_backlog() -> dict:
+    """
+    Bekleyen, çalışan ve başarısız job sayıları.
+    """
+    counts = {status: 0 for status, _ in IngestionJob.STATUS_CHOICES if status != IngestionJob.STATUS_DONE}
+    for row in IngestionJob.objects.exclude(status=IngestionJob.STATUS_DONE).values('status').annotate(n=Count('id')):
+        counts[row['status']] = row['n']
+    return counts
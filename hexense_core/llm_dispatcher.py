@@ -5,8 +5,6 @@ from typing import List, Dict, Optional, Any, Union, AsyncGenerator
 from .models import GptModel, GptPackage, UserProfile, Message
 from .utils import run_tool
 import openai
-import anthropic
-import google.generativeai as genai
 from django.core.exceptions import ValidationError
 import logging
 import re
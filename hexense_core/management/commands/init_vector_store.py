@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hexense_core.semantic import (
+    QDRANT_COLLECTION_PROFILES,
+    QDRANT_COLLECTIONS,
+    apply_storage_profile,
+    ensure_collection_exists,
+    is_hybrid,
+    is_rebuildable,
+    migrate_collection,
+    recreate_collection,
+)
+
+
+class Command(BaseCommand):
+    help = "Qdrant koleksiyonlarını (vektör boyutu, mesafe, depolama profili) ve filtrelenen alanların payload index'lerini oluşturur."
+
+    def add_arguments(self, parser):
+        parser.add_argument('collections', nargs='*', type=str,
+                            help="Yalnızca bu koleksiyonlar (varsayılan: tümü)")
+        parser.add_argument('--apply-profiles', action='store_true',
+                            help="Mevcut koleksiyonlara da depolama profilini (HNSW, quantization, on-disk) uygula")
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument('--migrate', action='store_true',
+                          help="Koleksiyonları noktaları kopyalayarak güncel tanıma taşı (ör. hibrit sparse vektör eklemek için); "
+                               "yeni koleksiyon oluşturulur, noktalar vektörleriyle kopyalanır ve koleksiyon adı alias olarak ona "
+                               "çevrilir. Veri kaybı olmaz; çalışan process'ler yeni düzeni ilk reddedilen istekte algılar")
+        mode.add_argument('--recreate', action='store_true',
+                          help="Koleksiyonları silip güncel tanımla yeniden oluştur; tüm noktalar silinir, ardından "
+                               "reindex_vectors çalıştırılmalı. Veritabanından yeniden üretilemeyen koleksiyonlarda reddedilir")
+
+    def handle(self, *args, **options):
+        names = options['collections'] or list(QDRANT_COLLECTIONS)
+        unknown = [name for name in names if name not in QDRANT_COLLECTIONS]
+        if unknown:
+            raise CommandError(f"Tanımsız koleksiyon: {', '.join(unknown)}")
+
+        if options['recreate']:
+            # Kaynağı yalnızca Qdrant olan koleksiyonlar (ör. konuşma özetleri) silinirse geri getirilemez
+            unsafe = [name for name in names if not is_rebuildable(name)]
+            if unsafe:
+                raise CommandError(
+                    f"Veritabanından yeniden üretilemeyen koleksiyon: {', '.join(unsafe)}; --recreate yerine --migrate kullanın"
+                )
+
+        failed = []
+        for name in names:
+            spec = QDRANT_COLLECTIONS[name]
+            profile = QDRANT_COLLECTION_PROFILES.get(name, 'default')
+            if options['migrate']:
+                try:
+                    copied = migrate_collection(name)
+                    self.stdout.write(f"{name}: {copied} nokta kopyalandı")
+                    if 'sparse' in spec and not spec['sparse'].get('text_field'):
+                        # Metni payload'da tutulmayan koleksiyonlarda sparse vektörler veritabanından üretilir;
+                        # reindex_vectors sparse vektörü eksik noktaları içerikleri aynı olsa da yeniden yazar
+                        self.stdout.write(self.style.WARNING(
+                            f"{name}: sparse vektörler için reindex_vectors --collection {name} çalıştırın"
+                        ))
+                    ok = True
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f"{name}: taşınamadı: {e}"))
+                    ok = False
+            elif options['recreate']:
+                ok = recreate_collection(name)
+            else:
+                ok = ensure_collection_exists(name)
+            if ok and options['apply_profiles']:
+                ok = apply_storage_profile(name)
+            if ok:
+                indexes = ", ".join(spec['payload_indexes']) or "-"
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name}: size={spec['vector_size']} profile={profile} hybrid={is_hybrid(name)} indexes=[{indexes}]"
+                ))
+            else:
+                failed.append(name)
+                self.stderr.write(self.style.ERROR(f"{name}: hazırlanamadı"))
+        if failed:
+            raise CommandError(f"{len(failed)} koleksiyon hazırlanamadı")
@@ -0,0 +1,201 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from hexense_core.models import Conversation, GptPackage, GptPackageFile, Message
+
+SOURCES = {
+    'messages': lambda: Message.objects.all(),
+    'conversations': lambda: Conversation.objects.all(),
+    'gpt_packages': lambda: GptPackage.objects.select_related('group'),
+    'gpt_package_files': lambda: GptPackageFile.objects.select_related('gpt_package'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bir Qdrant koleksiyonunun vektörlerini veritabanından yeniden üretir (model değişikliği, Qdrant kurtarma). "
+        "Satırlar pk sırasıyla akıtılır, batch'ler halinde worker process'lerde encode edilip toplu upsert edilir; "
+        "ilerleme checkpoint dosyasına yazılır ve yarıda kalan çalışma kaldığı yerden devam eder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--collection', required=True, choices=list(SOURCES))
+        parser.add_argument('--batch-size', type=int, default=512,
+                            help="Tek encode + upsert turundaki satır sayısı")
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help="Veritabanı iterator() chunk boyutu")
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'EMBEDDING_PROCESS_WORKERS', 2),
+                            help="Embedding worker process sayısı (0: bu process içinde encode et)")
+        parser.add_argument('--checkpoint-dir', default=os.path.join(settings.BASE_DIR, '.cache', 'reindex'))
+        parser.add_argument('--restart', action='store_true',
+                            help="Checkpoint'i yok say ve baştan başla")
+        parser.add_argument('--force', action='store_true',
+                            help="İçerik hash'i Qdrant'takiyle aynı olan noktaları da yeniden encode edip yaz")
+
+    def handle(self, *args, **options):
+        from hexense_core import semantic
+
+        collection = options['collection']
+        checkpoint_path = os.path.join(options['checkpoint_dir'], f"{collection}.json")
+        checkpoint = self.load_checkpoint(checkpoint_path, options['restart'])
+        if checkpoint['last_pk']:
+            self.stdout.write(f"Checkpoint bulundu, {checkpoint['rows']} satırdan sonra devam ediliyor (pk > {checkpoint['last_pk']})")
+
+        if not semantic.ensure_collection_exists(collection):
+            raise CommandError(f"Qdrant koleksiyonu hazırlanamadı: {collection}")
+
+        queryset = SOURCES[collection]().order_by('pk')
+        if checkpoint['last_pk']:
+            queryset = queryset.filter(pk__gt=checkpoint['last_pk'])
+
+        start = time.perf_counter()
+        rows_before = checkpoint['rows']
+        try:
+            if collection == 'gpt_package_files':
+                # Dosyalar parse edilip chunk'lanarak indekslenir; checkpoint dosya başına ilerler
+                self.reindex_files(semantic, queryset, checkpoint, checkpoint_path, options)
+            else:
+                self.reindex_rows(semantic, collection, queryset, checkpoint, checkpoint_path, options)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Durduruldu; tekrar çalıştırıldığında checkpoint'ten devam edilecek."))
+            raise SystemExit(1)
+
+        if collection == 'gpt_packages':
+            from hexense_core.package_index import package_index
+            package_index.invalidate()
+
+        rows = checkpoint['rows'] - rows_before
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"{collection}: {rows} satır {elapsed:.1f}s içinde yeniden indekslendi ({rows / elapsed if elapsed else 0:.1f} satır/sn)"
+        ))
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    def make_encoder(self, semantic, workers):
+        if workers > 0:
+            from hexense_core.embedding_workers import EmbeddingProcessPool
+            pool = EmbeddingProcessPool(
+                semantic.EMBEDDING_MODEL_NAME,
+                backend_name=semantic.EMBEDDING_BACKEND,
+                backend_options=semantic.EMBEDDING_BACKEND_OPTIONS,
+                workers=workers,
+                batch_size=semantic.EMBEDDING_BATCH_MAX_SIZE
+            )
+            return pool.encode_texts, pool.shutdown
+        # Embedding cache atlanır: toplu yeniden indeksleme cache'i yalnızca çalkalar
+        backend = semantic.get_embedding_backend()
+        return (lambda texts: backend.encode(texts, batch_size=semantic.EMBEDDING_BATCH_MAX_SIZE)), (lambda: None)
+
+    def reindex_rows(self, semantic, collection, queryset, checkpoint, checkpoint_path, options):
+        encode, shutdown = self.make_encoder(semantic, options['workers'])
+        # Bir batch Qdrant'a yazılırken sonraki batch okunur (--force ile encode de bu sırada yapılır)
+        writer = ThreadPoolExecutor(max_workers=1)
+        pending = None
+
+        def flush(batch):
+            ids = [str(obj.pk) for obj in batch]
+            texts = [obj.vector_text() for obj in batch]
+            payloads = [obj.vector_payload() for obj in batch]
+            if options['force']:
+                vectors = encode(texts)
+                payloads = [{**payload, "content_hash": semantic.content_hash(text)} for payload, text in zip(payloads, texts)]
+                future = writer.submit(semantic.upsert_points, collection, ids, vectors, payloads, texts=texts)
+            else:
+                # Qdrant'ta aynı içerik hash'iyle duran noktalar (ör. kesintiden önce yazılanlar) atlanır
+                future = writer.submit(
+                    lambda: semantic.upsert_if_changed(collection, ids, texts, payloads, encode_fn=encode)["ok"]
+                )
+            return future, ids[-1], len(batch)
+
+        def wait(pending):
+            future, last_pk, count = pending
+            if not future.result():
+                raise CommandError(f"Qdrant upsert başarısız; son başarılı checkpoint: {checkpoint['last_pk']}")
+            checkpoint['last_pk'] = last_pk
+            checkpoint['rows'] += count
+            self.save_checkpoint(checkpoint_path, checkpoint)
+            self.stdout.write(f"{checkpoint['rows']} satır")
+
+        try:
+            batch = []
+            for obj in queryset.iterator(chunk_size=options['chunk_size']):
+                batch.append(obj)
+                if len(batch) >= options['batch_size']:
+                    submitted = flush(batch)
+                    if pending:
+                        wait(pending)
+                    pending, batch = submitted, []
+            if batch:
+                submitted = flush(batch)
+                if pending:
+                    wait(pending)
+                pending = submitted
+            if pending:
+                wait(pending)
+        finally:
+            writer.shutdown(wait=True)
+            shutdown()
+
+    def reindex_files(self, semantic, queryset, checkpoint, checkpoint_path, options):
+        # Okunamayan bir dosya tüm yeniden indekslemeyi durdurmaz; pk'si checkpoint'te 'failed' listesine yazılır,
+        # sonraki çalışmada önce bu dosyalar tekrar denenir ve liste boşalana kadar komut hata koduyla biter
+        retry_queryset = SOURCES['gpt_package_files']().filter(pk__in=checkpoint.get('failed', [])).order_by('pk')
+        retry_pks = {str(pk) for pk in retry_queryset.values_list('pk', flat=True)}
+        # Bu arada silinmiş dosyalar listeden düşer
+        checkpoint['failed'] = [pk for pk in checkpoint.get('failed', []) if pk in retry_pks]
+        if retry_pks:
+            self.stdout.write(f"Önceki çalışmada başarısız olan {len(retry_pks)} dosya tekrar deneniyor")
+
+        encode, shutdown = self.make_encoder(semantic, options['workers'])
+        try:
+            files = chain(
+                retry_queryset.iterator(chunk_size=options['chunk_size']),
+                queryset.iterator(chunk_size=options['chunk_size'])
+            )
+            for package_file in files:
+                pk = str(package_file.pk)
+                retried = pk in retry_pks
+                try:
+                    # Manifest'e güvenilmez; her chunk Qdrant'taki hash'le karşılaştırılır
+                    package_file.index_vectors(use_manifest=False, encode_fn=encode)
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f"{package_file.file.name} (pk={pk}): {e}"))
+                    if not retried:
+                        checkpoint['failed'].append(pk)
+                else:
+                    checkpoint['rows'] += 1
+                    if retried:
+                        checkpoint['failed'].remove(pk)
+                if not retried:
+                    checkpoint['last_pk'] = pk
+                self.save_checkpoint(checkpoint_path, checkpoint)
+                self.stdout.write(f"{checkpoint['rows']} dosya ({package_file.file.name})")
+        finally:
+            shutdown()
+
+        if checkpoint['failed']:
+            raise CommandError(
+                f"{len(checkpoint['failed'])} dosya indekslenemedi (pk: {', '.join(checkpoint['failed'])}); "
+                f"komut tekrar çalıştırıldığında yalnızca bunlar ve kalan dosyalar denenir"
+            )
+
+    def load_checkpoint(self, path, restart):
+        if not restart and os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+        return {'last_pk': None, 'rows': 0, 'failed': []}
+
+    def save_checkpoint(self, path, checkpoint):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Yarım yazılmış checkpoint kalmaması için önce geçici dosyaya yaz, sonra yer değiştir
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hexense_core.ingestion import ingestion_backlog, process_next
+from hexense_core.models import IngestionJob
+
+
+class Command(BaseCommand):
+    help = "GptPackageFile ingestion job'larını (parse, chunk, embedding, Qdrant yazımı) arka planda işler."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help="Kuyruk boşken iki kontrol arasında beklenecek süre (sn)")
+        parser.add_argument('--once', action='store_true',
+                            help="Şu an bekleyen job'ları bitirip çık")
+        parser.add_argument('--stats', action='store_true',
+                            help="Yalnızca kuyruk durumunu yazdır ve çık")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_backlog()
+            return
+
+        try:
+            while True:
+                job = process_next()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                timings = " ".join(f"{stage}={seconds}s" for stage, seconds in job.stage_timings.items())
+                if job.status == IngestionJob.STATUS_DONE:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"job {job.id} ({job.package_file_id}): {job.chunks_total} chunk {timings}"
+                    ))
+                elif job.status == IngestionJob.STATUS_RUNNING:
+                    self.stdout.write(self.style.WARNING(
+                        f"job {job.id} ({job.package_file_id}) başka bir worker'a devredildi; bu çalışma bırakıldı"
+                    ))
+                else:
+                    self.stderr.write(self.style.ERROR(
+                        f"job {job.id} ({job.package_file_id}) {job.stage} aşamasında başarısız: {job.error}"
+                    ))
+        except KeyboardInterrupt:
+            self.stdout.write("Durduruldu.")
+        if options['once']:
+            self.write_backlog()
+
+    def write_backlog(self):
+        backlog = ingestion_backlog()
+        style = self.style.WARNING if backlog['failed'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"ingestion: pending={backlog['pending']} running={backlog['running']} failed={backlog['failed']}"
+        ))
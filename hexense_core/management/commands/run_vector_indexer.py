@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hexense_core.vector_indexer import (
+    VECTOR_INDEXER_BATCH_SIZE,
+    VECTOR_INDEXER_MAX_ATTEMPTS,
+    drain_outbox,
+    outbox_lag,
+)
+
+
+class Command(BaseCommand):
+    help = "VectorOutbox kayıtlarını Qdrant'a işler (Message/Conversation vektörleri için write-behind indexer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=VECTOR_INDEXER_BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=VECTOR_INDEXER_MAX_ATTEMPTS)
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help="Outbox boşken iki tur arasında beklenecek süre (sn)")
+        parser.add_argument('--lag-interval', type=float, default=30.0,
+                            help="Gecikme metriğinin kaç saniyede bir yazılacağı")
+        parser.add_argument('--once', action='store_true',
+                            help="Şu an işlenebilir kayıtları bitirip çık")
+        parser.add_argument('--stats', action='store_true',
+                            help="Yalnızca outbox gecikmesini yazdır ve çık")
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.write_lag()
+            return
+
+        last_lag_report = 0.0
+        try:
+            while True:
+                result = drain_outbox(options['batch_size'], options['max_attempts'])
+                if result['claimed']:
+                    self.stdout.write(
+                        f"claimed={result['claimed']} applied={result['applied']} superseded={result['superseded']} "
+                        f"failed={result['failed']} blocked={result['blocked']}"
+                    )
+
+                if time.monotonic() - last_lag_report >= options['lag_interval']:
+                    self.write_lag()
+                    last_lag_report = time.monotonic()
+
+                # Bu turda ilerleme olmadıysa (boş ya da tamamı bloklu/başarısız) bekle
+                idle = result['applied'] + result['superseded'] == 0
+                if idle:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write("Durduruldu.")
+        if options['once']:
+            self.write_lag()
+
+    def write_lag(self):
+        lag = outbox_lag()
+        style = self.style.WARNING if lag['failed'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"outbox lag: pending={lag['pending']} oldest={lag['oldest_age_seconds']}s failed={lag['failed']}"
+        ))
@@ -0,0 +1,35 @@
+# Generated by Django 5.1 on 2026-10-17 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexense_core', '0010_remove_conversation_topic_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VectorOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('collection', models.CharField(max_length=100)),
+                ('point_id', models.CharField(max_length=100)),
+                ('operation', models.CharField(choices=[('upsert', 'Upsert'), ('delete', 'Delete')], max_length=10)),
+                ('text', models.TextField(blank=True, help_text="Embedding'i alınacak metin (upsert)")),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Bu zamandan önce işlenmez (retry backoff)')),
+            ],
+            options={
+                'verbose_name': 'Vector Outbox Entry',
+                'verbose_name_plural': 'System: Vector Outbox',
+                'indexes': [models.Index(fields=['status', 'available_at', 'id'], name='vector_outbox_ready_idx'), models.Index(fields=['collection', 'point_id'], name='vector_outbox_point_idx')],
+            },
+        ),
+    ]
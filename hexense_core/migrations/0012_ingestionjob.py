@@ -0,0 +1,37 @@
+# Generated by Django 5.1 on 2026-10-17 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexense_core', '0011_vectoroutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('stage', models.CharField(choices=[('queued', 'Queued'), ('extracting', 'Extracting'), ('chunking', 'Chunking'), ('embedding', 'Embedding'), ('done', 'Done')], default='queued', max_length=12)),
+                ('chunks_done', models.PositiveIntegerField(default=0)),
+                ('chunks_total', models.PositiveIntegerField(default=0)),
+                ('stage_timings', models.JSONField(blank=True, default=dict, help_text='Aşama başına süre (sn)')),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text="Worker'ın son ilerleme bildirimi (heartbeat)")),
+                ('package_file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ingestion_jobs', to='hexense_core.gptpackagefile')),
+            ],
+            options={
+                'verbose_name': 'Ingestion Job',
+                'verbose_name_plural': 'System: Ingestion Jobs',
+                'indexes': [models.Index(fields=['status', 'id'], name='ingestion_job_ready_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1 on 2026-10-17 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hexense_core', '0012_ingestionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GptPackageFileChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('collection', models.CharField(max_length=100)),
+                ('point_id', models.CharField(max_length=36)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('chunk_index', models.PositiveIntegerField()),
+                ('payload_digest', models.CharField(max_length=40)),
+                ('boundaries', models.JSONField(blank=True, default=dict, help_text='Chunk sınırları (paragraf, satır ya da görsel aralığı)')),
+                ('stored', models.BooleanField(default=True)),
+                ('index_run', models.UUIDField(blank=True, help_text="Chunk'ı son üreten indeksleme çalışması", null=True)),
+                ('package_file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='hexense_core.gptpackagefile')),
+            ],
+            options={
+                'verbose_name': 'Gpt Package File Chunk',
+                'verbose_name_plural': 'System: Gpt Package File Chunks',
+                'indexes': [models.Index(fields=['package_file', 'collection', 'index_run', 'content_hash'], name='file_chunk_run_idx')],
+                'constraints': [models.UniqueConstraint(fields=('package_file', 'collection', 'point_id'), name='file_chunk_point_unique')],
+            },
+        ),
+    ]
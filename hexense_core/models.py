@@ -1,31 +1,32 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count
 from django.contrib.auth.models import User
+from django.utils import timezone
+from django.dispatch import Signal
 from .utils import avatar_upload_path, company_logo_upload_path
 import uuid
-from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
 import os
-from qdrant_client.http import models as qdrant_models
-import tiktoken
 import mimetypes
-import pdfplumber
-import docx
-import open_clip
-from PIL import Image
-import io
-import pandas as pd
+from itertools import islice
+from hexense_core import registry
+
+# Ağır bağımlılıklar (open_clip, pdfplumber, python-docx, pandas, PIL, tiktoken, qdrant_client)
+# modül seviyesinde import edilmez; ilgili metodlarda ilk kullanımda yüklenir.
+# Böylece migrate/check/admin gibi komutlar bu maliyeti ödemez.
+
+# GptPackage vektörü Qdrant'a yazıldıktan/silindikten sonra gönderilir (post_save, Qdrant yazımından önce tetiklenir)
+gpt_package_vector_changed = Signal()
 
 # CLIP model yüklemesi (ilk kullanımda yüklenir)
-_clip_model = None
-_clip_preprocess = None
-_clip_tokenizer = None
+def _load_clip_model():
+    from hexense_core.embedding_workers import load_clip_model
+    return load_clip_model()
+
+registry.register("clip_model", _load_clip_model)
 
 def get_clip_model():
-    global _clip_model, _clip_preprocess, _clip_tokenizer
-    if _clip_model is None:
-        _clip_model, _, _clip_preprocess = open_clip.create_model_and_transforms('ViT-B-32', pretrained='openai')
-        _clip_tokenizer = open_clip.get_tokenizer('ViT-B-32')
-    return _clip_model, _clip_preprocess
+    clip_model, clip_preprocess, _ = registry.get("clip_model")
+    return clip_model, clip_preprocess
 
 class Company(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -98,7 +99,42 @@ class UserProfile(models.Model):
         verbose_name_plural = "Organisation: User Profiles"
 
 
-class Conversation(models.Model):
+class VectorFieldsMixin:
+    """
+    Vektörü (embed edilen metin ve indekslenen payload alanları) belirleyen alanların
+    veritabanından yüklendiği andaki değerlerini tutar. save() hook'ları yalnızca bu alanlar
+    değiştiğinde vektör deposuna dokunur; update_fields bu alanları içermiyorsa hiç bakılmaz.
+    """
+    # Alt sınıflar embed edilen metni veya payload'u etkileyen alanların attname'lerini listeler
+    VECTOR_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_vector_state()
+        return instance
+
+    def _vector_state(self) -> dict:
+        # Deferred alanlar için sorgu atmamak adına doğrudan __dict__ okunur
+        return {name: self.__dict__[name] for name in self.VECTOR_FIELDS if name in self.__dict__}
+
+    def _remember_vector_state(self):
+        self._loaded_vector_state = self._vector_state()
+
+    def vector_fields_changed(self, update_fields=None) -> bool:
+        if self._state.adding:
+            return True
+        if update_fields is not None:
+            # update_fields'te ForeignKey'ler alan adıyla (gpt_package) geçer; VECTOR_FIELDS attname (gpt_package_id) tutar
+            names = set(update_fields) | {f"{name}_id" for name in update_fields}
+            if names.isdisjoint(self.VECTOR_FIELDS):
+                return False
+        loaded = getattr(self, '_loaded_vector_state', None)
+        # Veritabanından yüklenmemiş (ör. pk ile elle kurulmuş) örneklerde karşılaştırılacak durum yoktur
+        return loaded is None or self._vector_state() != loaded
+
+
+class Conversation(VectorFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user_profile = models.ForeignKey('UserProfile', null=True, blank=True, on_delete=models.SET_NULL, related_name='conversations')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -114,28 +150,37 @@ class Conversation(models.Model):
         verbose_name = "Conversation"
         verbose_name_plural = "Agent Management: Conversations"
 
-    def save(self, *args, **kwargs):
-        is_new = not self.pk  # Check if this is a new record
-        if not is_new:
-            from hexense_core.semantic import delete_from_qdrant
-            delete_from_qdrant("conversations", [str(self.id)])
-        super().save(*args, **kwargs)
-        from hexense_core.semantic import get_embedding, add_to_qdrant
-        embedding = get_embedding(self.context or "")
-        payload = {
+    VECTOR_COLLECTION = "conversations"
+    VECTOR_FIELDS = ('context', 'is_active')
+
+    def vector_text(self) -> str:
+        return self.context or ""
+
+    def vector_payload(self) -> dict:
+        return {
             "conversation_id": str(self.id),
             "is_active": self.is_active,
             "created_at": self.created_at.isoformat(),
         }
-        add_to_qdrant("conversations", self.context or "", payload, vector=embedding, point_id=str(self.id))
+
+    def save(self, *args, **kwargs):
+        # Embedding ve Qdrant yazımı kaydın kritik yolunda yapılmaz; aynı transaction içinde
+        # outbox'a bir kayıt düşülür, vector indexer (run_vector_indexer) bunu arka planda işler.
+        # Yalnızca embed edilen metin veya indekslenen payload alanları değiştiyse (ör. updated_at bump'ında değil)
+        vector_changed = self.vector_fields_changed(kwargs.get('update_fields'))
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if vector_changed:
+                VectorOutbox.enqueue_upsert(self.VECTOR_COLLECTION, str(self.id), self.vector_text(), self.vector_payload())
+        self._remember_vector_state()
 
     def delete(self, *args, **kwargs):
-        from hexense_core.semantic import delete_from_qdrant
-        delete_from_qdrant("conversations", [str(self.id)])
-        super().delete(*args, **kwargs)
+        with transaction.atomic():
+            VectorOutbox.enqueue_delete(self.VECTOR_COLLECTION, str(self.id))
+            super().delete(*args, **kwargs)
 
 
-class Message(models.Model):
+class Message(VectorFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='messages')
     SENDER_CHOICES = [
@@ -157,11 +202,14 @@ class Message(models.Model):
         verbose_name = "Message"
         verbose_name_plural = "Agent Management: Messages"
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        from hexense_core.semantic import get_embedding, add_to_qdrant
-        embedding = get_embedding(self.content)
-        payload = {
+    VECTOR_COLLECTION = "messages"
+    VECTOR_FIELDS = ('content', 'conversation_id', 'gpt_package_id', 'sender', 'is_active')
+
+    def vector_text(self) -> str:
+        return self.content
+
+    def vector_payload(self) -> dict:
+        return {
             "conversation_id": str(self.conversation_id),
             "gpt_package_id": str(self.gpt_package_id) if self.gpt_package_id else None,
             "timestamp": self.timestamp.isoformat(),
@@ -169,18 +217,134 @@ class Message(models.Model):
             "sender": self.sender,
             "is_active": self.is_active,
         }
-        add_to_qdrant("messages", self.content, payload, vector=embedding, point_id=str(self.id))
+
+    def save(self, *args, **kwargs):
+        # Sohbet yolunda yalnızca INSERT maliyeti ödenir; embedding ve Qdrant upsert'ü outbox üzerinden arka planda yapılır
+        # Yalnızca embed edilen metin veya indekslenen payload alanları değiştiyse (ör. updated_at bump'ında değil)
+        vector_changed = self.vector_fields_changed(kwargs.get('update_fields'))
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if vector_changed:
+                VectorOutbox.enqueue_upsert(self.VECTOR_COLLECTION, str(self.id), self.vector_text(), self.vector_payload())
+        self._remember_vector_state()
 
     def delete(self, *args, **kwargs):
-        from hexense_core.semantic import delete_from_qdrant
-        delete_from_qdrant("messages", [str(self.id)])
-        super().delete(*args, **kwargs)
+        with transaction.atomic():
+            VectorOutbox.enqueue_delete(self.VECTOR_COLLECTION, str(self.id))
+            super().delete(*args, **kwargs)
 
     def set_active(self, is_active: bool):
+        set_messages_active([self.id], is_active)
         self.is_active = is_active
-        self.save()
-        from hexense_core.semantic import update_qdrant_metadata
-        update_qdrant_metadata("messages", str(self.id), {"is_active": is_active})
+        self._remember_vector_state()
+
+
+def _enqueue_message_upserts(point_ids) -> list:
+    # Mesajların güncel metni ve payload'uyla yeni outbox upsert kayıtları; içerik hash'i aynıysa
+    # indexer yalnızca payload'u günceller, embedding yapmaz
+    return VectorOutbox.objects.bulk_create([
+        VectorOutbox(
+            collection=Message.VECTOR_COLLECTION,
+            point_id=str(message.id),
+            operation=VectorOutbox.OPERATION_UPSERT,
+            text=message.vector_text(),
+            payload=message.vector_payload(),
+        ) for message in Message.objects.filter(id__in=point_ids)
+    ])
+
+
+def set_messages_active(message_ids, is_active: bool) -> int:
+    """
+    Mesajları toplu olarak aktif/pasif yapar: tek bir UPDATE ve tek bir Qdrant set_payload isteği.
+    İçerik yeniden embed edilmez.
+
+    Returns:
+        int: Güncellenen mesaj sayısı
+    """
+    point_ids = [str(message_id) for message_id in message_ids]
+    if not point_ids:
+        return 0
+    with transaction.atomic():
+        updated = Message.objects.filter(id__in=point_ids).update(is_active=is_active)
+        # Henüz işlenmemiş outbox upsert'leri eski is_active değerini taşır. Bu kayıtlar kilitlenmez ve
+        # değiştirilmez (indexer onları o anda uyguluyor olabilir); arkalarına güncel payload'la yeni bir
+        # kayıt eklenir. Indexer aynı noktanın kayıtlarını id sırasıyla uyguladığından son yazılan bu olur.
+        pending = set(VectorOutbox.objects.filter(
+            collection=Message.VECTOR_COLLECTION,
+            point_id__in=point_ids,
+            operation=VectorOutbox.OPERATION_UPSERT,
+            status=VectorOutbox.STATUS_PENDING,
+        ).values_list('point_id', flat=True))
+        if pending:
+            _enqueue_message_upserts(pending)
+
+    from hexense_core.semantic import bulk_update_qdrant_metadata
+    if not bulk_update_qdrant_metadata(Message.VECTOR_COLLECTION, point_ids, {"is_active": is_active}):
+        # Qdrant'a yazılamazsa outbox üzerinden tekrar denenir
+        _enqueue_message_upserts([point_id for point_id in point_ids if point_id not in pending])
+    return updated
+
+
+class VectorOutbox(models.Model):
+    """
+    Vektör deposuna (Qdrant) yazılacak değişikliklerin transactional outbox'ı.
+
+    Kayıtlar, kaynak satırla aynı transaction içinde yazılır; `hexense_core.vector_indexer`
+    bunları id sırasıyla, batch'ler halinde işler. Aynı noktaya ait işlemler her zaman
+    sırayla uygulanır; başarısız işlemler geri çekilmeli (backoff) olarak tekrar denenir.
+    """
+    OPERATION_UPSERT = 'upsert'
+    OPERATION_DELETE = 'delete'
+    OPERATION_CHOICES = [
+        (OPERATION_UPSERT, 'Upsert'),
+        (OPERATION_DELETE, 'Delete'),
+    ]
+    STATUS_PENDING = 'pending'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    collection = models.CharField(max_length=100)
+    point_id = models.CharField(max_length=100)
+    operation = models.CharField(max_length=10, choices=OPERATION_CHOICES)
+    text = models.TextField(blank=True, help_text="Embedding'i alınacak metin (upsert)")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Bu zamandan önce işlenmez (retry backoff)")
+
+    def __str__(self):
+        return f"{self.operation} {self.collection}/{self.point_id} ({self.status})"
+
+    class Meta:
+        verbose_name = "Vector Outbox Entry"
+        verbose_name_plural = "System: Vector Outbox"
+        indexes = [
+            models.Index(fields=['status', 'available_at', 'id'], name='vector_outbox_ready_idx'),
+            models.Index(fields=['collection', 'point_id'], name='vector_outbox_point_idx'),
+        ]
+
+    @classmethod
+    def enqueue_upsert(cls, collection: str, point_id: str, text: str, payload: dict):
+        return cls.objects.create(
+            collection=collection,
+            point_id=point_id,
+            operation=cls.OPERATION_UPSERT,
+            text=text,
+            payload=payload,
+        )
+
+    @classmethod
+    def enqueue_delete(cls, collection: str, point_id: str):
+        return cls.objects.create(
+            collection=collection,
+            point_id=point_id,
+            operation=cls.OPERATION_DELETE,
+        )
 
 
 import uuid
@@ -252,7 +416,7 @@ class GptModel(models.Model):
 
 
 
-class GptPackageGroup(models.Model):
+class GptPackageGroup(VectorFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     key = models.CharField(max_length=50, unique=True)
     name = models.CharField(max_length=100)
@@ -265,8 +429,30 @@ class GptPackageGroup(models.Model):
         verbose_name = "Package"
         verbose_name_plural = "Agent Management: Packages"
 
+    # Grup adı ve anahtarı paket vektörlerinin payload'unda tutulur (group_name, group_key)
+    VECTOR_FIELDS = ('name', 'key')
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        vector_changed = self.vector_fields_changed(kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+        self._remember_vector_state()
+        if adding or not vector_changed:
+            return
+        packages = list(self.packages.select_related('group'))
+        if not packages:
+            return
+        from hexense_core.semantic import upsert_if_changed
+        # Paket metinleri değişmediğinden embedding yapılmaz; yalnızca payload'lar tek istekte güncellenir
+        upsert_if_changed(
+            GptPackage.VECTOR_COLLECTION,
+            [str(package.id) for package in packages],
+            [package.vector_text() for package in packages],
+            [package.vector_payload() for package in packages]
+        )
+
 
-class GptPackage(models.Model):
+class GptPackage(VectorFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     group = models.ForeignKey('GptPackageGroup', on_delete=models.CASCADE, related_name='packages')
     key = models.CharField(max_length=50, unique=True)
@@ -308,14 +494,14 @@ class GptPackage(models.Model):
         prompt_parts.append(self.description)
         return "\n\n".join([p for p in prompt_parts if p])
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Qdrant koleksiyonu oluşturulmamışsa oluştur
-        # Koleksiyon kontrolü semantic.py'ye taşındı
-        ensure_collection_exists("gpt_packages", vector_size=384)
-        # Embedding oluştur
-        description = f"{self.name}: {self.description}"
-        payload = {
+    VECTOR_COLLECTION = "gpt_packages"
+    VECTOR_FIELDS = ('name', 'description', 'key', 'group_id')
+
+    def vector_text(self) -> str:
+        return f"{self.name}: {self.description}"
+
+    def vector_payload(self) -> dict:
+        return {
             "id": str(self.id),
             "gpt_package_id": str(self.id),
             "group_id": str(self.group.id),
@@ -324,12 +510,25 @@ class GptPackage(models.Model):
             "name": self.name,
             "key": self.key
         }
-        add_to_qdrant("gpt_packages", description, payload)
+
+    def save(self, *args, **kwargs):
+        vector_changed = self.vector_fields_changed(kwargs.get('update_fields'))
+        super().save(*args, **kwargs)
+        self._remember_vector_state()
+        if not vector_changed:
+            return
+        from hexense_core.semantic import upsert_if_changed
+        # Açıklama ve payload Qdrant'takiyle aynıysa embedding ve yazım yine de atlanır
+        upsert_if_changed(self.VECTOR_COLLECTION, [str(self.id)], [self.vector_text()], [self.vector_payload()])
+        gpt_package_vector_changed.send(sender=self.__class__, instance=self)
 
     def delete(self, *args, **kwargs):
         # Qdrant'tan sil
-        delete_from_qdrant("gpt_packages", [str(self.id)])
-        super().delete(*args, **kwargs)
+        from hexense_core.semantic import delete_from_qdrant
+        delete_from_qdrant(self.VECTOR_COLLECTION, [str(self.id)])
+        result = super().delete(*args, **kwargs)
+        gpt_package_vector_changed.send(sender=self.__class__, instance=self)
+        return result
 
 
 class GptService(models.Model):
@@ -364,6 +563,10 @@ class GptService(models.Model):
         verbose_name_plural = "Agent Management: Services"
 
 
+QDRANT_FILE_COLLECTION = 'gpt_package_files'
+QDRANT_FILE_IMAGE_COLLECTION = 'gpt_package_file_images'
+
+
 class GptPackageFile(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     gpt_package = models.ForeignKey('GptPackage', on_delete=models.CASCADE, related_name='files')
@@ -379,11 +582,16 @@ class GptPackageFile(models.Model):
         verbose_name = "Gpt Package File"
         verbose_name_plural = "Agent Management: Gpt Package Files"
 
-    def get_file_content(self):
+    def get_file_content(self, ingest_pool=None):
         ext = os.path.splitext(self.file.name)[1].lower()
         self.file.seek(0)
         if ext == '.pdf':
-            return self._extract_pdf_text(), self._extract_pdf_images()
+            if ingest_pool is not None:
+                # Sayfa aralıkları worker process'lerde işlenir; sonuç sayfa sırasıyla birleştirilir
+                return ingest_pool.extract_pdf(self.file.path)
+            # Metin ve görseller tek geçişte çıkarılır; her sayfa en fazla bir kez rasterize edilir
+            from hexense_core.pdf_extract import extract_pdf
+            return extract_pdf(self.file)
         elif ext == '.docx':
             return self._extract_docx_text(), self._extract_docx_images()
         elif ext in ['.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp']:
@@ -393,31 +601,26 @@ class GptPackageFile(models.Model):
         else:
             return self.file.read().decode('utf-8'), []
 
-    def _extract_pdf_text(self):
-        self.file.seek(0)
-        text = []
-        with pdfplumber.open(self.file) as pdf:
-            for page in pdf.pages:
-                text.append(page.extract_text() or "")
-        return '\n'.join(text)
-
-    def _extract_pdf_images(self):
-        self.file.seek(0)
-        images = []
-        with pdfplumber.open(self.file) as pdf:
-            for page in pdf.pages:
-                for img in page.images:
-                    try:
-                        im = page.to_image(resolution=150)
-                        cropped = im.original.crop((img['x0'], img['top'], img['x1'], img['bottom']))
-                        buf = io.BytesIO()
-                        cropped.save(buf, format='PNG')
-                        images.append(buf.getvalue())
-                    except Exception:
-                        continue
-        return images
+    def get_ingest_pool(self):
+        """
+        Büyük PDF'ler için sayfa-paralel ingestion havuzunu döndürür (bkz. DOCUMENT_INGEST_WORKERS).
+        Küçük dosyalar, PDF olmayanlar ve yerel diskte olmayan dosyalar için None döner.
+        """
+        if os.path.splitext(self.file.name)[1].lower() != '.pdf':
+            return None
+        from hexense_core.semantic import DOCUMENT_INGEST_WORKERS, get_document_ingest_pool
+        if DOCUMENT_INGEST_WORKERS <= 1:
+            return None
+        try:
+            path = self.file.path
+        except NotImplementedError:
+            # Uzak storage: worker'lar dosyaya yol ile erişemez
+            return None
+        from hexense_core.ingest_workers import pdf_page_count
+        return get_document_ingest_pool(pdf_page_count(path))
 
     def _extract_docx_text(self):
+        import docx
         self.file.seek(0)
         doc = docx.Document(self.file)
         lines = []
@@ -426,6 +629,7 @@ class GptPackageFile(models.Model):
         return '\n'.join(lines)
 
     def _extract_docx_images(self):
+        import docx
         self.file.seek(0)
         doc = docx.Document(self.file)
         images = []
@@ -439,191 +643,294 @@ class GptPackageFile(models.Model):
         return images
 
     def _extract_table_text(self):
+        # Satırlar "kolon: değer, ..." formatında; dosya bloklar halinde okunur (bkz. table_extract)
+        from hexense_core.table_extract import iter_table_rows
         ext = os.path.splitext(self.file.name)[1].lower()
         self.file.seek(0)
         try:
-            if ext == '.csv':
-                df = pd.read_csv(self.file)
-            elif ext == '.xlsx':
-                df = pd.read_excel(self.file)
-            else:
-                return ''
+            return '\n'.join(row for rows in iter_table_rows(self.file, ext) for row in rows)
         except Exception:
             return ''
-        # Her satırı "tablo başlığı: veri" formatında birleştir
-        lines = []
-        header = df.columns.tolist()
-        for idx, row in df.iterrows():
-            row_str = ', '.join([f"{col}: {row[col]}" for col in header])
-            lines.append(row_str)
-        return '\n'.join(lines)
 
-    def chunk_text(self, text, max_tokens=400):
-        # Paragraflara böl, başlıkları tespit et, chunk'lara başlık ekle
-        paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
-        tokenizer = tiktoken.get_encoding('cl100k_base')
-        chunks = []
-        current_chunk = []
-        current_tokens = 0
-        current_heading = None
-        heading_map = {}
-        # Başlık tespiti
-        for i, para in enumerate(paragraphs):
-            heading = self._detect_heading(para)
-            if heading:
-                current_heading = heading
-            heading_map[i] = current_heading
-        # Chunk'lama
-        for i, para in enumerate(paragraphs):
-            tokens = len(tokenizer.encode(para))
-            if current_tokens + tokens > max_tokens and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = []
-                current_tokens = 0
-            current_chunk.append((i, para))
-            current_tokens += tokens
-        if current_chunk:
-            chunks.append(current_chunk)
-        # Her chunk'a başlık ekle
-        chunk_headings = []
-        for chunk in chunks:
-            # Chunk'taki ilk paragrafın başlığı
-            first_para_idx = chunk[0][0]
-            heading = heading_map.get(first_para_idx)
-            chunk_headings.append(heading)
-        return list(zip(chunks, chunk_headings))
-
-    def _detect_heading(self, para):
-        # DOCX için heading stilleriyle tespit zaten yapılır, burada düz metin/PDF için heuristik
-        # Markdown başlıkları
-        if para.startswith('#'):
-            return para.lstrip('#').strip()
-        # Büyük harfli, kısa satır (ör: BÖLÜM 1, GİRİŞ)
-        if para.isupper() and 3 < len(para) < 60:
-            return para
-        # Numara ile başlayan başlıklar (ör: 1. Giriş, 2.1 Alt Başlık)
-        if (para[:3].replace('.', '').isdigit() and len(para) < 80):
-            return para
-        # Son olarak: 30 karakterden kısa, ilk harfi büyük, sonunda nokta yoksa
-        if len(para) < 50 and para[:1].isupper() and not para.endswith('.'):
-            return para
-        return None
-
-    def chunk_table(self, text, max_rows=10):
-        # Tabloyu satır bazında chunk'la
-        lines = [l for l in text.split('\n') if l.strip()]
-        chunks = []
-        for i in range(0, len(lines), max_rows):
-            chunk = lines[i:i+max_rows]
-            chunks.append((chunk, i, min(i+max_rows-1, len(lines)-1)))
-        return chunks
+    def chunk_text(self, text, max_tokens=None, overlap_tokens=None):
+        # Paragraflar token sınırlı chunk'larda toplanır, uzun paragraflar bölünür, chunk'lar başlığı taşır
+        # (bkz. hexense_core.chunking). [([(paragraf indeksi, metin), ...], başlık), ...] döndürür.
+        from hexense_core.chunking import chunk_text
+        return [(chunk.paragraphs, chunk.heading) for chunk in chunk_text(text, max_tokens, overlap_tokens)]
+
+    def _iter_table_chunks(self, base_payload):
+        # Tablo akış halinde okunur; chunk'lar dosyanın tamamı belleğe alınmadan üretilir
+        from hexense_core.table_extract import iter_table_chunks
+        ext = os.path.splitext(self.file.name)[1].lower()
+        self.file.seek(0)
+        for chunk_idx, (chunk_lines, start_row, end_row) in enumerate(iter_table_chunks(self.file, ext)):
+            yield '\n'.join(chunk_lines), {
+                **base_payload,
+                "chunk_index": chunk_idx,
+                "row_start": start_row,
+                "row_end": end_row,
+                "type": "table",
+            }, {"rows": [start_row, end_row]}
+
+    # index_vectors'ta tek upsert_if_changed turundaki chunk sayısı (ilerleme bu aralıklarla raporlanır)
+    INDEX_BATCH_SIZE = 256
 
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        QDRANT_FILE_COLLECTION = 'gpt_package_files'
-        try:
-            # Koleksiyon kontrolü semantic.py'ye taşındı
-            ensure_collection_exists(QDRANT_FILE_COLLECTION, vector_size=384)
-        except Exception:
-            pass
-        try:
-            text, images = self.get_file_content()
-        except Exception:
-            return
+        # Ağır iş (parse, embedding, Qdrant) istekte yapılmaz; ingestion worker'ı için job oluşturulur
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            IngestionJob.enqueue(self)
+
+    def index_vectors(self, progress=None, use_manifest=True, encode_fn=None, owns_run=None):
+        """
+        Dosyayı okuyup chunk'lara böler, embedding'lerini çıkarır ve Qdrant'a yazar.
+        Hatalar yukarı iletilir. progress(stage, done=None, total=None) verilirse aşama ve chunk ilerlemesi bildirilir.
+        use_manifest=True iken chunk manifest'inde (GptPackageFileChunk) aynı hash'le kayıtlı chunk'lar Qdrant'a
+        sorulmadan atlanır (yeniden indekslemede Qdrant'ın içeriği doğrulanmak istendiğinde False verilir).
+        encode_fn verilirse metin chunk'ları onunla encode edilir (ör. reindex_vectors'ın worker havuzu).
+        owns_run verilirse eski chunk'lar yalnızca owns_run() True dönerken silinir: ingestion job'ı bu arada
+        başka bir worker'a geçmişse onun yazdığı chunk'lar bu çalışmanın temizliğinde silinmez.
+        Yazılan/kontrol edilen chunk sayısını döndürür.
+        """
+        progress = progress or (lambda stage, done=None, total=None: None)
+        progress(IngestionJob.STAGE_EXTRACTING)
+        from hexense_core.semantic import (
+            content_hash, delete_from_qdrant, encode_images, iter_point_ids, make_point_id, payload_digest, upsert_if_changed,
+        )
         file_name = self.file.name
         title = self.description or file_name
-        points = []
+        base_payload = {
+            "gpt_package_file_id": str(self.id),
+            "gpt_package_id": str(self.gpt_package.id),
+            "file_name": file_name,
+            "title": title,
+        }
+        # (içerik, payload, chunk sınırları)
+        ingest_pool = None
         ext = os.path.splitext(self.file.name)[1].lower()
-        # Tablo dosyası ise özel chunk ve embedding
         if ext in ['.csv', '.xlsx']:
-            table_chunks = self.chunk_table(text)
-            for chunk_idx, (chunk_lines, start_row, end_row) in enumerate(table_chunks):
-                chunk_text = '\n'.join(chunk_lines)
-                embedding = get_embedding(chunk_text)
-                points.append(
-                    qdrant_models.PointStruct(
-                        id=f"{self.id}_table_{chunk_idx}",
-                        vector=embedding,
-                        payload={
-                            "gpt_package_file_id": str(self.id),
-                            "gpt_package_id": str(self.gpt_package.id),
-                            "file_name": file_name,
-                            "title": title,
-                            "chunk_index": chunk_idx,
-                            "row_start": start_row,
-                            "row_end": end_row,
-                            "type": "table",
-                        }
-                    )
-                )
+            # Tablo chunk'ları okundukça batch'ler halinde yazılır; toplam chunk sayısı baştan bilinmez
+            chunks, image_chunks, total = self._iter_table_chunks(base_payload), [], None
         else:
+            ingest_pool = self.get_ingest_pool()
+            text, images = self.get_file_content(ingest_pool=ingest_pool)
+            progress(IngestionJob.STAGE_CHUNKING)
+            chunks = []
             # Metin chunk'ları
-            chunk_heading_pairs = self.chunk_text(text)
-            for chunk_idx, (chunk, heading) in enumerate(chunk_heading_pairs):
-                chunk_text = '\n'.join([p[1] for p in chunk])
-                embedding = get_embedding(chunk_text)
-                para_indices = [p[0] for p in chunk]
-                points.append(
-                    qdrant_models.PointStruct(
-                        id=f"{self.id}_text_{chunk_idx}",
-                        vector=embedding,
-                        payload={
-                            "gpt_package_file_id": str(self.id),
-                            "gpt_package_id": str(self.gpt_package.id),
-                            "file_name": file_name,
-                            "title": title,
-                            "chunk_index": chunk_idx,
-                            "paragraph_indices": para_indices,
-                            "heading": heading,
-                            "type": "text",
-                        }
+            for chunk_idx, (chunk, heading) in enumerate(self.chunk_text(text)):
+                chunks.append(('\n'.join([p[1] for p in chunk]), {
+                    **base_payload,
+                    "chunk_index": chunk_idx,
+                    "paragraph_indices": [p[0] for p in chunk],
+                    "heading": heading,
+                    "type": "text",
+                }, {"paragraphs": [chunk[0][0], chunk[-1][0]]}))
+            # Görsel chunk'ları
+            image_chunks = [
+                (image, {**base_payload, "chunk_index": img_idx, "type": "image"}, {"image": img_idx})
+                for img_idx, image in enumerate(images or [])
+            ]
+            total = len(chunks) + len(image_chunks)
+
+        def encode_image_chunks(contents):
+            # CLIP encode işlemi semantic katmanında (ayarlara göre thread veya process pool'da) yapılır.
+            # Açılamayan görseller atlanır (kept indeksleri); model/pool hataları yukarı iletilir ve job başarısız olur
+            return ingest_pool.encode_images(contents) if ingest_pool else encode_images(contents)
+
+        # Nokta ID'si chunk'ın içerik hash'inden ve aynı içeriğin dosyadaki kaçıncı tekrarı olduğundan türetilir;
+        # araya paragraf eklenince sonraki chunk'ların ID'leri kaymaz, yalnızca içeriği değişen chunk'lar yeniden yazılır.
+        # Manifest veritabanında chunk başına bir satırdır ve batch batch okunup yazılır; bellek kullanımı dosya
+        # boyutundan bağımsızdır. Bu çalışmada üretilen chunk'ların satırları `run` ile işaretlenir, tekrar sayısı
+        # da bu satırlardan sayılır. Manifest'te Qdrant'a yazılmış olarak aynı payload hash'iyle duran chunk'lar
+        # atlanır; kalanlar için upsert_if_changed Qdrant'taki hash'e bakar ve yalnızca içeriği değişenleri encode
+        # eder. Encode edilemeyip atlanan chunk'lar stored=False kalır ve bir sonraki indekslemede tekrar denenir.
+        # CLIP vektörlerinin boyutu farklı olduğundan görseller ayrı koleksiyona yazılır.
+        run = uuid.uuid4()
+        done = 0
+        progress(IngestionJob.STAGE_EMBEDDING, done=done, total=total or 0)
+        for collection_name, collection_chunks, encode_fn in (
+            (QDRANT_FILE_COLLECTION, chunks, ingest_pool.encode_texts if ingest_pool else encode_fn),
+            (QDRANT_FILE_IMAGE_COLLECTION, image_chunks, encode_image_chunks),
+        ):
+            manifest = GptPackageFileChunk.objects.filter(package_file=self, collection=collection_name)
+            had_manifest = manifest.exists()
+            remaining = iter(collection_chunks)
+            while batch := list(islice(remaining, self.INDEX_BATCH_SIZE)):
+                hashes = [content_hash(content) for content, _, _ in batch]
+                # Aynı içeriğin bu çalışmada daha önceki batch'lerde kaç kez görüldüğü
+                occurrences = dict(
+                    manifest.filter(index_run=run, content_hash__in=set(hashes))
+                    .values_list('content_hash').annotate(n=Count('id'))
+                )
+                rows = []
+                for (content, payload, boundaries), chunk_hash in zip(batch, hashes):
+                    occurrence = occurrences.get(chunk_hash, 0)
+                    occurrences[chunk_hash] = occurrence + 1
+                    rows.append(GptPackageFileChunk(
+                        package_file=self,
+                        collection=collection_name,
+                        point_id=make_point_id(collection_name, self.id, f"{chunk_hash}:{occurrence}"),
+                        content_hash=chunk_hash,
+                        chunk_index=payload["chunk_index"],
+                        payload_digest=payload_digest({**payload, "content_hash": chunk_hash}),
+                        boundaries=boundaries,
+                        index_run=run,
+                    ))
+                known = {}
+                if use_manifest:
+                    known = dict(manifest.filter(point_id__in=[row.point_id for row in rows], stored=True)
+                                 .values_list('point_id', 'payload_digest'))
+                pending = [(row, content, payload) for row, (content, payload, _) in zip(rows, batch)
+                           if known.get(row.point_id) != row.payload_digest]
+                if pending:
+                    result = upsert_if_changed(
+                        collection_name,
+                        ids=[row.point_id for row, _, _ in pending],
+                        contents=[content for _, content, _ in pending],
+                        payloads=[payload for _, _, payload in pending],
+                        encode_fn=encode_fn
                     )
+                    if not result["ok"]:
+                        raise RuntimeError(f"Qdrant upsert failed for {collection_name} ({len(pending)} chunks)")
+                    dropped = set(result["dropped_ids"])
+                    for row in rows:
+                        row.stored = row.point_id not in dropped
+                GptPackageFileChunk.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=['package_file', 'collection', 'point_id'],
+                    update_fields=['content_hash', 'chunk_index', 'payload_digest', 'boundaries', 'index_run', 'stored'],
                 )
-            # Görsel chunk'ları
-            if images:
-                clip_model, clip_preprocess = get_clip_model()
-                import torch
-                for img_idx, img_bytes in enumerate(images):
-                    try:
-                        image = Image.open(io.BytesIO(img_bytes)).convert('RGB')
-                        image_input = clip_preprocess(image).unsqueeze(0)
-                        with torch.no_grad():
-                            image_features = clip_model.encode_image(image_input).squeeze(0).cpu().numpy().tolist()
-                        points.append(
-                            qdrant_models.PointStruct(
-                                id=f"{self.id}_image_{img_idx}",
-                                vector=image_features,
-                                payload={
-                                    "gpt_package_file_id": str(self.id),
-                                    "gpt_package_id": str(self.gpt_package.id),
-                                    "file_name": file_name,
-                                    "title": title,
-                                    "chunk_index": img_idx,
-                                    "type": "image",
-                                }
-                            )
-                        )
-                    except Exception:
-                        continue
-        if points:
-            for point in points:
-                add_to_qdrant(QDRANT_FILE_COLLECTION, "", point.payload | {"id": point.id})
+                done += len(batch)
+                progress(IngestionJob.STAGE_EMBEDDING, done=done, total=done if total is None else total)
+
+            if owns_run is not None and not owns_run():
+                # Dosyanın güncel indekslemesi başka bir çalışmada; onun chunk'ları "eski" sayılıp silinmemeli
+                return done
+            # Artık üretilmeyen chunk'lar silinir: bu çalışmada işaretlenmemiş manifest satırları sayfa sayfa okunur
+            stale = manifest.exclude(index_run=run)
+            while page := list(stale.values_list('id', 'point_id')[:self.INDEX_BATCH_SIZE]):
+                if not delete_from_qdrant(collection_name, [point_id for _, point_id in page]):
+                    raise RuntimeError(f"Stale chunk delete failed for {collection_name}")
+                GptPackageFileChunk.objects.filter(id__in=[row_id for row_id, _ in page]).delete()
+            if not had_manifest or not use_manifest:
+                # Manifest'i olmayan (ya da güvenilmeyen) dosyalarda Qdrant'taki noktalar manifest'le karşılaştırılır;
+                # ör. eski, sıra numarasından türetilmiş ID'ler
+                for point_ids in iter_point_ids(collection_name, {"gpt_package_file_id": str(self.id)}, self.INDEX_BATCH_SIZE):
+                    listed = set(manifest.filter(point_id__in=point_ids).values_list('point_id', flat=True))
+                    unlisted = [point_id for point_id in point_ids if point_id not in listed]
+                    if unlisted and not delete_from_qdrant(collection_name, unlisted):
+                        raise RuntimeError(f"Stale chunk delete failed for {collection_name}")
+        return done
 
     def delete(self, *args, **kwargs):
-        QDRANT_FILE_COLLECTION = 'gpt_package_files'
-        try:
-            ext = os.path.splitext(self.file.name)[1].lower()
-            if ext in ['.csv', '.xlsx']:
-                text, _ = self.get_file_content()
-                table_chunks = self.chunk_table(text)
-                point_ids = [f"{self.id}_table_{i}" for i in range(len(table_chunks))]
-            else:
-                text, images = self.get_file_content()
-                chunk_heading_pairs = self.chunk_text(text)
-                point_ids = [f"{self.id}_text_{i}" for i in range(len(chunk_heading_pairs))]
-                point_ids += [f"{self.id}_image_{i}" for i in range(len(images))]
-            delete_from_qdrant(QDRANT_FILE_COLLECTION, point_ids)
-        except Exception:
-            pass
+        # Dosya yeniden parse edilmez: dosyanın tüm noktaları gpt_package_file_id filtresiyle silinir
+        from hexense_core.semantic import delete_where
+        for collection_name in (QDRANT_FILE_COLLECTION, QDRANT_FILE_IMAGE_COLLECTION):
+            delete_where(collection_name, {"gpt_package_file_id": str(self.id)})
         super().delete(*args, **kwargs)
 
+
+class GptPackageFileChunk(models.Model):
+    """
+    GptPackageFile'ın son indekslemede üretilen bir chunk'ı (chunk manifest'i).
+
+    Nokta ID'si, içerik ve payload hash'i ile chunk sınırlarını tutar; index_vectors değişmeyen chunk'ları
+    Qdrant'a sormadan atlamak ve artık üretilmeyen chunk'ları silmek için bu tabloyu batch batch okur.
+    stored=False olan chunk'lar encode edilemediği için Qdrant'a yazılmamıştır.
+    """
+    package_file = models.ForeignKey('GptPackageFile', on_delete=models.CASCADE, related_name='chunks')
+    collection = models.CharField(max_length=100)
+    point_id = models.CharField(max_length=36)
+    content_hash = models.CharField(max_length=64)
+    chunk_index = models.PositiveIntegerField()
+    payload_digest = models.CharField(max_length=40)
+    boundaries = models.JSONField(default=dict, blank=True, help_text="Chunk sınırları (paragraf, satır ya da görsel aralığı)")
+    stored = models.BooleanField(default=True)
+    index_run = models.UUIDField(null=True, blank=True, help_text="Chunk'ı son üreten indeksleme çalışması")
+
+    def __str__(self):
+        return f"{self.package_file_id} {self.collection} #{self.chunk_index}"
+
+    class Meta:
+        verbose_name = "Gpt Package File Chunk"
+        verbose_name_plural = "System: Gpt Package File Chunks"
+        constraints = [
+            models.UniqueConstraint(fields=['package_file', 'collection', 'point_id'], name='file_chunk_point_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['package_file', 'collection', 'index_run', 'content_hash'], name='file_chunk_run_idx'),
+        ]
+
+
+class IngestionJob(models.Model):
+    """
+    GptPackageFile'ın arka planda parse edilip embedding'lerinin Qdrant'a yazılması işi.
+
+    Yükleme isteği yalnızca bu kaydı oluşturur. `hexense_core.ingestion` worker'ı (manage.py
+    run_ingestion_worker) job'ları sırayla alır, GptPackageFile.index_vectors'ı çalıştırır ve aşama,
+    chunk ilerlemesi, aşama süreleri ve hata bilgisini bu kayda yazar.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    STAGE_QUEUED = 'queued'
+    STAGE_EXTRACTING = 'extracting'
+    STAGE_CHUNKING = 'chunking'
+    STAGE_EMBEDDING = 'embedding'
+    STAGE_DONE = 'done'
+    STAGE_CHOICES = [
+        (STAGE_QUEUED, 'Queued'),
+        (STAGE_EXTRACTING, 'Extracting'),
+        (STAGE_CHUNKING, 'Chunking'),
+        (STAGE_EMBEDDING, 'Embedding'),
+        (STAGE_DONE, 'Done'),
+    ]
+
+    package_file = models.ForeignKey('GptPackageFile', on_delete=models.CASCADE, related_name='ingestion_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    stage = models.CharField(max_length=12, choices=STAGE_CHOICES, default=STAGE_QUEUED)
+    chunks_done = models.PositiveIntegerField(default=0)
+    chunks_total = models.PositiveIntegerField(default=0)
+    stage_timings = models.JSONField(default=dict, blank=True, help_text="Aşama başına süre (sn)")
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, help_text="Worker'ın son ilerleme bildirimi (heartbeat)")
+
+    def __str__(self):
+        return f"{self.package_file_id} {self.stage} ({self.status})"
+
+    class Meta:
+        verbose_name = "Ingestion Job"
+        verbose_name_plural = "System: Ingestion Jobs"
+        indexes = [
+            models.Index(fields=['status', 'id'], name='ingestion_job_ready_idx'),
+        ]
+
+    @property
+    def progress_percent(self) -> int:
+        if self.status == self.STATUS_DONE:
+            return 100
+        if not self.chunks_total:
+            return 0
+        return int(100 * self.chunks_done / self.chunks_total)
+
+    @classmethod
+    def enqueue(cls, package_file):
+        """
+        Dosya için bekleyen bir job yoksa yenisini oluşturur; varsa mevcut job'ı döndürür.
+        Dosyanın çalışan bir job'ı varsa yeni job onun bitmesini bekler (bkz. ingestion.claim_job).
+        """
+        pending = cls.objects.filter(package_file=package_file, status=cls.STATUS_PENDING).first()
+        return pending or cls.objects.create(package_file=package_file)
+
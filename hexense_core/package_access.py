@@ -0,0 +1,62 @@
+# hexense_core/package_access.py
+
+"""
+Rol → erişilebilir GPT paketleri eşlemesinin process içi cache'i.
+
+Paket yönlendirmesi (find_best_gpt_package) her çağrıda rolün paketlerini veritabanından
+okumak yerine bu cache'i kullanır. GptPackage, rol ataması (allowed_roles), Role, GptModel ve
+GptPackageGroup değişikliklerinde signals.py cache'i temizler; diğer process'lerdeki kopyalar en geç
+GPT_PACKAGE_ACCESS_CACHE_TTL saniye sonra yenilenir.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+
+GPT_PACKAGE_ACCESS_CACHE_TTL = getattr(settings, "GPT_PACKAGE_ACCESS_CACHE_TTL", 60)
+
+_cache = {}
+_lock = threading.Lock()
+# Yükleme sırasında gelen bir invalidation'ın eski sonucu cache'e yazmasını engeller
+_generation = 0
+
+
+def allowed_packages_for_role(role_id) -> dict:
+    """
+    Rolün erişebildiği ve modeli aktif olan paketleri döndürür.
+
+    Returns:
+        dict: {str(gpt_package_id): GptPackage}; model ve group select_related ile yüklüdür
+    """
+    if role_id is None:
+        return {}
+    now = time.monotonic()
+    entry = _cache.get(role_id)
+    if entry is not None and now - entry[0] < GPT_PACKAGE_ACCESS_CACHE_TTL:
+        return entry[1]
+
+    from hexense_core.models import GptPackage
+
+    generation = _generation
+    packages = {
+        str(pkg.id): pkg
+        for pkg in GptPackage.objects.filter(
+            allowed_roles=role_id,
+            model__is_active=True
+        ).select_related("model", "group").distinct()
+    }
+    with _lock:
+        if generation == _generation:
+            _cache[role_id] = (now, packages)
+    return packages
+
+
+def invalidate(*args, **kwargs):
+    """
+    Cache'i tamamen temizler. Signal receiver olarak doğrudan bağlanabilir.
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
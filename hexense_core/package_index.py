@@ -0,0 +1,132 @@
+# hexense_core/package_index.py
+
+"""
+gpt_packages koleksiyonunun process içi kopyası.
+
+Koleksiyon en fazla birkaç yüz nokta içerdiği için paket yönlendirmesi (find_best_gpt_package,
+switch_gpt) Qdrant'a ağ isteği atmak yerine bellekteki normalize edilmiş float32 matris üzerinde
+tek bir matris-vektör çarpımıyla yapılır. Qdrant doğruluk kaynağı olarak kalır: index ilk
+kullanımda Qdrant'tan (scroll) yüklenir, GptPackage vektörü değiştiğinde (gpt_package_vector_changed
+signal'i) geçersiz kılınır ve bir sonraki aramada yeniden yüklenir. Diğer process'lerdeki kopyalar
+en geç GPT_PACKAGE_INDEX_TTL saniye sonra yenilenir. Index yüklenemezse arayan Qdrant'a döner.
+"""
+
+import logging
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+GPT_PACKAGE_INDEX_TTL = getattr(settings, "GPT_PACKAGE_INDEX_TTL", 300)
+COLLECTION_NAME = "gpt_packages"
+SCROLL_PAGE_SIZE = 256
+
+
+class PackageVectorIndex:
+    """
+    Paket id'leri ve satırları L2-normalize edilmiş (n, dim) float32 matris.
+    Skorlar normalize edilmiş iç çarpımdır; Qdrant'ın Cosine skoruyla aynıdır.
+    """
+
+    def __init__(self, ttl: float = GPT_PACKAGE_INDEX_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (yükleme zamanı, {package_id: satır}, matris); tek atamayla değiştirilir
+        self._snapshot = None
+        self._generation = 0
+
+    def invalidate(self, *args, **kwargs):
+        """
+        Index'i geçersiz kılar; bir sonraki arama Qdrant'tan yeniden yükler. Signal receiver olarak bağlanabilir.
+        """
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def _load(self):
+        from hexense_core.semantic import get_qdrant_client
+
+        client = get_qdrant_client()
+        ids, vectors = [], []
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=COLLECTION_NAME,
+                limit=SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=["gpt_package_id"],
+                with_vectors=True
+            )
+            for point in points:
+                package_id = (point.payload or {}).get("gpt_package_id") or str(point.id)
+                ids.append(package_id)
+                vectors.append(point.vector)
+            if offset is None:
+                break
+        if vectors:
+            matrix = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1.0, norms)
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        return {package_id: row for row, package_id in enumerate(ids)}, matrix
+
+    def _get_snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot[0] < self.ttl:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - snapshot[0] < self.ttl:
+                return snapshot
+            generation = self._generation
+        start = time.perf_counter()
+        rows, matrix = self._load()
+        snapshot = (time.monotonic(), rows, matrix)
+        with self._lock:
+            # Yükleme sırasında invalidate edildiyse sonucu bu arama için kullan ama saklama
+            if generation == self._generation:
+                self._snapshot = snapshot
+        logger.info(f"GPT package index loaded: {len(rows)} packages in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return snapshot
+
+    def search(self, query_vector, allowed_ids=None, limit: int = 1):
+        """
+        En benzer paketleri döndürür.
+
+        Args:
+            query_vector (np.ndarray): Sorgu embedding'i
+            allowed_ids (iterable, optional): Yalnızca bu paket id'leri arasında ara
+            limit (int): Döndürülecek en fazla sonuç
+
+        Returns:
+            list | None: [(package_id, score), ...] skor sırasıyla; index yüklenemezse None
+        """
+        try:
+            _, rows, matrix = self._get_snapshot()
+        except Exception as e:
+            logger.warning(f"GPT package index unavailable, falling back to Qdrant: {e}")
+            return None
+        if allowed_ids is None:
+            candidate_ids = list(rows)
+        else:
+            candidate_ids = [package_id for package_id in allowed_ids if package_id in rows]
+        if not candidate_ids:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        scores = matrix[[rows[package_id] for package_id in candidate_ids]] @ query
+        if limit >= len(scores):
+            order = np.argsort(-scores)
+        else:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            order = top[np.argsort(-scores[top])]
+        return [(candidate_ids[i], float(scores[i])) for i in order]
+
+
+package_index = PackageVectorIndex()
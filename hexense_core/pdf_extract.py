@@ -0,0 +1,94 @@
+# hexense_core/pdf_extract.py
+
+"""
+PDF'den metin ve gömülü görselleri tek geçişte çıkarır.
+
+Dosya bir kez açılır ve sayfalar sırayla işlenir. Her sayfanın metni okunur. Sayfada görsel varsa
+sayfa yalnızca bir kez rasterize edilir ve sayfadaki tüm görseller bu raster'dan kırpılır. İşlenen
+sayfanın pdfplumber önbellekleri hemen bırakılır, böylece bellek kullanımı sayfa sayısıyla büyümez.
+"""
+
+import io
+from typing import Iterator, List, NamedTuple, Tuple
+
+PDF_RENDER_RESOLUTION = 150
+# PDF koordinatları 1/72 inç (point) cinsindendir
+POINTS_PER_INCH = 72
+
+
+class PdfPage(NamedTuple):
+    number: int
+    text: str
+    images: List[bytes]
+
+
+def _crop_images(page, resolution: int) -> List[bytes]:
+    """
+    Sayfayı bir kez rasterize eder ve gömülü görselleri PNG olarak kırpar.
+    """
+    if not page.images:
+        return []
+    try:
+        raster = page.to_image(resolution=resolution).original
+    except Exception:
+        return []
+    # Görsel koordinatları point cinsinden ve sayfa kutusuna göredir; raster piksel cinsindendir
+    scale = resolution / POINTS_PER_INCH
+    x_offset, y_offset = page.bbox[0], page.bbox[1]
+    images = []
+    for img in page.images:
+        box = (
+            max(0, round((img['x0'] - x_offset) * scale)),
+            max(0, round((img['top'] - y_offset) * scale)),
+            min(raster.width, round((img['x1'] - x_offset) * scale)),
+            min(raster.height, round((img['bottom'] - y_offset) * scale)),
+        )
+        # Sayfa dışında kalan ya da boş alanlı görseller atlanır
+        if box[2] <= box[0] or box[3] <= box[1]:
+            continue
+        try:
+            buf = io.BytesIO()
+            raster.crop(box).save(buf, format='PNG')
+            images.append(buf.getvalue())
+        except Exception:
+            continue
+    raster.close()
+    return images
+
+
+def _release(page):
+    # pdfplumber sayfa nesnelerini (karakterler, çizgiler, görseller) sayfa üzerinde önbellekler
+    close = getattr(page, "close", None) or page.flush_cache
+    close()
+
+
+def iter_pdf_pages(file, resolution: int = PDF_RENDER_RESOLUTION, page_numbers: List[int] = None) -> Iterator[PdfPage]:
+    """
+    PDF sayfalarını sırayla metin ve görselleriyle birlikte döndürür.
+
+    Args:
+        file: Dosya yolu ya da okunabilir dosya nesnesi
+        resolution (int): Görsellerin kırpılacağı raster çözünürlüğü (DPI)
+        page_numbers (list, optional): Yalnızca bu sayfalar (1'den başlar)
+
+    Returns:
+        Iterator[PdfPage]: (sayfa numarası, metin, PNG görseller)
+    """
+    import pdfplumber
+    with pdfplumber.open(file, pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            try:
+                yield PdfPage(page.page_number, page.extract_text() or "", _crop_images(page, resolution))
+            finally:
+                _release(page)
+
+
+def extract_pdf(file, resolution: int = PDF_RENDER_RESOLUTION) -> Tuple[str, List[bytes]]:
+    """
+    PDF'in tüm metnini (sayfalar satır sonuyla birleştirilir) ve gömülü görsellerini döndürür.
+    """
+    texts, images = [], []
+    for page in iter_pdf_pages(file, resolution=resolution):
+        texts.append(page.text)
+        images.extend(page.images)
+    return '\n'.join(texts), images
@@ -0,0 +1,76 @@
+# hexense_core/registry.py
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class LazyResource:
+    """
+    Ağır bir bağımlılığı (model, istemci vb.) ilk kullanımda yükleyen, thread-safe sarmalayıcı.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self.name = name
+        self._factory = factory
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_seconds = None
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                self._value = self._factory()
+                self.load_seconds = time.perf_counter() - start
+                self._loaded = True
+                logger.info(f"Lazy resource '{self.name}' loaded in {self.load_seconds:.2f}s")
+        return self._value
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def reset(self):
+        with self._lock:
+            self._value = None
+            self._loaded = False
+            self.load_seconds = None
+
+
+_resources: Dict[str, LazyResource] = {}
+
+
+def register(name: str, factory: Callable[[], Any]) -> LazyResource:
+    """
+    Bir kaynağı isimle kaydeder; factory ilk `get(name)` çağrısına kadar çalıştırılmaz.
+    Aynı isimle tekrar kayıt yapılırsa mevcut kaynak döndürülür (modül yeniden yüklemelerinde güvenli).
+    """
+    resource = _resources.get(name)
+    if resource is None:
+        resource = _resources[name] = LazyResource(name, factory)
+    return resource
+
+
+def get(name: str):
+    """
+    Kayıtlı kaynağı döndürür, gerekiyorsa ilk kez yükler.
+    """
+    try:
+        resource = _resources[name]
+    except KeyError:
+        raise KeyError(f"Lazy resource '{name}' is not registered.")
+    return resource.get()
+
+
+def loaded() -> Dict[str, float]:
+    """
+    Yüklenmiş kaynakları {isim: yükleme süresi (sn)} olarak döndürür.
+    """
+    return {name: r.load_seconds for name, r in _resources.items() if r.is_loaded}
@@ -1,50 +1,727 @@
-from hexense_core.models import GptPackage
-from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
-from qdrant_client.http import models as qdrant_models
-from typing import Tuple
+from hexense_core.models import GptPackage, get_clip_model
+from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import os
 from hexense_core import llm_dispatcher
+from hexense_core import registry
+from hexense_core import package_access
+from hexense_core.package_index import package_index
+from hexense_core.embedding_batcher import EmbeddingBatcher
+from hexense_core.embedding_cache import EmbeddingCache, make_key, normalize_text
+from hexense_core.embedding_workers import CLIP_MODEL_NAME, CLIP_PRETRAINED
+from hexense_core import sparse_encoder
+from django.conf import settings
 import asyncio
+import hashlib
+import json
+import time
+import uuid
+import weakref
+import numpy as np
 
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
+QDRANT_TIMEOUT = getattr(settings, "QDRANT_TIMEOUT", 10)
+QDRANT_POOL_SIZE = getattr(settings, "QDRANT_POOL_SIZE", 20)
+QDRANT_UPSERT_BATCH_SIZE = getattr(settings, "QDRANT_UPSERT_BATCH_SIZE", 128)
+QDRANT_UPSERT_PARALLEL = getattr(settings, "QDRANT_UPSERT_PARALLEL", 1)
+QDRANT_HYBRID_PREFETCH_FACTOR = getattr(settings, "QDRANT_HYBRID_PREFETCH_FACTOR", 4)
+EMBEDDING_MODEL_NAME = getattr(settings, "EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+EMBEDDING_BACKEND = getattr(settings, "EMBEDDING_BACKEND", "sentence_transformers")
+EMBEDDING_BACKEND_OPTIONS = getattr(settings, "EMBEDDING_BACKEND_OPTIONS", {})
+EMBEDDING_BATCH_MAX_SIZE = getattr(settings, "EMBEDDING_BATCH_MAX_SIZE", 32)
+EMBEDDING_BATCH_MAX_WAIT_MS = getattr(settings, "EMBEDDING_BATCH_MAX_WAIT_MS", 5)
+EMBEDDING_CACHE_SIZE = getattr(settings, "EMBEDDING_CACHE_SIZE", 10000)
+EMBEDDING_CACHE_DIR = getattr(settings, "EMBEDDING_CACHE_DIR", None)
+EMBEDDING_EXECUTOR = getattr(settings, "EMBEDDING_EXECUTOR", "thread")
+EMBEDDING_PROCESS_WORKERS = getattr(settings, "EMBEDDING_PROCESS_WORKERS", 2)
+EMBEDDING_DIMENSION = getattr(settings, "EMBEDDING_DIMENSION", 384)
+DOCUMENT_INGEST_WORKERS = getattr(settings, "DOCUMENT_INGEST_WORKERS", 0)
+DOCUMENT_INGEST_MIN_PAGES = getattr(settings, "DOCUMENT_INGEST_MIN_PAGES", 32)
+DOCUMENT_INGEST_PAGES_PER_TASK = getattr(settings, "DOCUMENT_INGEST_PAGES_PER_TASK", 16)
+QDRANT_STORAGE_PROFILES = getattr(settings, "QDRANT_STORAGE_PROFILES", {"default": {}})
+QDRANT_COLLECTION_PROFILES = getattr(settings, "QDRANT_COLLECTION_PROFILES", {})
+CLIP_DIMENSION = 512
 
-_embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-qdrant_client = QdrantClient(QDRANT_URL)
+# Cache anahtarında model adıyla birlikte backend de yer alır; farklı backend'lerin çıktıları birebir aynı değildir
+_EMBEDDING_CACHE_NAMESPACE = f"{EMBEDDING_MODEL_NAME}:{EMBEDDING_BACKEND}"
+# Görsel içerik hash'leri CLIP modeline göre ayrışır; CLIP modeli değişince görsel noktaları yeniden yazılır
+_IMAGE_EMBEDDING_NAMESPACE = f"clip:{CLIP_MODEL_NAME}:{CLIP_PRETRAINED}"
 
-def find_best_gpt_package(user_input: str, user_profile) -> Tuple[GptPackage, float]:
+def _load_embedding_backend():
+    # Backend kütüphaneleri (torch, onnxruntime) yalnızca ilk embedding isteğinde import edilir
+    from hexense_core.embedding_backends import create_backend
+    return create_backend(EMBEDDING_BACKEND, EMBEDDING_MODEL_NAME, **EMBEDDING_BACKEND_OPTIONS)
+
+def _load_qdrant_client():
+    from qdrant_client import QdrantClient
+    return QdrantClient(QDRANT_URL, timeout=QDRANT_TIMEOUT)
+
+def _load_embedding_process_pool():
+    from hexense_core.embedding_workers import EmbeddingProcessPool
+    return EmbeddingProcessPool(
+        EMBEDDING_MODEL_NAME,
+        backend_name=EMBEDDING_BACKEND,
+        backend_options=EMBEDDING_BACKEND_OPTIONS,
+        workers=EMBEDDING_PROCESS_WORKERS,
+        batch_size=EMBEDDING_BATCH_MAX_SIZE
+    )
+
+def _load_document_ingest_pool():
+    from hexense_core.ingest_workers import DocumentIngestPool
+    return DocumentIngestPool(
+        EMBEDDING_MODEL_NAME,
+        pages_per_task=DOCUMENT_INGEST_PAGES_PER_TASK,
+        backend_name=EMBEDDING_BACKEND,
+        backend_options=EMBEDDING_BACKEND_OPTIONS,
+        workers=DOCUMENT_INGEST_WORKERS,
+        batch_size=EMBEDDING_BATCH_MAX_SIZE
+    )
+
+def _load_qdrant_models():
+    from qdrant_client.http import models
+    return models
+
+registry.register("embedding_backend", _load_embedding_backend)
+registry.register("qdrant_client", _load_qdrant_client)
+registry.register("qdrant_models", _load_qdrant_models)
+registry.register("embedding_process_pool", _load_embedding_process_pool)
+registry.register("document_ingest_pool", _load_document_ingest_pool)
+
+class _LazyQdrantModels:
+    # qdrant_client.http.models import'u ~1 sn sürer ve grpc ile sync/async istemcileri de yükler;
+    # modül ilk attribute erişiminde (ilk Qdrant isteğinde) import edilir
+    def __getattr__(self, name):
+        return getattr(registry.get("qdrant_models"), name)
+
+qdrant_models = _LazyQdrantModels()
+
+def get_embedding_backend():
+    """
+    Returns the configured embedding backend (EMBEDDING_BACKEND), loading it on first use.
+    """
+    return registry.get("embedding_backend")
+
+def get_qdrant_client():
+    """
+    Returns the shared QdrantClient, connecting on first use.
+    """
+    return registry.get("qdrant_client")
+
+# httpx bağlantı havuzu oluşturulduğu event loop'a bağlıdır; bu yüzden async istemci loop başına tutulur
+_async_qdrant_clients = weakref.WeakKeyDictionary()
+
+def get_async_qdrant_client():
+    """
+    Returns the AsyncQdrantClient of the running event loop. All coroutines on the same loop
+    share one client and its pooled keep-alive connections (QDRANT_POOL_SIZE, QDRANT_TIMEOUT).
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_qdrant_clients.get(loop)
+    if client is None:
+        import httpx
+        from qdrant_client import AsyncQdrantClient
+        client = AsyncQdrantClient(
+            QDRANT_URL,
+            timeout=QDRANT_TIMEOUT,
+            limits=httpx.Limits(max_connections=QDRANT_POOL_SIZE, max_keepalive_connections=QDRANT_POOL_SIZE)
+        )
+        _async_qdrant_clients[loop] = client
+    return client
+
+# Qdrant koleksiyon tanımları: vektör boyutu, mesafe ve filtrelerde kullanılan payload alanlarının index tipleri.
+# Filtreli aramalar (ör. user_profile_id + context_type) bu index'ler olmadan koleksiyonun tamamını tarar.
+# "sparse" tanımlı koleksiyonlarda dense vektörün yanında BM25 tarzı bir sparse vektör de tutulur (hibrit arama);
+# avg_doc_length BM25 uzunluk normalizasyonu için koleksiyondaki tipik metin uzunluğudur (terim sayısı),
+# text_field ise metni payload'da tutan koleksiyonlarda migrate_collection'ın sparse vektörü ürettiği alandır.
+# "rebuildable": False olan koleksiyonların kaynağı yalnızca Qdrant'tır (reindex_vectors ile yeniden üretilemez).
+# Index tipleri PayloadSchemaType değerleridir; qdrant_client import edilmeden tanımlanabilmeleri için düz string tutulur.
+KEYWORD = "keyword"
+BOOL = "bool"
+QDRANT_COLLECTIONS = {
+    "gpt_packages": {
+        "vector_size": EMBEDDING_DIMENSION,
+        "payload_indexes": {"gpt_package_id": KEYWORD, "group_key": KEYWORD, "context_type": KEYWORD},
+    },
+    "gpt_package_files": {
+        "vector_size": EMBEDDING_DIMENSION,
+        "sparse": {"avg_doc_length": 200},
+        "payload_indexes": {"gpt_package_id": KEYWORD, "gpt_package_file_id": KEYWORD, "type": KEYWORD},
+    },
+    # CLIP görsel vektörleri (512) metin vektörleriyle (384) aynı koleksiyona yazılamaz
+    "gpt_package_file_images": {
+        "vector_size": CLIP_DIMENSION,
+        "payload_indexes": {"gpt_package_id": KEYWORD, "gpt_package_file_id": KEYWORD},
+    },
+    "messages": {
+        "vector_size": EMBEDDING_DIMENSION,
+        "sparse": {"avg_doc_length": 40},
+        "payload_indexes": {
+            "conversation_id": KEYWORD,
+            "gpt_package_id": KEYWORD,
+            "sender": KEYWORD,
+            "is_active": BOOL,
+        },
+    },
+    "conversations": {
+        "vector_size": EMBEDDING_DIMENSION,
+        "payload_indexes": {"conversation_id": KEYWORD, "is_active": BOOL},
+    },
+    "conversation_contexts": {
+        "vector_size": EMBEDDING_DIMENSION,
+        "sparse": {"avg_doc_length": 60, "text_field": "summary"},
+        "rebuildable": False,
+        "payload_indexes": {
+            "user_profile_id": KEYWORD,
+            "context_type": KEYWORD,
+            "conversation_id": KEYWORD,
+            "gpt_package_id": KEYWORD,
+        },
+    },
+}
+
+# Hibrit koleksiyonlarda vektör adları
+DENSE_VECTOR = "dense"
+SPARSE_VECTOR = "sparse"
+
+# Bu process'te doğrulanmış koleksiyonlar; sonraki yazımlarda Qdrant'a tekrar sorulmaz
+_ensured_collections = set()
+# Qdrant'ta gerçekten dense + sparse (isimli vektör) düzeniyle duran koleksiyonlar. Hibrit tanımlı olup
+# eski düzende (tek isimsiz vektör) oluşturulmuş koleksiyonlar taşınana kadar dense-only çalışır.
+# Her iki küme de process başınadır; koleksiyon başka bir process'te taşınırsa Qdrant'ın reddettiği ilk
+# istekte düzen yeniden okunur ve istek bir kez tekrarlanır (bkz. _with_layout_retry).
+_hybrid_collections = set()
+
+def _collection_spec(collection_name: str, vector_size: int = None) -> dict:
+    spec = QDRANT_COLLECTIONS.get(collection_name)
+    if spec is None:
+        if vector_size is None:
+            raise ValueError(f"Unknown Qdrant collection {collection_name!r}; declare it in QDRANT_COLLECTIONS or pass vector_size")
+        spec = {"vector_size": vector_size, "payload_indexes": {}}
+    return {"distance": qdrant_models.Distance.COSINE, **spec}
+
+def get_storage_profile(collection_name: str) -> dict:
+    """
+    Returns the storage profile of a collection (QDRANT_COLLECTION_PROFILES -> QDRANT_STORAGE_PROFILES).
+    """
+    profile_name = QDRANT_COLLECTION_PROFILES.get(collection_name, "default")
+    if profile_name not in QDRANT_STORAGE_PROFILES:
+        raise ValueError(f"Unknown Qdrant storage profile {profile_name!r} for collection {collection_name!r}")
+    return QDRANT_STORAGE_PROFILES[profile_name]
+
+def _quantization_config(profile: dict):
+    if profile.get("quantization") != "int8":
+        return None
+    return qdrant_models.ScalarQuantization(
+        scalar=qdrant_models.ScalarQuantizationConfig(
+            type=qdrant_models.ScalarType.INT8,
+            quantile=profile.get("quantization_quantile", 0.99),
+            always_ram=profile.get("quantization_always_ram", True)
+        )
+    )
+
+def _hnsw_config(profile: dict):
+    if "hnsw_m" not in profile and "hnsw_ef_construct" not in profile:
+        return None
+    return qdrant_models.HnswConfigDiff(m=profile.get("hnsw_m"), ef_construct=profile.get("hnsw_ef_construct"))
+
+def collection_params_for_profile(profile: dict, vector_size: int, distance=None, sparse: bool = False) -> dict:
+    """
+    Translates a storage profile into create_collection() keyword arguments.
+    distance defaults to cosine. With sparse=True the dense vector is named DENSE_VECTOR and an
+    IDF-weighted sparse vector is added.
+    """
+    dense = qdrant_models.VectorParams(
+        size=vector_size,
+        distance=distance or qdrant_models.Distance.COSINE,
+        on_disk=profile.get("on_disk_vectors")
+    )
+    params = {"vectors_config": {DENSE_VECTOR: dense} if sparse else dense}
+    if sparse:
+        params["sparse_vectors_config"] = {
+            SPARSE_VECTOR: qdrant_models.SparseVectorParams(
+                index=qdrant_models.SparseIndexParams(on_disk=profile.get("on_disk_vectors")),
+                # BM25'in IDF bileşeni Qdrant tarafında koleksiyon istatistiklerinden hesaplanır
+                modifier=qdrant_models.Modifier.IDF
+            )
+        }
+    hnsw_config = _hnsw_config(profile)
+    if hnsw_config is not None:
+        params["hnsw_config"] = hnsw_config
+    quantization_config = _quantization_config(profile)
+    if quantization_config is not None:
+        params["quantization_config"] = quantization_config
+    if "on_disk_payload" in profile:
+        params["on_disk_payload"] = profile["on_disk_payload"]
+    return params
+
+def search_params_for_profile(profile: dict):
+    """
+    Translates a storage profile into search-time SearchParams (hnsw ef, quantized search with rescoring).
+    Returns None when the profile uses Qdrant defaults.
+    """
+    quantization = None
+    if profile.get("quantization"):
+        quantization = qdrant_models.QuantizationSearchParams(
+            rescore=profile.get("rescore", True),
+            oversampling=profile.get("oversampling")
+        )
+    if profile.get("search_ef") is None and quantization is None:
+        return None
+    return qdrant_models.SearchParams(hnsw_ef=profile.get("search_ef"), quantization=quantization)
+
+_search_params_cache = {}
+
+def _search_params(collection_name: str):
+    if collection_name not in _search_params_cache:
+        _search_params_cache[collection_name] = search_params_for_profile(get_storage_profile(collection_name))
+    return _search_params_cache[collection_name]
+
+def apply_storage_profile(collection_name: str) -> bool:
+    """
+    Applies the collection's storage profile to an existing collection (HNSW, quantization,
+    on-disk vectors/payload). Qdrant rebuilds the affected segments in the background.
+    """
+    profile = get_storage_profile(collection_name)
+    try:
+        ensure_collection_exists(collection_name)
+        vector_name = DENSE_VECTOR if collection_name in _hybrid_collections else ""
+        client = get_qdrant_client()
+        client.update_collection(
+            collection_name=_alias_target(client, collection_name) or collection_name,
+            vectors_config={vector_name: qdrant_models.VectorParamsDiff(on_disk=profile.get("on_disk_vectors"))},
+            hnsw_config=_hnsw_config(profile),
+            quantization_config=_quantization_config(profile) or qdrant_models.Disabled.DISABLED,
+            collection_params=qdrant_models.CollectionParamsDiff(on_disk_payload=profile.get("on_disk_payload"))
+        )
+        return True
+    except Exception as e:
+        print(f"Error applying storage profile to Qdrant collection {collection_name}: {e}")
+        return False
+
+def ensure_collection_exists(collection_name: str, vector_size: int = None) -> bool:
+    """
+    Creates the collection (vector size, distance, storage profile) and its keyword payload indexes if missing.
+    Idempotent; after the first successful call it is a set lookup.
+    
+    Args:
+        collection_name (str): Name of the Qdrant collection (see QDRANT_COLLECTIONS)
+        vector_size (int, optional): Vector size for collections not declared in QDRANT_COLLECTIONS
+        
+    Returns:
+        bool: True if the collection and its indexes are in place, False otherwise
+    """
+    if collection_name in _ensured_collections:
+        return True
+    spec = _collection_spec(collection_name, vector_size)
+    client = get_qdrant_client()
+    try:
+        target = _alias_target(client, collection_name)
+        if target is None and not client.collection_exists(collection_name):
+            client.create_collection(
+                collection_name=collection_name,
+                **collection_params_for_profile(
+                    get_storage_profile(collection_name), spec["vector_size"], spec["distance"], sparse="sparse" in spec
+                )
+            )
+            hybrid = "sparse" in spec
+            existing_indexes = {}
+        else:
+            info = client.get_collection(target or collection_name)
+            hybrid = _is_hybrid_config(info)
+            vectors = info.config.params.vectors
+            dense = vectors.get(DENSE_VECTOR) if isinstance(vectors, dict) else vectors
+            existing_size = getattr(dense, "size", None)
+            if existing_size is not None and existing_size != spec["vector_size"]:
+                print(f"Warning: Qdrant collection {collection_name} has vector size {existing_size}, expected {spec['vector_size']}")
+            if "sparse" in spec and not hybrid:
+                print(f"Warning: Qdrant collection {collection_name} has no sparse vectors; hybrid search is disabled until it is "
+                      f"migrated (manage.py init_vector_store --migrate {collection_name}; points are copied, nothing is lost)")
+            existing_indexes = info.payload_schema or {}
+        if hybrid:
+            _hybrid_collections.add(collection_name)
+        else:
+            _hybrid_collections.discard(collection_name)
+        for field_name, field_schema in spec["payload_indexes"].items():
+            if field_name not in existing_indexes:
+                client.create_payload_index(
+                    collection_name=target or collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                    wait=True
+                )
+        _ensured_collections.add(collection_name)
+        return True
+    except Exception as e:
+        print(f"Error ensuring Qdrant collection {collection_name}: {e}")
+        return False
+
+async def aensure_collection_exists(collection_name: str, vector_size: int = None) -> bool:
+    """
+    Async variant of ensure_collection_exists. The check runs once per process in a worker thread.
+    """
+    if collection_name in _ensured_collections:
+        return True
+    return await asyncio.to_thread(ensure_collection_exists, collection_name, vector_size)
+
+def _alias_target(client, name: str):
+    """
+    The collection an alias points to, or None if `name` is not an alias.
+    """
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == name:
+            return alias.collection_name
+    return None
+
+def _is_hybrid_config(info) -> bool:
+    vectors = info.config.params.vectors
+    return isinstance(vectors, dict) and DENSE_VECTOR in vectors and SPARSE_VECTOR in (info.config.params.sparse_vectors or {})
+
+def _refresh_layout(collection_name: str) -> bool:
+    """
+    Re-reads whether a declared collection is hybrid, e.g. after Qdrant rejected a request because
+    another process migrated the collection. A missing collection is not created here (it may be in
+    the middle of a migration). Returns True if the layout changed, i.e. the request is worth retrying.
+    """
+    if collection_name not in QDRANT_COLLECTIONS:
+        return False
+    client = get_qdrant_client()
+    try:
+        name = _alias_target(client, collection_name) or collection_name
+        if not client.collection_exists(name):
+            return False
+        hybrid = _is_hybrid_config(client.get_collection(name))
+    except Exception as e:
+        print(f"Error reading Qdrant collection {collection_name} layout: {e}")
+        return False
+    was_hybrid = collection_name in _hybrid_collections
+    if hybrid:
+        _hybrid_collections.add(collection_name)
+    else:
+        _hybrid_collections.discard(collection_name)
+    if hybrid != was_hybrid:
+        print(f"Qdrant collection {collection_name} layout changed (hybrid={hybrid}), retrying request")
+    return hybrid != was_hybrid
+
+def _with_layout_retry(collection_name: str, call):
+    """
+    Runs call(); if it fails because the collection layout changed since this process cached it,
+    retries it once with the new layout. call must build its request from the current layout.
+    """
+    try:
+        return call()
+    except Exception:
+        if not _refresh_layout(collection_name):
+            raise
+        return call()
+
+async def _awith_layout_retry(collection_name: str, call):
+    """
+    Async variant of _with_layout_retry; call returns an awaitable.
+    """
+    try:
+        return await call()
+    except Exception:
+        if not await asyncio.to_thread(_refresh_layout, collection_name):
+            raise
+        return await call()
+
+def is_rebuildable(collection_name: str) -> bool:
+    """
+    False for collections whose points exist only in Qdrant (reindex_vectors cannot rebuild them).
+    """
+    return QDRANT_COLLECTIONS.get(collection_name, {}).get("rebuildable", True)
+
+def recreate_collection(collection_name: str) -> bool:
+    """
+    Drops and recreates a declared collection with its current definition. All points are lost;
+    run reindex_vectors afterwards. Refused for collections that cannot be rebuilt (see migrate_collection).
+    """
+    if not is_rebuildable(collection_name):
+        raise ValueError(f"Qdrant collection {collection_name} cannot be rebuilt from the database; use migrate_collection")
+    client = get_qdrant_client()
+    try:
+        target = _alias_target(client, collection_name)
+        if target is not None:
+            client.update_collection_aliases(change_aliases_operations=[
+                qdrant_models.DeleteAliasOperation(delete_alias=qdrant_models.DeleteAlias(alias_name=collection_name))
+            ])
+        client.delete_collection(target or collection_name)
+    except Exception as e:
+        print(f"Error deleting Qdrant collection {collection_name}: {e}")
+        return False
+    _ensured_collections.discard(collection_name)
+    _hybrid_collections.discard(collection_name)
+    return ensure_collection_exists(collection_name)
+
+def _copy_points(client, collection_name: str, source: str, target: str, batch_size: int) -> int:
+    """
+    Copies every point (id, payload, dense vector) from source to target. Existing sparse vectors are
+    kept; otherwise they are computed from the payload's text_field when the target is hybrid.
+    """
+    spec = QDRANT_COLLECTIONS[collection_name]
+    text_field = spec.get("sparse", {}).get("text_field")
+    hybrid = "sparse" in spec
+    copied, offset = 0, None
+    while True:
+        points, offset = client.scroll(
+            collection_name=source,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        structs = []
+        for point in points:
+            vector = point.vector
+            named = vector if isinstance(vector, dict) else {}
+            dense = named.get(DENSE_VECTOR, named.get("")) if named else vector
+            if not hybrid:
+                new_vector = dense
+            else:
+                new_vector = {DENSE_VECTOR: dense}
+                if SPARSE_VECTOR in named:
+                    new_vector[SPARSE_VECTOR] = named[SPARSE_VECTOR]
+                elif text_field and (point.payload or {}).get(text_field):
+                    new_vector[SPARSE_VECTOR] = sparse_document_vector(collection_name, point.payload[text_field])
+            structs.append(qdrant_models.PointStruct(id=point.id, vector=new_vector, payload=point.payload))
+        if structs:
+            client.upsert(collection_name=target, points=structs, wait=True)
+            copied += len(structs)
+        if offset is None:
+            return copied
+
+def migrate_collection(collection_name: str, batch_size: int = 256) -> int:
+    """
+    Moves a declared collection to its current definition (e.g. dense-only -> hybrid) without losing points.
+
+    A new versioned collection is created and every point is copied into it with its stored vector, so
+    nothing is re-embedded. Sparse vectors come from the payload's text_field; collections without one get
+    them from reindex_vectors, which rewrites points that lack a sparse vector. The collection name then
+    becomes an alias of the new collection. If the name is already an alias, the swap is atomic and a last
+    pass copies the points written in the meantime. A plain collection has to be deleted before the alias
+    can take its name; if Qdrant recreates it in that short window, its points are copied over as well.
+    Other processes pick up the new layout on their next rejected request (_with_layout_retry), so no
+    restart is needed.
+
+    Returns:
+        int: Number of points copied (a point can be counted more than once)
+    """
+    spec = _collection_spec(collection_name)
+    client = get_qdrant_client()
+    alias_target = _alias_target(client, collection_name)
+    if alias_target is None and not client.collection_exists(collection_name):
+        # Taşınacak nokta yok; koleksiyon güncel tanımla oluşturulur
+        _ensured_collections.discard(collection_name)
+        ensure_collection_exists(collection_name)
+        return 0
+    source = alias_target or collection_name
+    target = f"{collection_name}_{time.strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    client.create_collection(
+        collection_name=target,
+        **collection_params_for_profile(
+            get_storage_profile(collection_name), spec["vector_size"], spec["distance"], sparse="sparse" in spec
+        )
+    )
+    for field_name, field_schema in spec["payload_indexes"].items():
+        client.create_payload_index(collection_name=target, field_name=field_name, field_schema=field_schema, wait=True)
+
+    copied = _copy_points(client, collection_name, source, target, batch_size)
+    create_alias = qdrant_models.CreateAliasOperation(
+        create_alias=qdrant_models.CreateAlias(collection_name=target, alias_name=collection_name)
+    )
+    if alias_target is not None:
+        client.update_collection_aliases(change_aliases_operations=[
+            qdrant_models.DeleteAliasOperation(delete_alias=qdrant_models.DeleteAlias(alias_name=collection_name)),
+            create_alias,
+        ])
+        # Takas anından önce eski koleksiyona yazılmış noktalar
+        copied += _copy_points(client, collection_name, source, target, batch_size)
+        client.delete_collection(source)
+    else:
+        for _ in range(3):
+            copied += _copy_points(client, collection_name, source, target, batch_size)
+            client.delete_collection(source)
+            try:
+                client.update_collection_aliases(change_aliases_operations=[create_alias])
+                break
+            except Exception:
+                # Silme ile alias arasında başka bir process koleksiyonu yeniden oluşturmuş olabilir
+                if not client.collection_exists(collection_name):
+                    raise
+        else:
+            raise RuntimeError(f"Could not point alias {collection_name} at {target}; the collection keeps being recreated")
+    _ensured_collections.discard(collection_name)
+    _hybrid_collections.discard(collection_name)
+    ensure_collection_exists(collection_name)
+    return copied
+
+def is_hybrid(collection_name: str) -> bool:
+    """
+    True if the collection stores dense + sparse vectors (checked by ensure_collection_exists).
+    """
+    return collection_name in _hybrid_collections
+
+def sparse_document_vector(collection_name: str, text: str):
+    """
+    BM25-style sparse vector of a document for a hybrid collection.
+    """
+    indices, values = sparse_encoder.encode_document(text, QDRANT_COLLECTIONS[collection_name]["sparse"]["avg_doc_length"])
+    return qdrant_models.SparseVector(indices=indices, values=values)
+
+def _wire_vector(collection_name: str, dense, text: str = None):
+    """
+    Vector struct for one point: a plain list, or {dense, sparse} for hybrid collections.
+    """
+    dense = to_qdrant_vector(dense)
+    if collection_name not in _hybrid_collections:
+        return dense
+    vector = {DENSE_VECTOR: dense}
+    if text is not None:
+        vector[SPARSE_VECTOR] = sparse_document_vector(collection_name, text)
+    return vector
+
+def ensure_all_collections() -> dict:
+    """
+    Bootstraps every collection in QDRANT_COLLECTIONS. Returns {collection_name: ok}.
+    """
+    return {name: ensure_collection_exists(name) for name in QDRANT_COLLECTIONS}
+
+def _use_process_pool() -> bool:
+    return EMBEDDING_EXECUTOR == "process"
+
+def _encode_texts(texts: list) -> np.ndarray:
+    """
+    Encodes texts either in-thread or in the embedding process pool (EMBEDDING_EXECUTOR).
+    Falls back to the in-thread model if the process pool is unavailable.
+    """
+    if _use_process_pool():
+        try:
+            return registry.get("embedding_process_pool").encode_texts(texts)
+        except Exception as e:
+            print(f"Embedding process pool failed, falling back to in-thread encoding: {e}")
+    return get_embedding_backend().encode(texts, batch_size=EMBEDDING_BATCH_MAX_SIZE)
+
+def get_document_ingest_pool(page_count: int):
+    """
+    Returns the page-parallel ingestion pool for a document of `page_count` pages, or None when
+    the document should be processed sequentially (DOCUMENT_INGEST_WORKERS <= 1 or a short document).
+    """
+    if DOCUMENT_INGEST_WORKERS <= 1 or page_count < DOCUMENT_INGEST_MIN_PAGES:
+        return None
+    return registry.get("document_ingest_pool")
+
+def encode_images(images: list) -> Tuple[np.ndarray, list]:
+    """
+    Encodes raw image bytes with the CLIP model.
+    
+    Args:
+        images (list): Image file contents as bytes
+        
+    Returns:
+        tuple: (float32 array of shape (n, 512), indices of the images that could be decoded)
+    """
+    if not images:
+        return np.empty((0, 0), dtype=np.float32), []
+    if _use_process_pool():
+        try:
+            return registry.get("embedding_process_pool").encode_images(images)
+        except Exception as e:
+            print(f"Embedding process pool failed, falling back to in-thread CLIP encoding: {e}")
+    from hexense_core.embedding_workers import encode_images_with_clip
+    clip_model, clip_preprocess = get_clip_model()
+    return encode_images_with_clip(clip_model, clip_preprocess, images)
+
+def to_qdrant_vector(vector) -> list:
+    """
+    Converts a numpy vector to the plain float list the Qdrant client serializes.
+    The semantic layer keeps float32 arrays everywhere else; this is the only conversion point.
+    """
+    if vector is None:
+        return None
+    return np.asarray(vector, dtype=np.float32).tolist()
+
+# Nokta ID'leri için sabit UUIDv5 namespace'i; değiştirilirse tüm ID'ler değişir (reindex gerekir)
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "hexense:qdrant-points")
+
+def make_point_id(collection_name: str, owner_id, chunk_index=None) -> str:
+    """
+    Deterministic UUIDv5 point ID derived from (collection, owner id, chunk index).
+    The same chunk of the same record always maps to the same point, in every process.
+    """
+    name = f"{collection_name}:{owner_id}" if chunk_index is None else f"{collection_name}:{owner_id}:{chunk_index}"
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, name))
+
+def _is_valid_point_id(value) -> bool:
+    if isinstance(value, int):
+        return value >= 0
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+def content_hash(content) -> str:
+    """
+    Hash of the embedded content (normalized text or raw bytes) together with the embedding
+    model/backend (the CLIP model for bytes), stored in the payload as "content_hash".
+    A model change changes every hash.
+    """
+    if isinstance(content, (bytes, bytearray)):
+        data = f"{_IMAGE_EMBEDDING_NAMESPACE}\0".encode("utf-8") + bytes(content)
+    else:
+        data = f"{_EMBEDDING_CACHE_NAMESPACE}\0{normalize_text(content)}".encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:32]
+
+def payload_digest(payload: dict) -> str:
+    """
+    Stable digest of a payload (key order independent); used to detect payload-only changes.
+    """
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def __getattr__(name):
+    # Eski modül seviyesindeki isimler (semantic.qdrant_client, semantic._embedding_model) için geriye uyumluluk
+    if name == "qdrant_client":
+        return get_qdrant_client()
+    if name == "_embedding_model":
+        return get_embedding_backend()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+_embedding_cache = EmbeddingCache(
+    max_entries=EMBEDDING_CACHE_SIZE,
+    disk_path=os.path.join(EMBEDDING_CACHE_DIR, "embeddings.sqlite3") if EMBEDDING_CACHE_DIR else None
+)
+
+def find_best_gpt_package(user_input: str, user_profile, query_vector=None) -> Tuple[GptPackage, float]:
     """
     Kullanıcının profiline atanmış ve modeli aktif olan GPT paketleri arasında en iyi eşleşeni bulur.
     Gelecekte kullanımı olan (modeli aktif olmayan) paketleri hariç tutar.
+    query_vector verilirse (ör. aynı mesaj için hafıza aramasında hesaplanmış embedding) tekrar encode edilmez.
     """
-    # Kullanıcının rolüne atanmış ve modeli aktif olan paketleri bul
-    allowed_packages = GptPackage.objects.filter(
-        allowed_roles=user_profile.role,
-        model__is_active=True
-    ).distinct()
-    if not allowed_packages.exists():
+    # Rolün paketleri process içi cache'ten gelir (signal ile invalidate edilir); ORM sorgusu yapılmaz
+    allowed_packages = package_access.allowed_packages_for_role(getattr(user_profile, "role_id", None))
+    if not allowed_packages:
         return None, 0.0
 
-    # Qdrant'ta sadece bu paketler arasında arama yapmak için filtre uygula
-    # Qdrant payload'unda gpt_package_id var, allowed_packages'ın id'leriyle filtrele
-    allowed_ids = set(str(pkg.id) for pkg in allowed_packages)
-    query_embedding = get_embedding(user_input)
-    search_result = qdrant_client.search(
-        collection_name="gpt_packages",
-        query_vector=query_embedding,
-        limit=5,  # Birden fazla döndürüp ilk uygun olanı seçmek için
-        with_payload=True
-    )
-    for result in search_result:
-        payload = result.payload
-        gpt_package_id = payload.get("gpt_package_id")
-        if gpt_package_id in allowed_ids:
-            score = result.score
-            pkg = allowed_packages.filter(id=gpt_package_id).first()
+    query_embedding = get_embedding(user_input) if query_vector is None else query_vector
+    # Önce process içi index (ağ isteği yok); yüklenemezse Qdrant
+    hits = package_index.search(query_embedding, allowed_ids=allowed_packages, limit=1)
+    if hits is None:
+        # Erişim filtresi Qdrant'ta uygulanır (MatchAny); sonuç sıralamasından bağımsız olarak
+        # izin verilen paketler arasındaki en iyi eşleşme tek aramada döner
+        search_result = search_qdrant(
+            "gpt_packages",
+            filter={"gpt_package_id": list(allowed_packages)},
+            limit=1,
+            query_vector=query_embedding
+        )
+        hits = [(result.payload.get("gpt_package_id"), result.score) for result in search_result]
+    for gpt_package_id, score in hits:
+        pkg = allowed_packages.get(gpt_package_id)
+        if pkg is not None:
             return pkg, score
     return None, 0.0
 
-def get_embedding(text: str) -> list:
+def get_embedding(text: str) -> np.ndarray:
     """
     Given a text string, returns its embedding vector using the sentence transformer model.
     
@@ -52,68 +729,513 @@ def get_embedding(text: str) -> list:
         text (str): Input text to generate embedding for
         
     Returns:
-        list: Embedding vector as a list of floats
+        np.ndarray: float32 embedding vector
+    """
+    return get_embeddings([text])[0]
+
+def get_embeddings(texts: list) -> np.ndarray:
+    """
+    Encodes a list of texts with a single model call.
+    
+    Args:
+        texts (list): Input texts to generate embeddings for
+        
+    Returns:
+        np.ndarray: float32 array of shape (len(texts), dim), rows in input order
+    """
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    keys = [make_key(_EMBEDDING_CACHE_NAMESPACE, t) for t in texts]
+    cached = _embedding_cache.get_many(dict.fromkeys(keys))
+    # Cache'te olmayan metinleri (tekrarlar bir kez olacak şekilde) tek çağrıda encode et
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in cached and key not in missing:
+            missing[key] = text
+    if missing:
+        vectors = _encode_texts(list(missing.values()))
+        new_items = list(zip(missing.keys(), vectors))
+        _embedding_cache.put_many(new_items)
+        cached.update(new_items)
+    return np.stack([cached[key] for key in keys])
+
+def embedding_cache_stats() -> dict:
+    """
+    Returns hit/miss counters of the embedding cache.
+    """
+    return _embedding_cache.stats()
+
+_embedding_batcher = EmbeddingBatcher(
+    get_embeddings,
+    max_batch_size=EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=EMBEDDING_BATCH_MAX_WAIT_MS
+)
+
+async def aget_embedding(text: str) -> np.ndarray:
+    """
+    Async variant of get_embedding. Concurrent calls (e.g. from many websocket sessions)
+    are coalesced by the micro-batcher into a single encode() call.
+    
+    Args:
+        text (str): Input text to generate embedding for
+        
+    Returns:
+        np.ndarray: float32 embedding vector
+    """
+    cached = _embedding_cache.get(make_key(_EMBEDDING_CACHE_NAMESPACE, text), memory_only=True)
+    if cached is not None:
+        return cached
+    return await _embedding_batcher.embed(text)
+
+async def aget_embeddings(texts: list) -> np.ndarray:
+    """
+    Async variant of get_embeddings, routed through the micro-batcher.
     """
-    return _embedding_model.encode(text).tolist()
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack(await _embedding_batcher.embed_many(list(texts)))
 
-def add_to_qdrant(collection_name: str, text: str, payload: dict, context_type: str = "summary") -> bool:
+def add_to_qdrant(collection_name: str, text: str, payload: dict, context_type: str = "summary", vector=None, point_id: str = None) -> bool:
     """
     Add a text and its associated payload to specified Qdrant collection.
     context_type: summary, full, etc.
+    vector: precomputed embedding (numpy array); `text` is embedded only when it is not given.
+    point_id: point ID; defaults to payload["id"]. IDs Qdrant does not accept are mapped to a UUIDv5,
+    and without any ID the point ID is derived from the content hash.
     """
     try:
-        embedding = get_embedding(text)
-        payload = dict(payload)
-        payload["context_type"] = context_type
-        qdrant_client.upsert(
+        if collection_name in QDRANT_COLLECTIONS:
+            ensure_collection_exists(collection_name)
+        embedding = get_embedding(text) if vector is None else vector
+        _with_layout_retry(collection_name, lambda: get_qdrant_client().upsert(
             collection_name=collection_name,
-            points=[
-                qdrant_models.PointStruct(
-                    id=payload.get("id", str(hash(text))), 
-                    vector=embedding,
-                    payload=payload
-                )
-            ]
-        )
+            points=[_build_point(collection_name, text, payload, context_type, embedding, point_id)]
+        ))
+        return True
+    except Exception as e:
+        print(f"Error adding to Qdrant: {e}")
+        return False
+
+async def aadd_to_qdrant(collection_name: str, text: str, payload: dict, context_type: str = "summary", vector=None, point_id: str = None) -> bool:
+    """
+    Async variant of add_to_qdrant using the pooled AsyncQdrantClient.
+    The text is embedded through the micro-batcher when no vector is given.
+    """
+    try:
+        if collection_name in QDRANT_COLLECTIONS:
+            await aensure_collection_exists(collection_name)
+        embedding = await aget_embedding(text) if vector is None else vector
+        await _awith_layout_retry(collection_name, lambda: get_async_qdrant_client().upsert(
+            collection_name=collection_name,
+            points=[_build_point(collection_name, text, payload, context_type, embedding, point_id)]
+        ))
         return True
     except Exception as e:
         print(f"Error adding to Qdrant: {e}")
         return False
 
-def search_qdrant(collection_name: str, text: str = None, filter: dict = None, limit: int = 10) -> list:
+def upsert_points(collection_name: str, ids: list, vectors, payloads: List[dict], batch_size: int = None, parallel: int = None, texts: list = None) -> bool:
+    """
+    Bulk upsert of points with precomputed vectors. Nothing is embedded here.
+    In hybrid collections the sparse vector is computed from `texts`, which is required there.
+    
+    Args:
+        collection_name (str): Name of the Qdrant collection
+        ids (list): Point IDs
+        vectors: float32 array of shape (n, dim), or a list of 1-D arrays
+        payloads (list): Payload dict per point
+        batch_size (int, optional): Points per request (default QDRANT_UPSERT_BATCH_SIZE)
+        parallel (int, optional): Number of batches sent concurrently (default QDRANT_UPSERT_PARALLEL)
+        texts (list, optional): Source text per point, for the sparse vector of hybrid collections
+        
+    Returns:
+        bool: True if every batch was written, False otherwise
+    """
+    if not (len(ids) == len(vectors) == len(payloads)):
+        raise ValueError("ids, vectors and payloads must have the same length")
+    if texts is not None and len(texts) != len(ids):
+        raise ValueError("texts must have the same length as ids")
+    if not len(ids):
+        return True
+    batch_size = batch_size or QDRANT_UPSERT_BATCH_SIZE
+    parallel = parallel or QDRANT_UPSERT_PARALLEL
+    client = get_qdrant_client()
+
+    def write_batch(start: int):
+        end = start + batch_size
+        batch_vectors = vectors[start:end]
+        if isinstance(batch_vectors, np.ndarray):
+            wire_vectors = batch_vectors.astype(np.float32, copy=False).tolist()
+        else:
+            wire_vectors = [to_qdrant_vector(v) for v in batch_vectors]
+        if collection_name in _hybrid_collections:
+            if texts is None:
+                raise ValueError(f"texts are required for hybrid collection {collection_name}")
+            # Batch'te isimli vektörler sütun halinde verilir: {ad: [nokta başına vektör]}
+            wire_vectors = {
+                DENSE_VECTOR: wire_vectors,
+                SPARSE_VECTOR: [sparse_document_vector(collection_name, text) for text in texts[start:end]],
+            }
+        client.upsert(
+            collection_name=collection_name,
+            points=qdrant_models.Batch(
+                ids=list(ids[start:end]),
+                vectors=wire_vectors,
+                payloads=list(payloads[start:end])
+            ),
+            wait=True
+        )
+
+    starts = range(0, len(ids), batch_size)
+    try:
+        if collection_name in QDRANT_COLLECTIONS:
+            ensure_collection_exists(collection_name)
+        if parallel > 1 and len(starts) > 1:
+            with ThreadPoolExecutor(max_workers=min(parallel, len(starts))) as executor:
+                # list() ile tüketilir ki batch'lerden birindeki hata buraya yükselsin
+                list(executor.map(lambda start: _with_layout_retry(collection_name, lambda: write_batch(start)), starts))
+        else:
+            for start in starts:
+                _with_layout_retry(collection_name, lambda: write_batch(start))
+        return True
+    except Exception as e:
+        print(f"Error bulk upserting to Qdrant ({collection_name}, {len(ids)} points): {e}")
+        return False
+
+def upsert_if_changed(collection_name: str, ids: list, contents: list, payloads: List[dict], encode_fn=None) -> dict:
+    """
+    Idempotent upsert: embeds and writes only the points whose content or payload changed.
+    
+    The content hash is stored in each payload. One batched retrieve (payload only, no vectors)
+    reads the stored state. Unchanged points then cost no embedding and no write. Points whose
+    payload alone changed get a payload overwrite without re-embedding.
+    
+    Args:
+        collection_name (str): Name of the Qdrant collection
+        ids (list): Point IDs (see make_point_id)
+        contents (list): Texts (or raw bytes for images) to embed
+        payloads (list): Payload dict per point
+        encode_fn (callable, optional): contents -> float32 array, or (array, kept indices) when some
+            contents cannot be encoded; defaults to get_embeddings
+        
+    Returns:
+        dict: {"written", "payload_only", "unchanged", "ok", "dropped_ids"}; dropped_ids are the points
+            whose content encode_fn could not encode (nothing was written for them)
+    """
+    if not (len(ids) == len(contents) == len(payloads)):
+        raise ValueError("ids, contents and payloads must have the same length")
+    stats = {"written": 0, "payload_only": 0, "unchanged": 0, "ok": True, "dropped_ids": []}
+    if not ids:
+        return stats
+    encode_fn = encode_fn or get_embeddings
+    payloads = [{**payload, "content_hash": content_hash(content)} for payload, content in zip(payloads, contents)]
+
+    try:
+        if collection_name in QDRANT_COLLECTIONS:
+            ensure_collection_exists(collection_name)
+        hybrid = collection_name in _hybrid_collections
+        stored = {}
+        # Hibrit koleksiyonlarda sparse vektörün terimleri de okunur: taşınmış (migrate_collection) bir koleksiyonda
+        # sparse vektörü olmayan ya da terimleri güncel tokenizer'ın ürettiğinden farklı olan (tokenizer değişikliği)
+        # noktalar içerikleri aynı olsa da yeniden yazılır
+        stored_terms = {}
+        for point in get_qdrant_client().retrieve(
+            collection_name=collection_name,
+            ids=list(ids),
+            with_payload=True,
+            with_vectors=[SPARSE_VECTOR] if hybrid else False
+        ):
+            stored[str(point.id)] = point.payload or {}
+            if hybrid:
+                sparse = (point.vector or {}).get(SPARSE_VECTOR)
+                stored_terms[str(point.id)] = set(sparse.indices) if sparse is not None else None
+    except Exception as e:
+        print(f"Error reading stored points from Qdrant ({collection_name}): {e}")
+        stored, stored_terms = {}, {}
+
+    def sparse_stale(pid, content) -> bool:
+        if str(pid) not in stored_terms:
+            return False
+        terms = stored_terms[str(pid)]
+        if terms is None:
+            return True
+        return isinstance(content, str) and terms != set(sparse_document_vector(collection_name, content).indices)
+
+    to_write, payload_only = [], []
+    for i, (pid, payload) in enumerate(zip(ids, payloads)):
+        current = stored.get(str(pid))
+        if current is None or current.get("content_hash") != payload["content_hash"] or sparse_stale(pid, contents[i]):
+            to_write.append(i)
+        elif payload_digest(current) != payload_digest(payload):
+            payload_only.append(i)
+        else:
+            stats["unchanged"] += 1
+
+    if payload_only:
+        try:
+            get_qdrant_client().batch_update_points(
+                collection_name=collection_name,
+                update_operations=[
+                    qdrant_models.OverwritePayloadOperation(
+                        overwrite_payload=qdrant_models.SetPayload(payload=payloads[i], points=[ids[i]])
+                    ) for i in payload_only
+                ],
+                wait=True
+            )
+            stats["payload_only"] = len(payload_only)
+        except Exception as e:
+            print(f"Error updating Qdrant payloads ({collection_name}): {e}")
+            stats["ok"] = False
+
+    if to_write:
+        encoded = encode_fn([contents[i] for i in to_write])
+        if isinstance(encoded, tuple):
+            vectors, kept = encoded
+            kept_set = set(kept)
+            stats["dropped_ids"] = [ids[i] for k, i in enumerate(to_write) if k not in kept_set]
+            to_write = [to_write[k] for k in kept]
+        else:
+            vectors = encoded
+        if to_write:
+            ok = upsert_points(
+                collection_name,
+                ids=[ids[i] for i in to_write],
+                vectors=vectors,
+                payloads=[payloads[i] for i in to_write],
+                texts=[contents[i] if isinstance(contents[i], str) else "" for i in to_write]
+            )
+            stats["written"] = len(to_write) if ok else 0
+            stats["ok"] = stats["ok"] and ok
+    return stats
+
+def _build_point(collection_name: str, text: str, payload: dict, context_type: str, embedding, point_id: str = None):
+    payload = dict(payload)
+    payload["context_type"] = context_type
+    payload["content_hash"] = content_hash(text)
+    # Qdrant yalnızca UUID ve pozitif tamsayı ID kabul eder; diğer ID'ler deterministik UUIDv5'e çevrilir
+    pid = point_id or payload.get("id")
+    if pid is None:
+        # ID verilmemişse içerikten türetilir: aynı içerik aynı noktaya yazılır
+        pid = make_point_id(collection_name, payload["content_hash"])
+    elif not _is_valid_point_id(pid):
+        pid = make_point_id(collection_name, pid)
+    return qdrant_models.PointStruct(
+        id=pid,
+        vector=_wire_vector(collection_name, embedding, text),
+        payload=payload
+    )
+
+def _build_filter(filter: dict = None):
+    if not filter:
+        return None
+    # Liste/küme değerler "herhangi biri" (MatchAny), {"gte": ..., "lt": ...} gibi dict değerler aralık (Range) koşulu olur
+    conditions = []
+    for k, v in filter.items():
+        if isinstance(v, dict):
+            conditions.append(qdrant_models.FieldCondition(key=k, range=qdrant_models.Range(**v)))
+        elif isinstance(v, (list, tuple, set, frozenset)):
+            conditions.append(qdrant_models.FieldCondition(key=k, match=qdrant_models.MatchAny(any=list(v))))
+        else:
+            conditions.append(qdrant_models.FieldCondition(key=k, match=qdrant_models.MatchValue(value=v)))
+    return qdrant_models.Filter(must=conditions)
+
+def _query_request(collection_name: str, text: str, query_vector, filter: dict, limit: int, mode: str) -> dict:
+    """
+    query_points() keyword arguments for a dense or hybrid (dense + sparse, RRF-fused) search.
+    """
+    hybrid = collection_name in _hybrid_collections
+    if mode is None:
+        mode = "hybrid" if hybrid and text else "dense"
+    if mode not in ("dense", "hybrid"):
+        raise ValueError(f"Unknown search mode: {mode}")
+    request = {
+        "collection_name": collection_name,
+        "query_filter": _build_filter(filter),
+        "limit": limit,
+        "search_params": _search_params(collection_name),
+        "with_payload": True,
+    }
+    if mode == "dense" or not hybrid or not text:
+        request["query"] = to_qdrant_vector(query_vector)
+        if hybrid:
+            request["using"] = DENSE_VECTOR
+        return request
+    indices, values = sparse_encoder.encode_query(text)
+    # Her iki aday listesi de filtreyle toplanır, ardından sıralamalar Reciprocal Rank Fusion ile birleştirilir
+    prefetch_limit = max(limit * QDRANT_HYBRID_PREFETCH_FACTOR, 20)
+    request["prefetch"] = [
+        qdrant_models.Prefetch(
+            query=to_qdrant_vector(query_vector),
+            using=DENSE_VECTOR,
+            filter=request["query_filter"],
+            params=request["search_params"],
+            limit=prefetch_limit
+        ),
+        qdrant_models.Prefetch(
+            query=qdrant_models.SparseVector(indices=indices, values=values),
+            using=SPARSE_VECTOR,
+            filter=request["query_filter"],
+            limit=prefetch_limit
+        ),
+    ]
+    request["query"] = qdrant_models.FusionQuery(fusion=qdrant_models.Fusion.RRF)
+    del request["search_params"]
+    return request
+
+def search_qdrant(collection_name: str, text: str = None, filter: dict = None, limit: int = 10, query_vector=None, mode: str = None) -> list:
     """
     Search specified Qdrant collection using text embedding and/or metadata filters.
     
     Args:
         collection_name (str): Name of the Qdrant collection
         text (str, optional): Text to search by similarity
-        filter (dict, optional): Metadata filters to apply
+        filter (dict, optional): Metadata filters to apply; list values match any of the given values
         limit (int): Maximum number of results to return
+        query_vector (np.ndarray, optional): Precomputed embedding of `text`; skips re-embedding
+        mode (str, optional): "dense" or "hybrid" (dense + BM25 sparse, fused with RRF). Defaults to
+            "hybrid" for collections with sparse vectors when `text` is given, "dense" otherwise.
+            Hybrid scores are RRF rank scores, not cosine similarities.
         
     Returns:
         list: List of search results with scores and payloads
     """
-    query_vector = get_embedding(text) if text else None
-    
-    filter_condition = None
-    if filter:
-        filter_condition = qdrant_models.Filter(
-            must=[
-                qdrant_models.FieldCondition(
-                    key=k,
-                    match=qdrant_models.MatchValue(value=v)
-                ) for k, v in filter.items()
-            ]
-        )
+    if collection_name in QDRANT_COLLECTIONS:
+        ensure_collection_exists(collection_name)
+    if query_vector is None and text:
+        query_vector = get_embedding(text)
     
-    results = qdrant_client.search(
-        collection_name=collection_name,
-        query_vector=query_vector,
-        query_filter=filter_condition,
-        limit=limit,
+    results = _with_layout_retry(collection_name, lambda: get_qdrant_client().query_points(
+        **_query_request(collection_name, text, query_vector, filter, limit, mode)
+    )).points
+    
+    return results
+
+async def asearch_qdrant(collection_name: str, text: str = None, filter: dict = None, limit: int = 10, query_vector=None, mode: str = None) -> list:
+    """
+    Async variant of search_qdrant. Runs on the event loop without occupying an executor thread.
+    """
+    if collection_name in QDRANT_COLLECTIONS:
+        await aensure_collection_exists(collection_name)
+    if query_vector is None and text:
+        query_vector = await aget_embedding(text)
+    response = await _awith_layout_retry(collection_name, lambda: get_async_qdrant_client().query_points(
+        **_query_request(collection_name, text, query_vector, filter, limit, mode)
+    ))
+    return response.points
+
+def _batch_query(request: dict):
+    # query_points() argümanlarını query_batch_points() içindeki tek bir QueryRequest'e çevirir
+    return qdrant_models.QueryRequest(
+        prefetch=request.get("prefetch"),
+        query=request["query"],
+        using=request.get("using"),
+        filter=request["query_filter"],
+        params=request.get("search_params"),
+        limit=request["limit"],
         with_payload=True
     )
+
+def _plan_search_many(searches: List[dict], vectors: dict) -> dict:
+    """
+    Groups the searches by collection: {collection: [(position, search, query_vector), ...]}.
+    """
+    by_collection = {}
+    for position, search in enumerate(searches):
+        query_vector = search.get("query_vector")
+        if query_vector is None:
+            query_vector = vectors[search["text"]]
+        by_collection.setdefault(search["collection"], []).append((position, search, query_vector))
+    return by_collection
+
+def _batch_requests(planned: list) -> list:
+    # İstekler gönderim anında kurulur ki koleksiyon düzeni değiştiğinde tekrar denemede güncel düzen kullanılsın
+    return [
+        _batch_query(_query_request(
+            search["collection"],
+            search.get("text"),
+            query_vector,
+            search.get("filter"),
+            search.get("limit", 10),
+            search.get("mode")
+        ))
+        for _, search, query_vector in planned
+    ]
+
+def _texts_to_embed(searches: List[dict]) -> list:
+    for search in searches:
+        if search.get("query_vector") is None and not search.get("text"):
+            raise ValueError(f"search on {search['collection']} needs a text or a query_vector")
+    return list(dict.fromkeys(s["text"] for s in searches if s.get("query_vector") is None))
+
+def search_many(searches: List[dict]) -> List[list]:
+    """
+    Runs several independent searches with one embedding call and one Qdrant request per collection.
     
+    All query texts are embedded in a single batch (duplicates once). The searches on each collection
+    go out as one query_batch_points() request; different collections are queried concurrently.
+    
+    Args:
+        searches (list): One dict per search with the keyword arguments of search_qdrant:
+            "collection" (required), "text", "filter", "limit", "query_vector", "mode"
+        
+    Returns:
+        list: One result list per search, in the order of `searches`
+    """
+    if not searches:
+        return []
+    texts = _texts_to_embed(searches)
+    for collection_name in {s["collection"] for s in searches}:
+        if collection_name in QDRANT_COLLECTIONS:
+            ensure_collection_exists(collection_name)
+    vectors = dict(zip(texts, get_embeddings(texts))) if texts else {}
+    by_collection = _plan_search_many(searches, vectors)
+    client = get_qdrant_client()
+
+    def run(collection_name: str):
+        planned = by_collection[collection_name]
+        responses = _with_layout_retry(collection_name, lambda: client.query_batch_points(
+            collection_name=collection_name,
+            requests=_batch_requests(planned)
+        ))
+        return [(position, response.points) for (position, _, _), response in zip(planned, responses)]
+
+    results = [None] * len(searches)
+    if len(by_collection) > 1:
+        with ThreadPoolExecutor(max_workers=len(by_collection)) as executor:
+            batches = list(executor.map(run, by_collection))
+    else:
+        batches = [run(name) for name in by_collection]
+    for batch in batches:
+        for position, points in batch:
+            results[position] = points
+    return results
+
+async def asearch_many(searches: List[dict]) -> List[list]:
+    """
+    Async variant of search_many. Texts go through the micro-batcher; collections are queried with asyncio.gather.
+    """
+    if not searches:
+        return []
+    texts = _texts_to_embed(searches)
+    for collection_name in {s["collection"] for s in searches}:
+        if collection_name in QDRANT_COLLECTIONS:
+            await aensure_collection_exists(collection_name)
+    vectors = dict(zip(texts, await aget_embeddings(texts))) if texts else {}
+    by_collection = _plan_search_many(searches, vectors)
+    client = get_async_qdrant_client()
+
+    async def run(collection_name: str):
+        planned = by_collection[collection_name]
+        responses = await _awith_layout_retry(collection_name, lambda: client.query_batch_points(
+            collection_name=collection_name,
+            requests=_batch_requests(planned)
+        ))
+        return [(position, response.points) for (position, _, _), response in zip(planned, responses)]
+
+    results = [None] * len(searches)
+    for batch in await asyncio.gather(*(run(name) for name in by_collection)):
+        for position, points in batch:
+            results[position] = points
     return results
 
 def update_qdrant_metadata(collection_name: str, point_id: str, payload: dict) -> bool:
@@ -129,7 +1251,51 @@ def update_qdrant_metadata(collection_name: str, point_id: str, payload: dict) -
         bool: True if successful, False otherwise
     """
     try:
-        qdrant_client.set_payload(
+        get_qdrant_client().set_payload(
+            collection_name=collection_name,
+            payload=payload,
+            points=[point_id]
+        )
+        return True
+    except Exception as e:
+        print(f"Error updating Qdrant metadata: {e}")
+        return False
+
+def bulk_update_qdrant_metadata(collection_name: str, point_ids: list, payload: dict) -> bool:
+    """
+    Sets the same payload keys on many points with a single request. Nothing is re-embedded.
+    Points that do not exist (yet) are ignored instead of failing the request.
+    
+    Args:
+        collection_name (str): Name of the Qdrant collection
+        point_ids (list): IDs of the points to update
+        payload (dict): Payload keys to set
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not point_ids:
+        return True
+    try:
+        get_qdrant_client().set_payload(
+            collection_name=collection_name,
+            payload=payload,
+            points=qdrant_models.FilterSelector(
+                filter=qdrant_models.Filter(must=[qdrant_models.HasIdCondition(has_id=list(point_ids))])
+            ),
+            wait=True
+        )
+        return True
+    except Exception as e:
+        print(f"Error bulk updating Qdrant metadata ({collection_name}, {len(point_ids)} points): {e}")
+        return False
+
+async def aupdate_qdrant_metadata(collection_name: str, point_id: str, payload: dict) -> bool:
+    """
+    Async variant of update_qdrant_metadata.
+    """
+    try:
+        await get_async_qdrant_client().set_payload(
             collection_name=collection_name,
             payload=payload,
             points=[point_id]
@@ -151,7 +1317,70 @@ def delete_from_qdrant(collection_name: str, point_ids: list) -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        qdrant_client.delete(
+        get_qdrant_client().delete(
+            collection_name=collection_name,
+            points_selector=qdrant_models.PointIdsList(
+                points=point_ids
+            )
+        )
+        return True
+    except Exception as e:
+        print(f"Error deleting from Qdrant: {e}")
+        return False
+
+def delete_where(collection_name: str, filter: dict) -> bool:
+    """
+    Delete every point matching the metadata filter (same format as search_qdrant) in one request.
+    
+    Args:
+        collection_name (str): Name of the Qdrant collection
+        filter (dict): Metadata filter; must not be empty
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not filter:
+        raise ValueError("delete_where requires a non-empty filter")
+    try:
+        if collection_name in QDRANT_COLLECTIONS:
+            ensure_collection_exists(collection_name)
+        get_qdrant_client().delete(
+            collection_name=collection_name,
+            points_selector=qdrant_models.FilterSelector(filter=_build_filter(filter))
+        )
+        return True
+    except Exception as e:
+        print(f"Error deleting from Qdrant by filter: {e}")
+        return False
+
+def iter_point_ids(collection_name: str, filter: dict, batch_size: int = 256):
+    """
+    Yields the IDs of the points matching the metadata filter, one page (list of str) at a time.
+    Only IDs are read (no payload, no vectors).
+    """
+    if collection_name in QDRANT_COLLECTIONS:
+        ensure_collection_exists(collection_name)
+    offset = None
+    while True:
+        points, offset = get_qdrant_client().scroll(
+            collection_name=collection_name,
+            scroll_filter=_build_filter(filter),
+            limit=batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        if points:
+            yield [str(point.id) for point in points]
+        if offset is None:
+            return
+
+async def adelete_from_qdrant(collection_name: str, point_ids: list) -> bool:
+    """
+    Async variant of delete_from_qdrant.
+    """
+    try:
+        await get_async_qdrant_client().delete(
             collection_name=collection_name,
             points_selector=qdrant_models.PointIdsList(
                 points=point_ids
@@ -0,0 +1,26 @@
+# hexense_core/signals.py
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from hexense_core import package_access
+from hexense_core.models import GptModel, GptPackage, GptPackageGroup, Role, gpt_package_vector_changed
+from hexense_core.package_index import package_index
+
+
+def connect_signals():
+    # Rol → paket erişim cache'i: paket, rol ataması, rol, model ve grup değişikliklerinde temizlenir.
+    # Cache'teki paketler model ve group'u select_related ile taşıdığından bu ikisinin kaydı da eski kopyayı bayatlatır.
+    for sender in (GptPackage, Role, GptModel, GptPackageGroup):
+        post_save.connect(package_access.invalidate, sender=sender, dispatch_uid=f"package_access_save_{sender.__name__}")
+        post_delete.connect(package_access.invalidate, sender=sender, dispatch_uid=f"package_access_delete_{sender.__name__}")
+    m2m_changed.connect(
+        package_access.invalidate,
+        sender=GptPackage.allowed_roles.through,
+        dispatch_uid="package_access_allowed_roles"
+    )
+    # Process içi paket vektör index'i: Qdrant'taki vektör yazıldıktan/silindikten sonra yeniden yüklenir
+    gpt_package_vector_changed.connect(
+        package_index.invalidate,
+        sender=GptPackage,
+        dispatch_uid="package_index_vector_changed"
+    )
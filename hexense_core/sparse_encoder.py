@@ -0,0 +1,79 @@
+# hexense_core/sparse_encoder.py
+
+"""
+BM25 tarzı sparse vektörler (hibrit arama için dense vektörün yanında).
+
+Dense MiniLM vektörleri sipariş numarası, ürün kodu veya özel isim gibi birebir eşleşmesi gereken
+terimleri kaçırabilir. Bu modül metni terimlere ayırır ve her terim için BM25'in terim frekansı
+bileşenini (k1 doygunluğu ve doküman uzunluğu normalizasyonu) hesaplar; IDF bileşenini Qdrant
+sparse vektör ayarındaki IDF modifier'ı koleksiyon istatistiklerinden uygular.
+
+Terim indeksleri terimin crc32 özetidir; sözlük tutulmaz, her process aynı indeksi üretir.
+"""
+
+import re
+import zlib
+from collections import Counter
+from typing import List, Tuple
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# "PRD-00012", "v2.1", "TR_34" gibi ayraçlı kodlar tek terim olarak da tutulur
+_TOKEN_RE = re.compile(r"\w+(?:[-./_]\w+)*", re.UNICODE)
+_PART_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _lower(text: str) -> str:
+    # I/ı ve İ/i aynı terime indirgenir: doküman ve sorgu hangi klavye/dil ile yazılmış olursa olsun
+    # "INV-2024" ile "inv-2024" (ya da "İSTANBUL" ile "istanbul") aynı indeksi üretir.
+    # casefold() İ'yi "i" + birleşik üst nokta (U+0307) yapar; nokta atılır.
+    return text.casefold().replace("ı", "i").replace("\u0307", "")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Metni küçük harfli terimlere ayırır. Ayraçlı kodlar hem bütün olarak hem de parçalarıyla döner.
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(_lower(text or "")):
+        token = match.group(0)
+        tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(part for part in _PART_RE.findall(token) if part != token)
+    return tokens
+
+
+def _index(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def encode_document(text: str, avg_doc_length: float) -> Tuple[List[int], List[float]]:
+    """
+    Doküman için BM25 terim ağırlıklarını döndürür.
+
+    Args:
+        text (str): Doküman metni
+        avg_doc_length (float): Koleksiyondaki ortalama doküman uzunluğu (terim sayısı)
+
+    Returns:
+        tuple: (terim indeksleri, ağırlıklar)
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return [], []
+    length_norm = 1 - BM25_B + BM25_B * len(tokens) / max(avg_doc_length, 1.0)
+    weights = {}
+    for token, tf in Counter(tokens).items():
+        index = _index(token)
+        # crc32 çakışmasında ağırlıklar toplanır
+        weights[index] = weights.get(index, 0.0) + tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+    return list(weights), list(weights.values())
+
+
+def encode_query(text: str) -> Tuple[List[int], List[float]]:
+    """
+    Sorgu için sparse vektör: her farklı terim 1.0 ağırlıklıdır (IDF Qdrant'ta uygulanır).
+    """
+    indices = sorted({_index(token) for token in tokenize(text)})
+    return indices, [1.0] * len(indices)
@@ -0,0 +1,152 @@
+# hexense_core/table_extract.py
+
+"""
+CSV/XLSX dosyalarının akış halinde (streaming) okunması ve satır aralığı chunk'larına bölünmesi.
+
+Dosya tamamen belleğe alınmaz: CSV pandas `chunksize` bloklarıyla, XLSX openpyxl read-only
+modunda satır satır okunur. Her blokta satırlar "kolon: değer, kolon: değer" formatına vektörize
+string işlemleriyle (iterrows olmadan) çevrilir ve sabit satır sayılı chunk'lar hemen döndürülür.
+Bellek kullanımı dosya boyutundan bağımsız olarak blok boyutuyla sınırlıdır.
+
+Değerler dosyadaki metin olarak kullanılır (dtype=str); boş hücreler boş string olur.
+"""
+
+from typing import Iterator, List, Tuple
+
+TABLE_READ_BLOCK_ROWS = 50000
+TABLE_CHUNK_ROWS = 10
+
+
+def _format_rows(df) -> List[str]:
+    """
+    DataFrame satırlarını "kolon: değer, ..." satırlarına çevirir (kolon başına tek vektörize işlem).
+    """
+    if df.empty:
+        return []
+    columns = list(df.columns)
+    # Eksik hücreler (None/NaN) string birleştirmede NaN üretir; boş string olarak yazılır
+    df = df.fillna("")
+    rows = f"{columns[0]}: " + df[columns[0]]
+    for column in columns[1:]:
+        rows = rows + f", {column}: " + df[column]
+    return rows.tolist()
+
+
+def _iter_csv_blocks(file, block_rows: int):
+    import pandas as pd
+    reader = pd.read_csv(file, chunksize=block_rows, dtype=str, keep_default_na=False)
+    with reader:
+        for block in reader:
+            yield block
+
+
+def _dedupe_columns(columns: List[str], unnamed: List[int] = ()) -> List[str]:
+    """
+    Tekrarlanan kolon adlarını pandas.read_excel gibi numaralandırır: a, a, b -> a, a.1, b.
+    Başlıkta zaten bulunan bir ad (ör. a.1) atlanır: a, a, a.1 -> a, a.2, a.1.
+    pandas gibi önce adı olan kolonlar, sonra "Unnamed: N" kolonları (unnamed indeksleri) işlenir.
+    """
+    existing = set(columns)
+    counts = {}
+    result = list(columns)
+    order = [i for i in range(len(columns)) if i not in unnamed] + list(unnamed)
+    for i in order:
+        column = columns[i]
+        count = counts.get(column, 0)
+        if count > 0:
+            base = column
+            while f"{base}.{count}" in existing:
+                count += 1
+            counts[base] = count + 1
+            column = f"{base}.{count}"
+            existing.add(column)
+        counts[column] = counts.get(column, 0) + 1
+        result[i] = column
+    return result
+
+
+def _iter_xlsx_blocks(file, block_rows: int):
+    import openpyxl
+    import pandas as pd
+    # read_only: satırlar açıldıkça okunur, tüm çalışma sayfası belleğe alınmaz
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = list(header)
+        while header and header[-1] is None:
+            header.pop()
+        names = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+        unnamed = [i for i, c in enumerate(header) if c is None]
+        columns = _dedupe_columns(names, unnamed)
+        buffer = []
+        for row in rows:
+            # read-only modda satırlar farklı uzunlukta gelebilir; eksik hücreler boş string ile tamamlanır
+            values = ["" if value is None else str(value) for value in row]
+            while len(values) > len(columns) and values[-1] == "":
+                values.pop()
+            if len(values) > len(columns):
+                # Başlıktan uzun satırların hücreleri atılmaz: pandas.read_excel gibi "Unnamed: N" kolonları eklenir.
+                # Akış halinde okunduğu için yeni kolonlar bu bloktaki önceki satırlara boş olarak eklenir,
+                # daha önce döndürülmüş bloklara eklenmez.
+                unnamed += list(range(len(names), len(values)))
+                names += [f"Unnamed: {i}" for i in range(len(names), len(values))]
+                columns = _dedupe_columns(names, unnamed)
+                for buffered in buffer:
+                    buffered.extend([""] * (len(columns) - len(buffered)))
+            values.extend([""] * (len(columns) - len(values)))
+            buffer.append(values)
+            if len(buffer) >= block_rows:
+                yield pd.DataFrame(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_table_rows(file, ext: str, block_rows: int = TABLE_READ_BLOCK_ROWS) -> Iterator[List[str]]:
+    """
+    Tablonun biçimlendirilmiş satırlarını bloklar halinde döndürür.
+
+    Args:
+        file: Dosya yolu ya da okunabilir dosya nesnesi
+        ext (str): '.csv' ya da '.xlsx'
+        block_rows (int): Bir blokta okunacak en fazla satır
+
+    Returns:
+        Iterator[list]: Her blok için satır metinleri
+    """
+    ext = ext.lower()
+    if ext == '.csv':
+        blocks = _iter_csv_blocks(file, block_rows)
+    elif ext == '.xlsx':
+        blocks = _iter_xlsx_blocks(file, block_rows)
+    else:
+        raise ValueError(f"Unsupported table format: {ext}")
+    for block in blocks:
+        rows = _format_rows(block)
+        if rows:
+            yield rows
+
+
+def iter_table_chunks(file, ext: str, max_rows: int = TABLE_CHUNK_ROWS,
+                      block_rows: int = TABLE_READ_BLOCK_ROWS) -> Iterator[Tuple[List[str], int, int]]:
+    """
+    Tabloyu max_rows satırlık chunk'lar halinde döndürür: (satırlar, başlangıç satırı, bitiş satırı).
+    Satır numaraları 0'dan başlar ve başlık satırını saymaz; chunk sınırları blok boyutundan bağımsızdır.
+    """
+    pending = []
+    start_row = 0
+    for rows in iter_table_rows(file, ext, block_rows=block_rows):
+        pending.extend(rows)
+        full = len(pending) - len(pending) % max_rows
+        for i in range(0, full, max_rows):
+            yield pending[i:i + max_rows], start_row + i, start_row + i + max_rows - 1
+        start_row += full
+        pending = pending[full:]
+    if pending:
+        yield pending, start_row, start_row + len(pending) - 1
+
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from hexense_core import chunking
+from hexense_core.chunking import chunk_text, detect_heading
+
+
+class WordTokenizer:
+    """
+    Her kelimeyi bir token sayan tokenizer; tiktoken encoding'i indirilmeden chunk sınırları test edilir.
+    """
+
+    def encode_ordinary_batch(self, texts):
+        return [text.split() for text in texts]
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def _words(count, prefix="w"):
+    return " ".join(f"{prefix}{i}" for i in range(count))
+
+
+@mock.patch.object(chunking, "get_tokenizer", return_value=WordTokenizer())
+class ChunkTextTests(SimpleTestCase):
+
+    def test_paragraphs_are_packed_up_to_max_tokens(self, _):
+        text = "\n".join([_words(3, "a"), _words(3, "b"), _words(3, "c")])
+        chunks = chunk_text(text, max_tokens=6, overlap_tokens=0)
+
+        self.assertEqual([chunk.tokens for chunk in chunks], [6, 3])
+        self.assertEqual(chunks[0].text, f"{_words(3, 'a')}\n{_words(3, 'b')}")
+        self.assertEqual([index for index, _ in chunks[1].paragraphs], [2])
+
+    def test_long_paragraph_is_split_on_sentences(self, _):
+        text = "Bir iki üç. Dört beş altı. Yedi sekiz."
+        chunks = chunk_text(text, max_tokens=6, overlap_tokens=0)
+
+        self.assertEqual([chunk.text for chunk in chunks], ["Bir iki üç. Dört beş altı.", "Yedi sekiz."])
+        self.assertTrue(all(index == 0 for chunk in chunks for index, _ in chunk.paragraphs))
+
+    def test_long_sentence_is_split_on_tokens(self, _):
+        chunks = chunk_text(_words(10), max_tokens=4, overlap_tokens=0)
+
+        self.assertEqual([chunk.tokens for chunk in chunks], [4, 4, 2])
+        self.assertEqual(" ".join(chunk.text for chunk in chunks), _words(10))
+
+    def test_no_chunk_exceeds_max_tokens_with_overlap(self, _):
+        text = "\n".join(_words(n, f"p{n}_") for n in (2, 5, 3, 9, 1, 4))
+        for overlap in (0, 1, 3):
+            chunks = chunk_text(text, max_tokens=6, overlap_tokens=overlap)
+            self.assertTrue(all(chunk.tokens <= 6 for chunk in chunks), overlap)
+
+    def test_overlap_repeats_the_tail_of_the_previous_chunk(self, _):
+        text = "\n".join(["a0 a1", "b0 b1", "c0 c1"])
+        chunks = chunk_text(text, max_tokens=4, overlap_tokens=2)
+
+        self.assertEqual([chunk.text for chunk in chunks], ["a0 a1\nb0 b1", "b0 b1\nc0 c1"])
+
+    def test_chunks_carry_the_last_heading(self, _):
+        text = "GİRİŞ\nilk paragraf burada.\n2.1 Yöntem\nikinci paragraf burada."
+        chunks = chunk_text(text, max_tokens=5, overlap_tokens=0)
+
+        self.assertEqual([chunk.heading for chunk in chunks], ["GİRİŞ", "2.1 Yöntem"])
+
+    def test_invalid_overlap_and_empty_text(self, _):
+        with self.assertRaises(ValueError):
+            chunk_text("metin", max_tokens=4, overlap_tokens=4)
+        self.assertEqual(chunk_text(" \n\n ", max_tokens=4, overlap_tokens=0), [])
+
+
+class DetectHeadingTests(SimpleTestCase):
+
+    def test_heading_heuristics(self):
+        self.assertEqual(detect_heading("## Kurulum"), "Kurulum")
+        self.assertEqual(detect_heading("BÖLÜM 1"), "BÖLÜM 1")
+        self.assertEqual(detect_heading("2.1 Alt Başlık"), "2.1 Alt Başlık")
+        self.assertIsNone(detect_heading("bu bir cümledir ve başlık değildir."))
@@ -0,0 +1,106 @@
+import importlib.util
+import os
+import tempfile
+from unittest import SkipTest, TestCase, skipUnless
+
+import numpy as np
+
+from hexense_core.embedding_backends import create_backend
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+TEXTS = [
+    "Siparişim ne zaman kargoya verilecek?",
+    "Ürün kodu PRD-00421 için stok durumu nedir?",
+    "Geçen ayki satış raporunu bölge bazında özetle.",
+    "How do I reset my password on the customer portal?",
+    "İade sürecinde hangi belgeler gerekiyor?",
+    "Teşekkürler",
+    "ok",
+    "Bakım kılavuzunda hidrolik pompa değişim adımları nelerdir?",
+    "Please summarize the attached quarterly financial statements.",
+]
+
+_HAS_BACKEND_DEPS = all(
+    importlib.util.find_spec(m) is not None
+    for m in ("torch", "sentence_transformers", "transformers", "onnx", "onnxruntime")
+)
+
+
+def _min_cosine(reference, vectors):
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return float(np.sum(reference * vectors, axis=1).min())
+
+
+@skipUnless(_HAS_BACKEND_DEPS, "torch, sentence-transformers, onnx and onnxruntime are required")
+class OnnxInt8EquivalenceTests(TestCase):
+    """
+    int8 ONNX backend'inin vektörleri PyTorch referansıyla aynı yönü göstermelidir (cosine >= 0.98).
+    Model indirilemiyorsa (ör. ağ yok) test atlanır.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        try:
+            cls.reference = create_backend("sentence_transformers", MODEL_NAME)
+            cls.onnx = create_backend("onnx_int8", MODEL_NAME)
+        except OSError as e:
+            raise SkipTest(f"{MODEL_NAME} is not available: {e}")
+
+    def test_dimension_matches_reference(self):
+        self.assertEqual(self.onnx.dimension, self.reference.dimension)
+
+    def test_cosine_similarity_to_reference(self):
+        reference = self.reference.encode(TEXTS, batch_size=4)
+        vectors = self.onnx.encode(TEXTS, batch_size=4)
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual(vectors.shape, reference.shape)
+        self.assertGreaterEqual(_min_cosine(reference, vectors), 0.98)
+
+    def test_empty_input(self):
+        self.assertEqual(self.onnx.encode([]).shape, (0, self.onnx.dimension))
+
+
+@skipUnless(_HAS_BACKEND_DEPS, "torch, sentence-transformers, onnx and onnxruntime are required")
+class OnnxExportTests(TestCase):
+    """
+    Export/quantize/yükleme zincirini ağ gerektirmeden, yerelde oluşturulan küçük bir BERT ile sınar.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        import torch
+        from transformers import BertConfig, BertModel, BertTokenizerFast
+
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.model_dir = os.path.join(cls._tmp.name, "tiny-bert")
+        os.makedirs(cls.model_dir)
+        vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list("abcçdefgğhıijklmnoöprsştuüvyz0123456789-?.")
+        vocab_path = os.path.join(cls.model_dir, "vocab.txt")
+        with open(vocab_path, "w") as f:
+            f.write("\n".join(vocab))
+        BertTokenizerFast(vocab_path).save_pretrained(cls.model_dir)
+        torch.manual_seed(0)
+        config = BertConfig(vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2, intermediate_size=64)
+        BertModel(config).save_pretrained(cls.model_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+        super().tearDownClass()
+
+    def test_export_matches_reference_and_is_reused(self):
+        onnx_dir = os.path.join(self._tmp.name, "onnx")
+        reference = create_backend("sentence_transformers", self.model_dir)
+        backend = create_backend("onnx_int8", self.model_dir, onnx_dir=onnx_dir)
+        self.assertNotIn("model.onnx", os.listdir(onnx_dir))
+        self.assertFalse([n for n in os.listdir(onnx_dir) if n.startswith(".export-")])
+        self.assertGreaterEqual(_min_cosine(reference.encode(TEXTS), backend.encode(TEXTS)), 0.98)
+
+        model_path = os.path.join(onnx_dir, "model_int8.onnx")
+        mtime = os.stat(model_path).st_mtime_ns
+        create_backend("onnx_int8", self.model_dir, onnx_dir=onnx_dir)
+        self.assertEqual(os.stat(model_path).st_mtime_ns, mtime)
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+from hexense_core.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingEncoder:
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("model yüklenemedi")
+        return [f"vec:{text}" for text in texts]
+
+
+class EmbeddingBatcherTests(TestCase):
+
+    def test_concurrent_requests_share_one_encode_call(self):
+        encoder = RecordingEncoder()
+        batcher = EmbeddingBatcher(encoder, max_batch_size=32, max_wait_ms=20)
+
+        async def run():
+            return await asyncio.gather(*(batcher.embed(text) for text in ["a", "b", "c"]))
+
+        self.assertEqual(asyncio.run(run()), ["vec:a", "vec:b", "vec:c"])
+        self.assertEqual(encoder.calls, [["a", "b", "c"]])
+
+    def test_full_batch_is_flushed_without_waiting(self):
+        encoder = RecordingEncoder()
+        # Bekleme süresi testten uzun; batch yalnızca boyut sınırıyla boşaltılabilir
+        batcher = EmbeddingBatcher(encoder, max_batch_size=2, max_wait_ms=60000)
+
+        async def run():
+            return await asyncio.wait_for(batcher.embed_many(["a", "b", "c", "d"]), timeout=5)
+
+        self.assertEqual(asyncio.run(run()), ["vec:a", "vec:b", "vec:c", "vec:d"])
+        self.assertEqual(encoder.calls, [["a", "b"], ["c", "d"]])
+
+    def test_duplicate_texts_are_encoded_once(self):
+        encoder = RecordingEncoder()
+        batcher = EmbeddingBatcher(encoder, max_batch_size=32, max_wait_ms=5)
+
+        results = asyncio.run(batcher.embed_many(["aynı", "aynı", "farklı"]))
+
+        self.assertEqual(results, ["vec:aynı", "vec:aynı", "vec:farklı"])
+        self.assertEqual(encoder.calls, [["aynı", "farklı"]])
+
+    def test_encode_error_reaches_every_caller(self):
+        batcher = EmbeddingBatcher(RecordingEncoder(fail=True), max_batch_size=32, max_wait_ms=5)
+
+        async def run():
+            return await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+
+        with self.assertLogs("hexense_core.embedding_batcher", level="ERROR"):
+            results = asyncio.run(run())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    def test_batcher_survives_a_new_event_loop(self):
+        encoder = RecordingEncoder()
+        batcher = EmbeddingBatcher(encoder, max_batch_size=32, max_wait_ms=5)
+
+        self.assertEqual(asyncio.run(batcher.embed("a")), "vec:a")
+        self.assertEqual(asyncio.run(batcher.embed("b")), "vec:b")
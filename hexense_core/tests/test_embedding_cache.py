@@ -0,0 +1,74 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from hexense_core.embedding_cache import EmbeddingCache, make_key, normalize_text
+
+
+class KeyTests(TestCase):
+
+    def test_whitespace_and_unicode_form_are_normalized(self):
+        self.assertEqual(normalize_text("  Merhaba \n\t dünya "), "Merhaba dünya")
+        self.assertEqual(make_key("m", "Şu"), make_key("m", "Şu"))
+        self.assertEqual(make_key("m", "a  b"), make_key("m", " a b"))
+
+    def test_case_and_model_are_part_of_the_key(self):
+        self.assertNotEqual(make_key("m", "Ankara"), make_key("m", "ankara"))
+        self.assertNotEqual(make_key("m1", "Ankara"), make_key("m2", "Ankara"))
+
+
+class EmbeddingCacheTests(TestCase):
+
+    def test_memory_tier_is_lru(self):
+        cache = EmbeddingCache(max_entries=2)
+        a, b, c = (make_key("m", text) for text in "abc")
+        cache.put_many([(a, [1.0]), (b, [2.0])])
+        self.assertIsNotNone(cache.get(a))
+        cache.put(c, [3.0])
+
+        self.assertIsNone(cache.get(b))
+        self.assertIsNotNone(cache.get(a))
+        self.assertIsNotNone(cache.get(c))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["memory_entries"]), (3, 1, 2))
+
+    def test_vectors_are_read_only_float32_copies(self):
+        cache = EmbeddingCache()
+        key = make_key("m", "metin")
+        batch = np.arange(6, dtype=np.float64).reshape(2, 3)
+        cache.put(key, batch[0])
+
+        vector = cache.get(key)
+        self.assertEqual(vector.dtype, np.float32)
+        self.assertFalse(vector.flags.writeable)
+        batch[0, 0] = 99
+        self.assertEqual(vector[0], 0.0)
+
+    def test_memory_only_lookup_does_not_count_a_miss(self):
+        cache = EmbeddingCache()
+        self.assertIsNone(cache.get(make_key("m", "yok"), memory_only=True))
+        self.assertEqual(cache.stats()["misses"], 0)
+
+    def test_disk_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "embeddings.sqlite3")
+            key = make_key("m", "kalıcı")
+            EmbeddingCache(disk_path=path).put(key, [0.5, -0.5])
+
+            cache = EmbeddingCache(disk_path=path)
+            self.assertEqual(cache.get(key).tolist(), [0.5, -0.5])
+            self.assertEqual(cache.get(key).tolist(), [0.5, -0.5])
+            self.assertEqual((cache.disk_hits, cache.hits), (1, 1))
+
+            cache.clear(disk=True)
+            self.assertIsNone(cache.get(key))
+
+    def test_disabled_memory_tier_still_uses_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(max_entries=0, disk_path=os.path.join(tmp, "e.sqlite3"))
+            key = make_key("m", "metin")
+            cache.put(key, [1.0])
+            self.assertEqual(cache.get(key).tolist(), [1.0])
+            self.assertEqual(cache.stats()["memory_entries"], 0)
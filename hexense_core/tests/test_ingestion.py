@@ -0,0 +1,168 @@
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+
+import numpy as np
+from django.core.files.base import ContentFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from qdrant_client import QdrantClient
+
+from hexense_core import ingestion, semantic
+from hexense_core.ingestion import JobProgress, JobSuperseded, claim_job, run_job
+from hexense_core.models import GptPackage, GptPackageFile, GptPackageGroup, IngestionJob
+
+
+def _make_files(*names):
+    with mock.patch("hexense_core.semantic.upsert_if_changed", return_value={"ok": True}):
+        group = GptPackageGroup.objects.create(key="docs", name="Dokümanlar")
+        package = GptPackage.objects.create(group=group, key="manuals", name="Kılavuzlar", system_prompt="-")
+    # save() her dosya için bekleyen bir job oluşturur
+    return [GptPackageFile.objects.create(gpt_package=package, file=f"gpt_package_files/{name}.txt") for name in names]
+
+
+def _make_stale(job):
+    IngestionJob.objects.filter(id=job.id).update(
+        updated_at=timezone.now() - timedelta(seconds=ingestion.INGESTION_JOB_STALE_SECONDS + 1)
+    )
+
+
+class ClaimJobTests(TestCase):
+
+    def setUp(self):
+        self.file, self.other_file = _make_files("a", "b")
+
+    def test_file_with_a_running_job_is_not_claimed_again(self):
+        first = claim_job()
+        self.assertEqual(first.package_file_id, self.file.id)
+        # Dosya job çalışırken tekrar kaydedilir
+        self.file.save()
+        second = claim_job()
+        self.assertEqual(second.package_file_id, self.other_file.id)
+        self.assertIsNone(claim_job())
+        self.assertEqual(IngestionJob.objects.filter(package_file=self.file, status=IngestionJob.STATUS_PENDING).count(), 1)
+
+    def test_pending_job_runs_once_the_running_job_finishes(self):
+        first = claim_job()
+        self.file.save()
+        claim_job()
+        IngestionJob.objects.filter(id=first.id).update(status=IngestionJob.STATUS_DONE)
+        self.assertEqual(claim_job().package_file_id, self.file.id)
+
+    def test_stale_job_is_reclaimed_and_old_run_loses_ownership(self):
+        job = claim_job()
+        old_run = JobProgress(IngestionJob.objects.get(id=job.id))
+        _make_stale(job)
+
+        reclaimed = claim_job()
+        self.assertEqual(reclaimed.id, job.id)
+        self.assertEqual(reclaimed.attempts, 2)
+        self.assertFalse(old_run.owns_job())
+        with self.assertRaises(JobSuperseded):
+            old_run(IngestionJob.STAGE_EMBEDDING, done=1, total=2)
+        self.assertEqual(IngestionJob.objects.get(id=job.id).stage, IngestionJob.STAGE_QUEUED)
+
+    def test_stale_job_is_superseded_by_a_newer_job_of_the_same_file(self):
+        stalled = claim_job()
+        claim_job()
+        self.file.save()
+        _make_stale(stalled)
+        IngestionJob.objects.filter(id=stalled.id).update(attempts=1)
+        # Zaman aşımına uğramış job yeniden alınır; bekleyen job onun bitmesini bekler
+        self.assertEqual(claim_job().id, stalled.id)
+        self.assertIsNone(claim_job())
+
+
+class RunJobTests(TestCase):
+
+    def setUp(self):
+        (self.file,) = _make_files("a")
+        self.job = claim_job()
+
+    def test_success_is_recorded(self):
+        with mock.patch.object(GptPackageFile, "index_vectors", return_value=3) as index_vectors:
+            self.assertTrue(run_job(self.job))
+        self.assertIsNotNone(index_vectors.call_args.kwargs["owns_run"])
+        job = IngestionJob.objects.get(id=self.job.id)
+        self.assertEqual((job.status, job.stage), (IngestionJob.STATUS_DONE, IngestionJob.STAGE_DONE))
+
+    def test_failure_is_recorded(self):
+        with mock.patch.object(GptPackageFile, "index_vectors", side_effect=ValueError("bozuk")):
+            self.assertFalse(run_job(self.job))
+        job = IngestionJob.objects.get(id=self.job.id)
+        self.assertEqual(job.status, IngestionJob.STATUS_FAILED)
+        self.assertEqual(job.error, "ValueError: bozuk")
+
+    def test_superseded_run_does_not_write_its_result(self):
+        def index_vectors(package_file, progress=None, use_manifest=True, encode_fn=None, owns_run=None):
+            # Çalışma sürerken job başka bir worker tarafından yeniden alınır
+            _make_stale(self.job)
+            claim_job()
+            self.assertFalse(owns_run())
+            progress(IngestionJob.STAGE_EMBEDDING, done=1, total=1)
+
+        with mock.patch.object(GptPackageFile, "index_vectors", index_vectors):
+            self.assertFalse(run_job(self.job))
+        job = IngestionJob.objects.get(id=self.job.id)
+        self.assertEqual((job.status, job.attempts), (IngestionJob.STATUS_RUNNING, 2))
+
+
+class HeartbeatTests(TransactionTestCase):
+
+    def test_heartbeat_runs_without_progress(self):
+        _make_files("a")
+        job = claim_job()
+        before = IngestionJob.objects.get(id=job.id).updated_at
+        progress = JobProgress(job, heartbeat_interval=0.05)
+        progress.start()
+        try:
+            time.sleep(0.3)
+        finally:
+            progress.stop()
+        self.assertGreater(IngestionJob.objects.get(id=job.id).updated_at, before)
+        self.assertFalse(progress.lost)
+
+
+class IndexVectorsOwnershipTests(TestCase):
+    """
+    Qdrant'ın bellek içi (":memory:") modu ile çalışır; sunucu ve model gerekmez.
+    """
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+        self.client = QdrantClient(":memory:")
+        for patcher in (
+            mock.patch.object(semantic, "get_qdrant_client", return_value=self.client),
+            mock.patch.object(semantic, "_ensured_collections", set()),
+            mock.patch.object(semantic, "_hybrid_collections", set()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.encode = lambda texts: np.ones((len(texts), semantic.EMBEDDING_DIMENSION), dtype=np.float32)
+        (self.file,) = _make_files("a")
+
+    def write_csv(self, rows):
+        body = "kod,ad\n" + "".join(f"{i},ürün {i}\n" for i in range(rows))
+        self.file.file.save("tablo.csv", ContentFile(body.encode("utf-8")))
+
+    def point_count(self):
+        return self.client.count("gpt_package_files").count
+
+    def test_stale_chunks_are_kept_when_the_run_lost_its_job(self):
+        self.write_csv(40)
+        self.file.index_vectors(encode_fn=self.encode)
+        before = self.point_count()
+        self.assertEqual(before, self.file.chunks.count())
+
+        self.write_csv(10)
+        self.file.index_vectors(encode_fn=self.encode, owns_run=lambda: False)
+        self.assertEqual(self.point_count(), before)
+
+        self.file.index_vectors(encode_fn=self.encode, owns_run=lambda: True)
+        self.assertLess(self.point_count(), before)
+        self.assertEqual(self.point_count(), self.file.chunks.count())
@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from hexense_core import package_access
+from hexense_core.models import Company, Department, GptModel, GptPackage, GptPackageGroup, Role
+
+
+@mock.patch("hexense_core.semantic.upsert_if_changed", return_value={"ok": True})
+class AllowedPackagesForRoleTests(TestCase):
+
+    def setUp(self):
+        package_access.invalidate()
+        company = Company.objects.create(name="Hexense")
+        department = Department.objects.create(company=company, name="Satış")
+        self.role = Role.objects.create(department=department, name="Temsilci")
+        self.model = GptModel.objects.create(key="gpt-4o", provider="openai", name="gpt-4o")
+        with mock.patch("hexense_core.semantic.upsert_if_changed", return_value={"ok": True}):
+            self.group = GptPackageGroup.objects.create(key="sales", name="Satış")
+            self.package = GptPackage.objects.create(
+                group=self.group, key="orders", name="Siparişler", model=self.model, system_prompt="-"
+            )
+        self.package.allowed_roles.add(self.role)
+
+    def tearDown(self):
+        package_access.invalidate()
+
+    def test_result_is_cached(self, upsert):
+        first = package_access.allowed_packages_for_role(self.role.id)
+        self.assertEqual(list(first), [str(self.package.id)])
+        with self.assertNumQueries(0):
+            self.assertIs(package_access.allowed_packages_for_role(self.role.id), first)
+
+    def test_group_changes_invalidate(self, upsert):
+        package_access.allowed_packages_for_role(self.role.id)
+        self.group.name = "Satış Ekibi"
+        self.group.save()
+        cached = package_access.allowed_packages_for_role(self.role.id)[str(self.package.id)]
+        self.assertEqual(cached.group.name, "Satış Ekibi")
+
+    def test_model_changes_invalidate(self, upsert):
+        package_access.allowed_packages_for_role(self.role.id)
+        self.model.is_active = False
+        self.model.save()
+        self.assertEqual(package_access.allowed_packages_for_role(self.role.id), {})
+
+    def test_role_assignment_invalidates(self, upsert):
+        package_access.allowed_packages_for_role(self.role.id)
+        self.package.allowed_roles.remove(self.role)
+        self.assertEqual(package_access.allowed_packages_for_role(self.role.id), {})
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from hexense_core.models import GptPackage, GptPackageFile, GptPackageGroup
+
+
+@mock.patch("hexense_core.semantic.ensure_collection_exists", return_value=True)
+class ReindexFilesTests(TestCase):
+
+    def setUp(self):
+        with mock.patch("hexense_core.semantic.upsert_if_changed", return_value={"ok": True}):
+            group = GptPackageGroup.objects.create(key="docs", name="Dokümanlar")
+            package = GptPackage.objects.create(group=group, key="manuals", name="Kılavuzlar", system_prompt="-")
+        self.files = sorted(
+            (GptPackageFile.objects.create(gpt_package=package, file=f"gpt_package_files/{name}.txt") for name in "abc"),
+            key=lambda f: f.pk
+        )
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.checkpoint_path = os.path.join(self._tmp.name, "gpt_package_files.json")
+
+    def reindex(self, failing=()):
+        calls = []
+
+        def index_vectors(package_file, use_manifest=True, encode_fn=None):
+            calls.append(package_file.pk)
+            if package_file.pk in failing:
+                raise ValueError("bozuk dosya")
+            return 1
+
+        with mock.patch.object(GptPackageFile, "index_vectors", index_vectors), \
+                mock.patch("hexense_core.semantic.get_embedding_backend"):
+            call_command(
+                "reindex_vectors", collection="gpt_package_files", workers=0,
+                checkpoint_dir=self._tmp.name, stdout=mock.MagicMock(), stderr=mock.MagicMock()
+            )
+        return calls
+
+    def test_failed_file_is_recorded_and_retried(self, ensure):
+        broken = self.files[1]
+        with self.assertRaises(CommandError):
+            self.reindex(failing={broken.pk})
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+        self.assertEqual(checkpoint["failed"], [str(broken.pk)])
+        self.assertEqual(checkpoint["rows"], 2)
+
+        # Devam eden çalışma yalnızca başarısız dosyayı tekrar dener
+        self.assertEqual(self.reindex(), [broken.pk])
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_deleted_failed_file_is_dropped(self, ensure):
+        broken = self.files[0]
+        with self.assertRaises(CommandError):
+            self.reindex(failing={broken.pk})
+        with mock.patch("hexense_core.semantic.delete_where", return_value=True):
+            broken.delete()
+        self.assertEqual(self.reindex(), [])
@@ -0,0 +1,86 @@
+from unittest import mock
+
+import numpy as np
+
+from django.test import SimpleTestCase
+
+from hexense_core import semantic
+
+
+class ContentHashTests(SimpleTestCase):
+
+    def test_text_hash_ignores_whitespace_and_depends_on_model(self):
+        self.assertEqual(semantic.content_hash("Fatura  no:\n INV-1"), semantic.content_hash("Fatura no: INV-1"))
+        with mock.patch.object(semantic, "_EMBEDDING_CACHE_NAMESPACE", "other-model:onnx_int8"):
+            changed = semantic.content_hash("Fatura no: INV-1")
+        self.assertNotEqual(changed, semantic.content_hash("Fatura no: INV-1"))
+
+    def test_image_hash_depends_on_clip_model(self):
+        image = b"\x89PNG\r\n\x1a\n..."
+        before = semantic.content_hash(image)
+        with mock.patch.object(semantic, "_IMAGE_EMBEDDING_NAMESPACE", "clip:ViT-L-14:openai"):
+            self.assertNotEqual(semantic.content_hash(image), before)
+        self.assertEqual(semantic.content_hash(bytearray(image)), before)
+
+    def test_text_and_bytes_do_not_collide(self):
+        self.assertNotEqual(semantic.content_hash("abc"), semantic.content_hash(b"abc"))
+
+    def test_payload_digest_is_key_order_independent(self):
+        self.assertEqual(semantic.payload_digest({"a": 1, "b": 2}), semantic.payload_digest({"b": 2, "a": 1}))
+        self.assertNotEqual(semantic.payload_digest({"a": 1}), semantic.payload_digest({"a": 2}))
+
+
+class UpsertIfChangedTests(SimpleTestCase):
+    """
+    Qdrant'ın bellek içi (":memory:") modu ile çalışır; sunucu ve model gerekmez.
+    """
+    COLLECTION = "gpt_package_files"
+
+    def setUp(self):
+        from qdrant_client import QdrantClient
+
+        self.client = QdrantClient(":memory:")
+        for patcher in (
+            mock.patch.object(semantic, "get_qdrant_client", return_value=self.client),
+            mock.patch.object(semantic, "_ensured_collections", set()),
+            mock.patch.object(semantic, "_hybrid_collections", set()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.ones((len(texts), semantic.EMBEDDING_DIMENSION), dtype=np.float32)
+
+    def upsert(self, ids, texts):
+        payloads = [{"gpt_package_file_id": "f1"} for _ in texts]
+        return semantic.upsert_if_changed(self.COLLECTION, ids, texts, payloads, encode_fn=self.encode)
+
+    def test_unchanged_points_are_not_encoded_again(self):
+        ids = [semantic.make_point_id(self.COLLECTION, "a"), semantic.make_point_id(self.COLLECTION, "b")]
+        self.assertEqual(self.upsert(ids, ["Fatura INV-2024", "İade"])["written"], 2)
+        self.encoded.clear()
+
+        stats = self.upsert(ids, ["Fatura  INV-2024", "İade süreci"])
+
+        self.assertEqual(self.encoded, ["İade süreci"])
+        self.assertEqual((stats["written"], stats["unchanged"]), (1, 1))
+
+    def test_points_with_outdated_sparse_terms_are_rewritten(self):
+        point_id = semantic.make_point_id(self.COLLECTION, "a")
+        self.upsert([point_id], ["Fatura INV-2024"])
+        # Eski tokenizer'ın ürettiği terimlerle yazılmış bir nokta
+        self.client.update_vectors(
+            collection_name=self.COLLECTION,
+            points=[semantic.qdrant_models.PointVectors(
+                id=point_id,
+                vector={semantic.SPARSE_VECTOR: semantic.qdrant_models.SparseVector(indices=[1, 2], values=[1.0, 1.0])}
+            )]
+        )
+        self.encoded.clear()
+
+        self.assertEqual(self.upsert([point_id], ["Fatura INV-2024"])["written"], 1)
+        self.assertEqual(self.upsert([point_id], ["Fatura INV-2024"])["unchanged"], 1)
+        hits = semantic.search_qdrant(self.COLLECTION, "inv-2024", query_vector=np.ones(semantic.EMBEDDING_DIMENSION, dtype=np.float32))
+        self.assertEqual([str(hit.id) for hit in hits], [point_id])
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+from hexense_core import sparse_encoder
+from hexense_core.sparse_encoder import encode_document, encode_query, tokenize
+
+
+class TokenizeTests(TestCase):
+
+    def test_codes_are_kept_whole_and_split(self):
+        self.assertEqual(tokenize("Sipariş PRD-00012"), ["sipariş", "prd-00012", "prd", "00012"])
+        self.assertEqual(tokenize("v2.1 TR_34"), ["v2.1", "v2", "1", "tr_34"])
+
+    def test_dotted_and_dotless_i_fold_together(self):
+        for document, query in [
+            ("INV-2024", "inv-2024"),
+            ("İSTANBUL", "istanbul"),
+            ("IŞIK", "ışık"),
+            ("Iİıi", "iiii"),
+        ]:
+            self.assertEqual(tokenize(document), tokenize(query), document)
+
+    def test_no_combining_marks_leak_into_terms(self):
+        self.assertNotIn("\u0307", "".join(tokenize("İZMİR İnönü")))
+
+    def test_empty(self):
+        self.assertEqual(tokenize(""), [])
+        self.assertEqual(tokenize(None), [])
+        self.assertEqual(encode_document("", 10), ([], []))
+        self.assertEqual(encode_query("  "), ([], []))
+
+
+class EncodeTests(TestCase):
+
+    def test_query_terms_match_document_terms(self):
+        indices, _ = encode_document("Fatura INV-2024 İSTANBUL şubesi", avg_doc_length=10)
+        query_indices, values = encode_query("inv-2024 istanbul")
+        self.assertTrue(set(query_indices) <= set(indices))
+        self.assertEqual(values, [1.0] * len(query_indices))
+
+    def test_term_frequency_saturates(self):
+        indices, weights = encode_document("stok stok stok kod", avg_doc_length=4)
+        by_index = dict(zip(indices, weights))
+        stok = by_index[sparse_encoder._index("stok")]
+        kod = by_index[sparse_encoder._index("kod")]
+        self.assertGreater(stok, kod)
+        self.assertLess(stok, 3 * kod)
+        self.assertLess(stok, sparse_encoder.BM25_K1 + 1)
+
+    def test_longer_documents_weigh_terms_less(self):
+        short = dict(zip(*encode_document("kod", avg_doc_length=5)))
+        long = dict(zip(*encode_document("kod " + "dolgu " * 20, avg_doc_length=5)))
+        index = sparse_encoder._index("kod")
+        self.assertGreater(short[index], long[index])
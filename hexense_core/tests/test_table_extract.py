@@ -0,0 +1,73 @@
+import io
+from unittest import TestCase
+
+import openpyxl
+import pandas as pd
+
+from hexense_core.table_extract import iter_table_chunks, iter_table_rows
+
+
+def _xlsx(*rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(list(row))
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def _rows(file, ext, block_rows=50000):
+    return [row for block in iter_table_rows(file, ext, block_rows=block_rows) for row in block]
+
+
+class CsvTests(TestCase):
+
+    def test_rows_are_formatted_as_text(self):
+        file = io.StringIO("id,name\n007,Ayşe\n8,\n")
+        self.assertEqual(_rows(file, ".csv"), ["id: 007, name: Ayşe", "id: 8, name: "])
+
+    def test_chunks_do_not_depend_on_block_size(self):
+        data = "n\n" + "".join(f"{i}\n" for i in range(23))
+        expected = list(iter_table_chunks(io.StringIO(data), ".csv", max_rows=10))
+        self.assertEqual([(start, end) for _, start, end in expected], [(0, 9), (10, 19), (20, 22)])
+        for block_rows in (1, 3, 7, 10):
+            chunks = list(iter_table_chunks(io.StringIO(data), ".csv", max_rows=10, block_rows=block_rows))
+            self.assertEqual(chunks, expected, block_rows)
+
+    def test_unsupported_extension(self):
+        with self.assertRaises(ValueError):
+            list(iter_table_rows(io.StringIO(""), ".ods"))
+
+
+class XlsxTests(TestCase):
+
+    def test_ragged_rows_are_padded(self):
+        file = _xlsx(["a", "b", "c"], [1], [1, 2, 3])
+        self.assertEqual(_rows(file, ".xlsx"), ["a: 1, b: , c: ", "a: 1, b: 2, c: 3"])
+
+    def test_duplicate_headers_are_deduped_like_pandas(self):
+        header = ["a", "a", "b", None, "a.1", "a"]
+        file = _xlsx(header, range(len(header)))
+        expected = list(pd.read_excel(_xlsx(header, range(len(header)))).columns)
+        self.assertEqual(expected, ["a", "a.2", "b", "Unnamed: 3", "a.1", "a.3"])
+        self.assertEqual(_rows(file, ".xlsx"), [", ".join(f"{c}: {i}" for i, c in enumerate(expected))])
+
+    def test_rows_longer_than_header_are_widened(self):
+        file = _xlsx(["a", "b"], [1, 2], [3, 4, 5, None, 7])
+        self.assertEqual(_rows(file, ".xlsx"), [
+            "a: 1, b: 2, Unnamed: 2: , Unnamed: 3: , Unnamed: 4: ",
+            "a: 3, b: 4, Unnamed: 2: 5, Unnamed: 3: , Unnamed: 4: 7",
+        ])
+
+    def test_widening_does_not_drop_cells_across_blocks(self):
+        file = _xlsx(["a"], [1], [2, 3], [4])
+        self.assertEqual(_rows(file, ".xlsx", block_rows=1), ["a: 1", "a: 2, Unnamed: 1: 3", "a: 4, Unnamed: 1: "])
+
+    def test_empty_workbook(self):
+        workbook = openpyxl.Workbook()
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
+        self.assertEqual(_rows(buffer, ".xlsx"), [])
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from hexense_core.models import Conversation, GptPackage, GptPackageGroup, Message, VectorOutbox
+
+
+class VectorFieldsTrackingTests(TestCase):
+
+    def test_new_rows_are_enqueued(self):
+        conversation = Conversation.objects.create(context="bağlam")
+        Message.objects.create(conversation=conversation, sender="user", content="merhaba")
+
+        self.assertEqual(
+            sorted(VectorOutbox.objects.values_list("collection", flat=True)),
+            ["conversations", "messages"],
+        )
+
+    def test_unchanged_save_is_not_enqueued(self):
+        conversation = Conversation.objects.create(context="bağlam")
+        VectorOutbox.objects.all().delete()
+
+        conversation.save()
+        Conversation.objects.get(pk=conversation.pk).save()
+        conversation.save(update_fields=["updated_at"])
+
+        self.assertFalse(VectorOutbox.objects.exists())
+
+    def test_changed_vector_field_is_enqueued(self):
+        conversation = Conversation.objects.create(context="bağlam")
+        message = Message.objects.create(conversation=conversation, sender="user", content="merhaba")
+        VectorOutbox.objects.all().delete()
+
+        loaded = Message.objects.get(pk=message.pk)
+        loaded.content = "güncel"
+        loaded.save(update_fields=["content"])
+        loaded.save()
+
+        entries = list(VectorOutbox.objects.values_list("point_id", "text"))
+        self.assertEqual(entries, [(str(message.pk), "güncel")])
+
+    def test_foreign_key_in_update_fields_is_tracked(self):
+        conversation = Conversation.objects.create()
+        other = Conversation.objects.create()
+        message = Message.objects.create(conversation=conversation, sender="user", content="merhaba")
+        VectorOutbox.objects.all().delete()
+
+        message.conversation = other
+        message.save(update_fields=["conversation"])
+
+        self.assertEqual(VectorOutbox.objects.get().payload["conversation_id"], str(other.pk))
+
+    def test_deferred_fields_are_not_loaded(self):
+        conversation = Conversation.objects.create(context="bağlam")
+        VectorOutbox.objects.all().delete()
+
+        loaded = Conversation.objects.only("id", "is_active").get(pk=conversation.pk)
+        with self.assertNumQueries(0):
+            self.assertFalse(loaded.vector_fields_changed())
+
+    @mock.patch("hexense_core.semantic.upsert_if_changed")
+    def test_package_is_reindexed_only_when_vector_fields_change(self, upsert):
+        group = GptPackageGroup.objects.create(key="g", name="Grup")
+        package = GptPackage.objects.create(group=group, key="p", name="Paket", system_prompt="...")
+        upsert.reset_mock()
+
+        package = GptPackage.objects.get(pk=package.pk)
+        package.system_prompt = "yeni prompt"
+        package.save()
+        upsert.assert_not_called()
+
+        package.description = "yeni açıklama"
+        package.save()
+        upsert.assert_called_once()
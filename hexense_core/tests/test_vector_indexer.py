@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from hexense_core import vector_indexer
+from hexense_core.models import VectorOutbox
+from hexense_core.vector_indexer import drain_outbox
+
+
+def _upserted_ids(upsert_mock):
+    return [point_id for call in upsert_mock.call_args_list for point_id in call.kwargs["ids"]]
+
+
+@mock.patch("hexense_core.semantic.delete_from_qdrant", return_value=True)
+@mock.patch("hexense_core.semantic.upsert_if_changed", return_value={"ok": True})
+class DrainOutboxTests(TestCase):
+
+    def test_applies_latest_entry_per_point(self, upsert, delete):
+        VectorOutbox.enqueue_upsert("messages", "1", "eski", {})
+        VectorOutbox.enqueue_upsert("messages", "1", "yeni", {})
+        VectorOutbox.enqueue_upsert("messages", "2", "ikinci", {})
+
+        stats = drain_outbox(batch_size=10)
+
+        self.assertEqual(stats["applied"], 2)
+        self.assertEqual(stats["superseded"], 1)
+        self.assertEqual(upsert.call_args.kwargs["contents"], ["yeni", "ikinci"])
+        self.assertFalse(VectorOutbox.objects.exists())
+
+    def test_upsert_then_delete_only_deletes(self, upsert, delete):
+        VectorOutbox.enqueue_upsert("messages", "1", "metin", {})
+        VectorOutbox.enqueue_delete("messages", "1")
+
+        drain_outbox(batch_size=10)
+
+        upsert.assert_not_called()
+        delete.assert_called_once_with("messages", ["1"])
+
+    def test_failure_backs_off_then_gives_up(self, upsert, delete):
+        upsert.return_value = {"ok": False}
+        entry = VectorOutbox.enqueue_upsert("messages", "1", "metin", {})
+
+        stats = drain_outbox(batch_size=10, max_attempts=2)
+        entry.refresh_from_db()
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(entry.attempts, 1)
+        self.assertEqual(entry.status, VectorOutbox.STATUS_PENDING)
+        self.assertGreater(entry.available_at, timezone.now())
+
+        # Backoff süresince tekrar alınmaz
+        self.assertEqual(drain_outbox(batch_size=10)["claimed"], 0)
+
+        VectorOutbox.objects.filter(id=entry.id).update(available_at=timezone.now())
+        drain_outbox(batch_size=10, max_attempts=2)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, VectorOutbox.STATUS_FAILED)
+
+    def test_claimed_entries_are_leased(self, upsert, delete):
+        VectorOutbox.enqueue_upsert("messages", "1", "metin", {})
+        now = timezone.now()
+
+        latest, _, _ = vector_indexer._claim(10, now)
+        self.assertEqual(len(latest), 1)
+        self.assertEqual(len(vector_indexer._claim(10, now)[0]), 0)
+        self.assertGreaterEqual(
+            VectorOutbox.objects.get().available_at,
+            now + timedelta(seconds=vector_indexer.VECTOR_INDEXER_LEASE_SECONDS)
+        )
+
+    def test_entries_behind_a_backing_off_point_do_not_starve_the_batch(self, upsert, delete):
+        backing_off = VectorOutbox.enqueue_upsert("messages", "1", "v0", {})
+        VectorOutbox.objects.filter(id=backing_off.id).update(
+            attempts=5, available_at=timezone.now() + timedelta(minutes=5)
+        )
+        for i in range(5):
+            VectorOutbox.enqueue_upsert("messages", "1", f"v{i + 1}", {})
+        VectorOutbox.enqueue_upsert("messages", "2", "bağımsız", {})
+        VectorOutbox.enqueue_upsert("messages", "3", "bağımsız", {})
+
+        stats = drain_outbox(batch_size=3)
+
+        self.assertEqual(_upserted_ids(upsert), ["2", "3"])
+        self.assertEqual(stats["blocked"], 0)
+        # Noktanın kayıtları sırasını korumak için bekler
+        self.assertEqual(VectorOutbox.objects.filter(point_id="1").count(), 6)
@@ -0,0 +1,208 @@
+# hexense_core/vector_indexer.py
+
+"""
+VectorOutbox kayıtlarını Qdrant'a işleyen write-behind indexer.
+
+Message/Conversation kayıtları kaydedilirken embedding ve Qdrant yazımı yapılmaz;
+bunun yerine aynı transaction içinde VectorOutbox'a bir kayıt eklenir. Bu modül
+outbox'ı id sırasıyla batch'ler halinde okur, içeriği değişen metinleri tek seferde encode eder,
+koleksiyon başına toplu upsert/delete yapar ve başarılı kayıtları siler.
+
+Kayıtlar kısa bir transaction'da alınır: satırlar select_for_update(skip_locked) ile seçilir ve
+available_at'leri VECTOR_INDEXER_LEASE_SECONDS sonrasına çekilir (lease). Embedding ve Qdrant
+istekleri transaction dışında yapılır; sonuç (silme ya da deneme sayacı) ikinci bir kısa
+transaction'da yazılır. Böylece ağ çağrıları sürerken outbox satırlarında kilit tutulmaz.
+Worker lease süresi içinde sonuç yazamazsa (ör. öldü) kayıtlar tekrar alınır; uygulama idempotenttir.
+
+Sıralama garantisi: Aynı (koleksiyon, nokta) için daha eski bekleyen bir kayıt varsa (başka bir
+worker'da lease altında ya da backoff'ta) o noktanın kayıtları bu turda alınmaz. Bu kayıtlar
+sorgunun kendisinde elenir; böylece backoff'taki kayıtların arkasında bekleyenler batch penceresini
+doldurmaz ve bağımsız yeni kayıtlar işlenmeye devam eder. Batch içinde aynı noktaya ait birden fazla
+kayıt varsa yalnızca sonuncusu uygulanır.
+"""
+
+import logging
+from collections import OrderedDict, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, Min, OuterRef
+from django.utils import timezone
+
+from hexense_core.models import VectorOutbox
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEXER_BATCH_SIZE = getattr(settings, "VECTOR_INDEXER_BATCH_SIZE", 256)
+VECTOR_INDEXER_MAX_ATTEMPTS = getattr(settings, "VECTOR_INDEXER_MAX_ATTEMPTS", 8)
+VECTOR_INDEXER_LEASE_SECONDS = getattr(settings, "VECTOR_INDEXER_LEASE_SECONDS", 300)
+MAX_BACKOFF_SECONDS = 300
+
+
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(2 ** attempts, MAX_BACKOFF_SECONDS))
+
+
+def _blocked_points(entries) -> set:
+    """
+    Batch dışında, aynı noktaya ait daha eski bekleyen kaydı olan noktaları döndürür.
+    """
+    batch_ids = [e.id for e in entries]
+    point_ids = {e.point_id for e in entries}
+    older = (
+        VectorOutbox.objects
+        .filter(status=VectorOutbox.STATUS_PENDING, id__lt=max(batch_ids), point_id__in=point_ids)
+        .exclude(id__in=batch_ids)
+        .values_list("collection", "point_id")
+    )
+    return set(older)
+
+
+def _apply(collection: str, latest: list) -> tuple:
+    """
+    Bir koleksiyona ait son işlemleri uygular; (başarılı kayıtlar, (başarısız kayıtlar, hata)) döndürür.
+    """
+    from hexense_core.semantic import delete_from_qdrant, upsert_if_changed
+
+    succeeded, failed, errors = [], [], []
+    upserts = [e for e in latest if e.operation == VectorOutbox.OPERATION_UPSERT]
+    deletes = [e for e in latest if e.operation == VectorOutbox.OPERATION_DELETE]
+
+    if upserts:
+        try:
+            # İçeriği ve payload'u Qdrant'takiyle aynı olan kayıtlar encode edilmez ve yazılmaz
+            ok = upsert_if_changed(
+                collection,
+                ids=[e.point_id for e in upserts],
+                contents=[e.text for e in upserts],
+                payloads=[e.payload for e in upserts]
+            )["ok"]
+            if not ok:
+                errors.append("Qdrant upsert failed")
+        except Exception as e:
+            logger.error(f"Vector indexer embedding failed for {collection}: {e}", exc_info=True)
+            ok = False
+            errors.append(f"Embedding failed: {e}")
+        (succeeded if ok else failed).extend(upserts)
+    if deletes:
+        ok = delete_from_qdrant(collection, [e.point_id for e in deletes])
+        (succeeded if ok else failed).extend(deletes)
+        if not ok:
+            errors.append("Qdrant delete failed")
+    return succeeded, (failed, "; ".join(errors))
+
+
+def _claim(batch_size: int, now) -> tuple:
+    """
+    Bir batch'i lease ile alır; (nokta başına son kayıtlar, ezilen kayıtlar, engellenen kayıt sayısı) döndürür.
+    """
+    # Aynı noktanın henüz alınamayacak (lease ya da backoff altındaki) daha eski bir kaydı olan kayıtlar
+    older_not_ready = VectorOutbox.objects.filter(
+        status=VectorOutbox.STATUS_PENDING,
+        collection=OuterRef("collection"),
+        point_id=OuterRef("point_id"),
+        id__lt=OuterRef("id"),
+        available_at__gt=now
+    )
+    with transaction.atomic():
+        # skip_locked: birden fazla indexer worker'ı aynı kayıtları almadan paralel çalışabilir
+        entries = list(
+            VectorOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=VectorOutbox.STATUS_PENDING, available_at__lte=now)
+            .exclude(Exists(older_not_ready))
+            .order_by("id")[:batch_size]
+        )
+        if not entries:
+            return OrderedDict(), [], 0
+
+        # Sorgu anında başka bir worker'ın kilitli tuttuğu (lease'i henüz yazılmamış) eski kayıtlar
+        # yukarıdaki filtreden kaçabilir; onların noktaları burada engellenir
+        blocked = _blocked_points(entries)
+        # Nokta başına son işlemi tut (id sırasıyla geldikleri için sonraki öncekini ezer)
+        latest_by_point = OrderedDict()
+        superseded = []
+        blocked_count = 0
+        for entry in entries:
+            point = (entry.collection, entry.point_id)
+            if point in blocked:
+                blocked_count += 1
+                continue
+            if point in latest_by_point:
+                superseded.append(latest_by_point.pop(point))
+            latest_by_point[point] = entry
+
+        # Engellenen kayıtlara dokunulmaz; alınanlar lease süresince diğer worker'lara görünmez
+        claimed_ids = [e.id for e in superseded] + [e.id for e in latest_by_point.values()]
+        VectorOutbox.objects.filter(id__in=claimed_ids).update(
+            available_at=now + timedelta(seconds=VECTOR_INDEXER_LEASE_SECONDS)
+        )
+    return latest_by_point, superseded, blocked_count
+
+
+def drain_outbox(batch_size: int = None, max_attempts: int = None) -> dict:
+    """
+    Outbox'tan bir batch işler.
+
+    Args:
+        batch_size (int, optional): Tek turda alınacak en fazla kayıt sayısı
+        max_attempts (int, optional): Bu sayıda başarısız denemeden sonra kayıt 'failed' olarak işaretlenir
+
+    Returns:
+        dict: {"claimed", "applied", "superseded", "failed", "blocked"} sayaçları
+    """
+    batch_size = batch_size or VECTOR_INDEXER_BATCH_SIZE
+    max_attempts = max_attempts or VECTOR_INDEXER_MAX_ATTEMPTS
+    stats = {"claimed": 0, "applied": 0, "superseded": 0, "failed": 0, "blocked": 0}
+
+    latest_by_point, superseded, stats["blocked"] = _claim(batch_size, timezone.now())
+    stats["claimed"] = len(latest_by_point) + len(superseded) + stats["blocked"]
+    stats["superseded"] = len(superseded)
+    if not latest_by_point and not superseded:
+        return stats
+
+    by_collection = defaultdict(list)
+    for (collection, _), entry in latest_by_point.items():
+        by_collection[collection].append(entry)
+
+    # Embedding ve Qdrant istekleri transaction dışında yapılır
+    done = list(superseded)
+    failures = []
+    for collection, latest in by_collection.items():
+        succeeded, (failed, error) = _apply(collection, latest)
+        done.extend(succeeded)
+        stats["applied"] += len(succeeded)
+        failures.extend((entry, error) for entry in failed)
+
+    now = timezone.now()
+    for entry, error in failures:
+        entry.attempts += 1
+        entry.last_error = error
+        entry.available_at = now + _backoff(entry.attempts)
+        if entry.attempts >= max_attempts:
+            entry.status = VectorOutbox.STATUS_FAILED
+            logger.error(f"Vector outbox entry {entry.id} ({entry}) gave up after {entry.attempts} attempts: {error}")
+    stats["failed"] = len(failures)
+
+    with transaction.atomic():
+        if failures:
+            VectorOutbox.objects.bulk_update([entry for entry, _ in failures], ["attempts", "last_error", "available_at", "status"])
+        VectorOutbox.objects.filter(id__in=[e.id for e in done]).delete()
+    return stats
+
+
+def outbox_lag() -> dict:
+    """
+    İndeksleme gecikmesini döndürür: bekleyen kayıt sayısı, en eski bekleyen kaydın yaşı (sn)
+    ve kalıcı olarak başarısız olmuş kayıt sayısı.
+    """
+    pending = VectorOutbox.objects.filter(status=VectorOutbox.STATUS_PENDING).aggregate(
+        count=Count("id"), oldest=Min("created_at")
+    )
+    oldest = pending["oldest"]
+    return {
+        "pending": pending["count"],
+        "oldest_age_seconds": round((timezone.now() - oldest).total_seconds(), 3) if oldest else 0.0,
+        "failed": VectorOutbox.objects.filter(status=VectorOutbox.STATUS_FAILED).count(),
+    }
@@ -9,8 +9,6 @@ from django.utils.timezone import now
 from rest_framework.generics import ListCreateAPIView, RetrieveAPIView, CreateAPIView
 from rest_framework.permissions import IsAuthenticated
 from hexense_core.llm_dispatcher import call_model
-from sentence_transformers import SentenceTransformer
-import numpy as np
 from django.contrib.auth.models import User
 from django.db import transaction
 from rest_framework_simplejwt.tokens import RefreshToken
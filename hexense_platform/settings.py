@@ -235,3 +235,98 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')  # collectstatic komutuyla toplan
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Embedding ayarları (hexense_core.semantic)
+EMBEDDING_MODEL_NAME = os.getenv('EMBEDDING_MODEL_NAME', 'all-MiniLM-L6-v2')
+# Metin vektör boyutu; Qdrant koleksiyonları bu boyutla oluşturulur (manage.py init_vector_store)
+EMBEDDING_DIMENSION = int(os.getenv('EMBEDDING_DIMENSION', '384'))
+# Embedding backend'i: 'sentence_transformers' (PyTorch) veya 'onnx_int8' (ONNX Runtime, int8 quantize, CPU)
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'sentence_transformers')
+EMBEDDING_BACKEND_OPTIONS = {
+    # onnx_int8: quantize edilmiş model klasörü (yoksa ilk yüklemede export edilir) ve ONNX Runtime thread sayısı
+    'onnx_dir': os.getenv('EMBEDDING_ONNX_DIR') or os.path.join(BASE_DIR, '.cache', 'onnx', EMBEDDING_MODEL_NAME),
+    'intra_op_threads': int(os.getenv('EMBEDDING_ONNX_THREADS', '0')),
+} if EMBEDDING_BACKEND == 'onnx_int8' else {}
+# Mikro-batcher: eşzamanlı tekil istekler en fazla bu kadar metinlik tek bir encode() çağrısında birleştirilir
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv('EMBEDDING_BATCH_MAX_SIZE', '32'))
+# İlk istekten sonra batch'in dolması için beklenecek en uzun süre (ms)
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv('EMBEDDING_BATCH_MAX_WAIT_MS', '5'))
+# Embedding cache: bellek içi LRU kapasitesi ve (boş değilse) yeniden başlatmalarda korunan disk katmanı klasörü
+EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', '10000'))
+EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', '')
+# Embedding çalıştırma modu: 'thread' (varsayılan, ASGI process'i içinde) veya 'process'
+# ('process' modunda metin embedding backend'i ve CLIP ayrı bir process pool'da çalışır)
+EMBEDDING_EXECUTOR = os.getenv('EMBEDDING_EXECUTOR', 'thread')
+EMBEDDING_PROCESS_WORKERS = int(os.getenv('EMBEDDING_PROCESS_WORKERS', '2'))
+
+# Büyük PDF'lerin paralel işlenmesi: sayfa aralıkları bu sayıda worker process'e dağıtılır (0/1: sıralı).
+# Yalnızca en az DOCUMENT_INGEST_MIN_PAGES sayfalı ve yerel diskte duran dosyalar için kullanılır.
+DOCUMENT_INGEST_WORKERS = int(os.getenv('DOCUMENT_INGEST_WORKERS', '0'))
+DOCUMENT_INGEST_MIN_PAGES = int(os.getenv('DOCUMENT_INGEST_MIN_PAGES', '32'))
+DOCUMENT_INGEST_PAGES_PER_TASK = int(os.getenv('DOCUMENT_INGEST_PAGES_PER_TASK', '16'))
+
+# Dosya metinlerinin chunk'lanması: chunk başına en fazla token (tiktoken), ardışık chunk'lar arası tekrar
+# eden token sayısı. Varsayılan, all-MiniLM-L6-v2'nin 256 word-piece penceresine sığar; değiştirilirse
+# dosyalar yeniden indekslenmelidir (manage.py reindex_vectors --collection gpt_package_files)
+CHUNK_TOKENIZER = os.getenv('CHUNK_TOKENIZER', 'cl100k_base')
+CHUNK_MAX_TOKENS = int(os.getenv('CHUNK_MAX_TOKENS', '200'))
+CHUNK_OVERLAP_TOKENS = int(os.getenv('CHUNK_OVERLAP_TOKENS', '0'))
+
+# Qdrant istemci ayarları: istek zaman aşımı (sn) ve async istemcinin bağlantı havuzu boyutu
+QDRANT_TIMEOUT = int(os.getenv('QDRANT_TIMEOUT', '10'))
+QDRANT_POOL_SIZE = int(os.getenv('QDRANT_POOL_SIZE', '20'))
+# Toplu upsert: istek başına nokta sayısı ve aynı anda gönderilecek batch sayısı
+QDRANT_UPSERT_BATCH_SIZE = int(os.getenv('QDRANT_UPSERT_BATCH_SIZE', '128'))
+QDRANT_UPSERT_PARALLEL = int(os.getenv('QDRANT_UPSERT_PARALLEL', '1'))
+# Hibrit aramada (dense + sparse, RRF) her iki aday listesinin boyutu: limit * bu katsayı (en az 20)
+QDRANT_HYBRID_PREFETCH_FACTOR = int(os.getenv('QDRANT_HYBRID_PREFETCH_FACTOR', '4'))
+
+
+# Vector outbox indexer (manage.py run_vector_indexer): tur başına işlenecek kayıt sayısı,
+# kaydın 'failed' olarak bırakılmadan önceki en fazla deneme sayısı ve alınan kayıtların
+# başka worker'lara görünmediği süre (sn; worker ölürse kayıtlar bu süre sonunda tekrar alınır)
+VECTOR_INDEXER_BATCH_SIZE = int(os.getenv('VECTOR_INDEXER_BATCH_SIZE', '256'))
+VECTOR_INDEXER_MAX_ATTEMPTS = int(os.getenv('VECTOR_INDEXER_MAX_ATTEMPTS', '8'))
+VECTOR_INDEXER_LEASE_SECONDS = int(os.getenv('VECTOR_INDEXER_LEASE_SECONDS', '300'))
+
+# Dosya ingestion worker'ı (manage.py run_ingestion_worker): ilerleme yazım aralığı (sn), worker'ın
+# ilerlemeden bağımsız heartbeat aralığı (sn) ve bu süre boyunca heartbeat'i gelmeyen 'running' job'ların
+# yeniden alınma eşiği (sn)
+INGESTION_PROGRESS_INTERVAL = float(os.getenv('INGESTION_PROGRESS_INTERVAL', '1.0'))
+INGESTION_HEARTBEAT_SECONDS = float(os.getenv('INGESTION_HEARTBEAT_SECONDS', '30'))
+INGESTION_JOB_STALE_SECONDS = int(os.getenv('INGESTION_JOB_STALE_SECONDS', '900'))
+
+# find_best_gpt_package: rol → erişilebilir paket cache'inin ömrü (sn). Aynı process'teki değişiklikler
+# signal ile anında temizlenir; TTL yalnızca diğer worker process'lerindeki kopyalar için üst sınırdır.
+GPT_PACKAGE_ACCESS_CACHE_TTL = int(os.getenv('GPT_PACKAGE_ACCESS_CACHE_TTL', '60'))
+
+# Qdrant depolama profilleri (hexense_core.semantic): HNSW grafiği (m, ef_construct), arama anındaki ef,
+# int8 scalar quantization (RAM'de quantize vektörler + orijinal vektörlerle rescoring) ve
+# vektör/payload'un diskte tutulması. Ölçüm için: python benchmarks/bench_qdrant_profiles.py
+QDRANT_STORAGE_PROFILES = {
+    # Küçük koleksiyonlar: Qdrant varsayılanları, her şey RAM'de
+    'default': {},
+    # Milyonlarca noktaya büyüyen koleksiyonlar: orijinal vektörler ve payload diskte,
+    # yalnızca int8 quantize vektörler (~4x küçük) RAM'de; sonuçlar orijinal vektörlerle yeniden puanlanır
+    'large': {
+        'hnsw_m': 16,
+        'hnsw_ef_construct': 128,
+        'search_ef': 128,
+        'quantization': 'int8',
+        'quantization_always_ram': True,
+        'rescore': True,
+        'oversampling': 2.0,
+        'on_disk_vectors': True,
+        'on_disk_payload': True,
+    },
+}
+# Koleksiyon → profil eşlemesi; listede olmayan koleksiyonlar 'default' profili kullanır
+QDRANT_COLLECTION_PROFILES = {
+    'messages': os.getenv('QDRANT_PROFILE_MESSAGES', 'large'),
+    'conversations': os.getenv('QDRANT_PROFILE_CONVERSATIONS', 'large'),
+    'conversation_contexts': os.getenv('QDRANT_PROFILE_CONVERSATION_CONTEXTS', 'large'),
+    'gpt_package_files': os.getenv('QDRANT_PROFILE_GPT_PACKAGE_FILES', 'large'),
+}
+
+# Paket yönlendirmesi için process içi gpt_packages vektör index'inin en uzun ömrü (sn); diğer process'lerdeki
+# değişiklikler bu süre içinde yansır (aynı process'te gpt_package_vector_changed signal'i ile anında)
+GPT_PACKAGE_INDEX_TTL = int(os.getenv('GPT_PACKAGE_INDEX_TTL', '300'))